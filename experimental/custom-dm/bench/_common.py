@@ -0,0 +1,55 @@
+"""
+Scaffolding shared by the greeter benchmarks
+setup() gives a bench a throwaway HOME and cache dir, puts the greeter
+and bench dirs on sys.path and installs bench/mock_pam.py as python-pam,
+so main.py imports headless. spin() runs the Qt event loop until a
+condition holds; report() prints the OK/FAIL lines.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+from PyQt6.QtCore import QEventLoop
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent
+
+
+def setup(name, home=True, pam=True):
+    """Environment for one bench run; returns its TemporaryDirectory
+
+    With `home`, the temp dir is also HOME: no wallpapers or mpv, and
+    caches stay out of /var. Call before importing main.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    tmp = tempfile.TemporaryDirectory(prefix=f'bench-{name}-')
+    if home:
+        os.environ['HOME'] = tmp.name
+    os.environ['CUSTOM_DM_CACHE_DIR'] = tmp.name
+    for path in (str(APP_DIR), str(BENCH_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    if pam:
+        import mock_pam
+        sys.modules['pam'] = mock_pam
+    return tmp
+
+
+def spin(app, predicate, timeout=30):
+    """Process events until predicate() is true or `timeout` runs out"""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+    return predicate()
+
+
+def report(checks):
+    """Print (name, ok) checks; returns how many failed"""
+    failures = 0
+    for name, ok in checks:
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        failures += not ok
+    return failures
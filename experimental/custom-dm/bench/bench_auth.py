@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+UI responsiveness during slow PAM authentication
+Runs the greeter headless with bench/mock_pam.py standing in for
+python-pam (MOCK_PAM_DELAY seconds per attempt) and a 10ms probe timer
+on the GUI thread. Compares the longest gap between probe ticks when PAM
+is called on the GUI thread (the old do_login) with the threaded login,
+and checks lockout, cancellation and failure handling.
+
+Usage:
+  bench_auth.py
+  bench_auth.py --delay 5
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from _common import setup, spin, report
+
+os.environ.setdefault('MOCK_PAM_DELAY', '2.0')
+TMP = setup('auth')
+
+import mock_pam  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+from PyQt6.QtCore import QTimer  # noqa: E402
+import main  # noqa: E402
+
+
+class Probe:
+    """10ms timer on the GUI thread; records the longest gap between ticks"""
+    def __init__(self):
+        self.timer = QTimer()
+        self.timer.setInterval(10)
+        self.timer.timeout.connect(self.tick)
+        self.last = None
+        self.worst = 0.0
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.worst = 0.0
+        self.timer.start()
+
+    def tick(self):
+        now = time.perf_counter()
+        self.worst = max(self.worst, now - self.last)
+        self.last = now
+
+
+def main_():
+    parser = argparse.ArgumentParser(description='UI responsiveness during slow PAM authentication')
+    parser.add_argument('--delay', type=float, default=float(os.environ['MOCK_PAM_DELAY']),
+                        help='seconds mock PAM takes per attempt (default: $MOCK_PAM_DELAY or 2)')
+    args = parser.parse_args()
+    os.environ['MOCK_PAM_DELAY'] = str(args.delay)
+
+    app = QApplication(sys.argv)
+    window = main.LoginWindow()
+    started = []
+    window.start_session = started.append  # never fork a session here
+    probe = Probe()
+    delay = args.delay
+    checks = []
+
+    # Old behaviour: PAM on the GUI thread
+    probe.start()
+    done = []
+    QTimer.singleShot(20, lambda: done.append(mock_pam.pam().authenticate('ice', 'secret')))
+    spin(app, lambda: done)
+    spin(app, lambda: False, timeout=0.05)
+    blocked = probe.worst
+
+    # Threaded login
+    window.username_input.setText('ice')
+    window.password_input.setText('secret')
+    probe.start()
+    window.do_login()
+    checks.append(('inputs locked while pending', not window.password_input.isEnabled()))
+    checks.append(('button offers cancel', window.login_btn.text() == 'Cancel'))
+    spin(app, lambda: started)
+    responsive = probe.worst
+    checks.append(('session started after auth', started == ['ice']))
+    checks.append(('form unlocked afterwards', window.password_input.isEnabled()))
+
+    # Wrong password
+    window.password_input.setText('wrong')
+    window.do_login()
+    spin(app, lambda: window.auth_thread is None)
+    checks.append(('failure reported', window.error_label.text() == 'Invalid username or password'))
+
+    # Cancel mid-auth; the late success must not leave a PAM session open
+    opened = mock_pam.stats['open_session']
+    closed = mock_pam.stats['close_session']
+    window.password_input.setText('secret')
+    window.do_login()
+    spin(app, lambda: False, timeout=0.1)
+    window.do_login()  # the button reads "Cancel"
+    checks.append(('unlocked immediately on cancel', window.password_input.isEnabled()))
+    spin(app, lambda: not window.auth_threads)
+    spin(app, lambda: False, timeout=0.05)
+    # Cancelled during authenticate the thread never opens a session; if it
+    # got as far as open_session, it must have closed it again
+    checks.append(('no PAM session left open by cancel',
+                   mock_pam.stats['open_session'] - opened == mock_pam.stats['close_session'] - closed))
+    checks.append(('no session from cancelled login', started == ['ice']))
+
+    print(f"PAM delay {delay:.1f}s; longest GUI-thread stall (10ms probe timer):")
+    print(f"  PAM on GUI thread : {blocked * 1000:8.1f}ms")
+    print(f"  PAM on AuthThread : {responsive * 1000:8.1f}ms")
+    failures = report(checks)
+    window.close()
+    TMP.cleanup()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Clock wakeup check (headless)
+Runs the greeter offscreen and counts, over a stretch of real time, how
+often the clock timer fires and the clock/date labels are rewritten,
+for the old 1s timer and the minute-aligned one, shown and hidden. Also
+checks the timer is armed for the next minute boundary and that the
+date label only changes when the day does.
+
+Usage:
+  bench_clock.py
+  bench_clock.py --seconds 130
+"""
+
+import sys
+import time
+import argparse
+
+from _common import setup, report
+
+TMP = setup('clock')
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+from PyQt6.QtCore import QTimer, QEventLoop, QDateTime, QDate, QTime  # noqa: E402
+import main  # noqa: E402
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def spin(app, seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents, 50)
+
+
+def measure(app, window, seconds, timer):
+    """(timer fires, clock label writes, date label writes) over `seconds`"""
+    fires, clock, date = Counter(), Counter(), Counter()
+    timer.timeout.connect(fires)
+    window.clock_label.setText = lambda text, f=window.clock_label.setText: (clock(), f(text))
+    window.date_label.setText = lambda text, f=window.date_label.setText: (date(), f(text))
+    spin(app, seconds)
+    timer.timeout.disconnect(fires)
+    del window.clock_label.setText, window.date_label.setText
+    return fires.count, clock.count, date.count
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='Clock wakeup check')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    window = main.LoginWindow()
+    window.show()
+    app.processEvents()
+    checks = []
+
+    # Minute-aligned timer
+    remaining = window.clock_timer.remainingTime()
+    now = QTime.currentTime()
+    to_boundary = 60000 - now.second() * 1000 - now.msec()
+    checks.append(('armed for the next minute', abs(remaining - to_boundary) < 200))
+    new = measure(app, window, args.seconds, window.clock_timer)
+
+    # Hidden (session running)
+    window.hide()
+    checks.append(('timer stopped while hidden', not window.clock_timer.isActive()))
+    hidden = measure(app, window, args.seconds, window.clock_timer)
+    window.show()
+    app.processEvents()
+    checks.append(('timer re-armed when shown', window.clock_timer.isActive()))
+
+    # The old behaviour: 1s timer rewriting both labels
+    window.clock_timer.stop()
+    old_timer = QTimer()
+    old_timer.timeout.connect(lambda: (
+        window.clock_label.setText(QDateTime.currentDateTime().toString("HH:mm")),
+        window.date_label.setText(QDateTime.currentDateTime().toString("dddd d MMMM yyyy"))))
+    old_timer.start(1000)
+    old = measure(app, window, args.seconds, old_timer)
+    old_timer.stop()
+
+    # Date label only changes across midnight
+    date_writes = Counter()
+    window.date_label.setText = lambda text, f=window.date_label.setText: (date_writes(), f(text))
+    day = QDate(2026, 10, 19)
+    window.clock_date = None  # the live clock may already show `day`
+    for hh, mm in ((23, 58), (23, 59)):
+        window.update_clock(QDateTime(day, QTime(hh, mm)))
+    before_midnight = date_writes.count
+    window.update_clock(QDateTime(day.addDays(1), QTime(0, 0)))
+    checks.append(('date rewritten only at midnight', before_midnight == 1 and date_writes.count == 2))
+    checks.append(('date label shows the new day',
+                   window.date_label.text() == QDateTime(day.addDays(1), QTime(0, 0)).toString("dddd d MMMM yyyy")))
+
+    print(f"Over {args.seconds:.0f}s: timer fires / clock writes / date writes")
+    print(f"  old 1s timer        : {old[0]:4d} / {old[1]:4d} / {old[2]:4d}")
+    print(f"  minute-aligned      : {new[0]:4d} / {new[1]:4d} / {new[2]:4d}")
+    print(f"  hidden (in session) : {hidden[0]:4d} / {hidden[1]:4d} / {hidden[2]:4d}")
+    checks.append(('at most one fire per started minute (+1 early fire)',
+                   new[0] <= 2 * (int(args.seconds // 60) + 1)))
+    checks.append(('no fires while hidden', hidden[0] == 0))
+    failures = report(checks)
+    window.close()
+    TMP.cleanup()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main_bench()
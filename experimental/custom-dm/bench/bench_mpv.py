@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Video wallpaper controller benchmark
+Drives MpvController against a real mpv (offscreen-friendly: --vo is
+overridden to null unless --show). Measures clip switch latency
+(loadfile over IPC) against respawning mpv for each clip, mpv's CPU use
+while playing and while paused (the greeter hidden), and prints the
+decode stats the controller collects. Also checks stop() returns at once
+and mpv is reaped from the event loop. Clips are generated with ffmpeg
+when none are given.
+
+Usage:
+  bench_mpv.py
+  bench_mpv.py --clips a.mp4 b.webm --seconds 5 --show
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import statistics
+
+from _common import setup, spin, report
+
+TMP = setup('mpv', home=False, pam=False)
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+import mpv_ipc  # noqa: E402
+from mpv_ipc import MpvController  # noqa: E402
+
+
+def make_clips(count, seconds):
+    clips = []
+    for i in range(count):
+        path = os.path.join(TMP.name, f"clip{i}.mp4")
+        subprocess.run(['ffmpeg', '-loglevel', 'error', '-f', 'lavfi',
+                        '-i', f'testsrc2=size=1920x1080:rate=30:duration={seconds}',
+                        '-pix_fmt', 'yuv420p', path], check=True)
+        clips.append(path)
+    return clips
+
+
+def cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def cpu_share(app, pid, seconds):
+    before = cpu_seconds(pid)
+    spin(app, lambda: False, timeout=seconds)
+    return (cpu_seconds(pid) - before) / seconds
+
+
+def wait_switch(app, controller):
+    return spin(app, lambda: controller.switch_sent is None, timeout=15) and controller.last_switch
+
+
+def main():
+    parser = argparse.ArgumentParser(description='mpv IPC controller benchmark')
+    parser.add_argument('--clips', nargs='*', help='video files (default: generated test clips)')
+    parser.add_argument('--switches', type=int, default=10)
+    parser.add_argument('--seconds', type=float, default=3.0, help='CPU sampling time per state')
+    parser.add_argument('--show', action='store_true', help='render to a real window')
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    clips = args.clips or make_clips(2, 10)
+    if not args.show:
+        options = mpv_ipc.mpv_options
+        mpv_ipc.mpv_options = lambda *a, **k: dict(options(*a, **k), vo='null', fs='no')
+    checks = [('VM settings replace defaults',
+               mpv_ipc.mpv_options(1920, 1080, vm=True)['hwdec'] == 'no'
+               and mpv_ipc.mpv_options(1920, 1080, vm=True)['scale'] == 'bilinear')]
+
+    # Respawn per clip (the old MpvVideoThread)
+    respawn = []
+    for i in range(min(args.switches, 5)):
+        controller = MpvController(1920, 1080)
+        start = time.monotonic()
+        controller.play(clips[i % len(clips)])
+        wait_switch(app, controller)
+        respawn.append(time.monotonic() - start)
+        controller.stop()
+
+    # One pooled mpv
+    controller = MpvController(1920, 1080)
+    controller.play(clips[0])
+    wait_switch(app, controller)
+    switch = []
+    for i in range(1, args.switches + 1):
+        controller.play(clips[i % len(clips)])
+        latency = wait_switch(app, controller)
+        if latency:
+            switch.append(latency)
+    pid = controller.process.pid
+    playing = cpu_share(app, pid, args.seconds)
+    controller.pause()
+    spin(app, lambda: False, timeout=0.3)
+    paused = cpu_share(app, pid, args.seconds)
+    controller.play(controller.path)
+    stats = controller.snapshot()
+    checks += [
+        ('one mpv process for every switch', controller.spawns == 1),
+        ('all switches completed', len(switch) == args.switches),
+        ('paused decode is near idle', paused < max(0.02, playing / 10)),
+    ]
+    process = controller.process
+    start = time.monotonic()
+    controller.stop()
+    stop_time = time.monotonic() - start
+    checks += [
+        ('stop returns without waiting for mpv', stop_time < 0.05),
+        ('stopped mpv reaped from the event loop',
+         spin(app, lambda: not controller.reapers, timeout=5) and process.returncode is not None),
+    ]
+
+    print(f"Clip change, {len(clips)} clips:")
+    print(f"  respawn mpv     : median {statistics.median(respawn) * 1000:7.1f}ms")
+    if switch:
+        print(f"  loadfile via IPC: median {statistics.median(switch) * 1000:7.1f}ms")
+    print(f"mpv CPU: playing {playing * 100:.1f}%, paused {paused * 100:.1f}%")
+    print("Stats: " + ', '.join(f"{key}={value}" for key, value in stats.items()))
+    failures = report(checks)
+    TMP.cleanup()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Wallpaper time-to-first-frame benchmark
+Runs headless (QT_QPA_PLATFORM=offscreen) against a generated 6000x4000
+JPEG and measures, for a 4K screen:
+  - old path: decode + SmoothTransformation rescale on the GUI thread
+    before anything is painted
+  - new path, cold cache: placeholder painted at once, wallpaper after the
+    worker decodes, scales and stores it
+  - new path, warm cache: wallpaper from the raw pixel cache
+
+Usage:
+  bench_pixmap_cache.py
+  bench_pixmap_cache.py --width 2560 --height 1440 --dpr 1.25 --repeat 5
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+from _common import setup, spin
+
+TMP = setup('pixmap')
+
+from PyQt6.QtWidgets import QApplication, QWidget  # noqa: E402
+from PyQt6.QtCore import Qt, QTimer  # noqa: E402
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QLinearGradient, QColor  # noqa: E402
+from main import WallpaperLoader  # noqa: E402
+from wallpapers import ScaledWallpaperCache  # noqa: E402
+
+
+class Surface(QWidget):
+    """Records when the first frame and the first wallpaper frame are painted"""
+    def __init__(self, start):
+        super().__init__()
+        self.start = start
+        self.pixmap = None
+        self.first_frame = None
+        self.wallpaper_frame = None
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.pixmap:
+            painter.drawPixmap(self.rect(), self.pixmap)
+        else:
+            painter.fillRect(self.rect(), QColor('#191724'))
+        painter.end()
+        now = time.perf_counter() - self.start
+        if self.first_frame is None:
+            self.first_frame = now
+        if self.pixmap and self.wallpaper_frame is None:
+            self.wallpaper_frame = now
+
+
+def make_wallpaper(path):
+    image = QImage(6000, 4000, QImage.Format.Format_RGB32)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, 6000, 4000)
+    gradient.setColorAt(0, QColor('#eb6f92'))
+    gradient.setColorAt(1, QColor('#31748f'))
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    image.save(str(path), 'JPG', 90)
+
+
+def old_path(app, path, width, height):
+    surface = Surface(time.perf_counter())
+    surface.resize(width, height)
+    surface.pixmap = QPixmap(str(path)).scaled(
+        width, height, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+    )
+    surface.show()
+    spin(app, lambda: surface.wallpaper_frame is not None)
+    surface.close()
+    return surface.first_frame, surface.wallpaper_frame
+
+
+def new_path(app, path, width, height, dpr, cache):
+    surface = Surface(time.perf_counter())
+    surface.resize(width, height)
+    loader = WallpaperLoader(str(path), width, height, dpr, cache)
+
+    def show(image):
+        surface.pixmap = QPixmap.fromImage(image)
+        surface.update()
+    loader.loaded.connect(show)
+    loader.start()
+    surface.show()
+    spin(app, lambda: surface.wallpaper_frame is not None)
+    loader.wait()
+    surface.close()
+    return surface.first_frame, surface.wallpaper_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Wallpaper time-to-first-frame benchmark')
+    parser.add_argument('--width', type=int, default=3840)
+    parser.add_argument('--height', type=int, default=2160)
+    parser.add_argument('--dpr', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    wallpaper = Path(TMP.name) / 'wallpaper.jpg'
+    make_wallpaper(wallpaper)
+    cache_dir = Path(TMP.name) / 'scaled'
+
+    results = {'old (GUI thread)': [], 'new, cold cache': [], 'new, warm cache': []}
+    for _ in range(args.repeat):
+        results['old (GUI thread)'].append(old_path(app, wallpaper, args.width, args.height))
+        for entry in cache_dir.glob('*.raw'):
+            entry.unlink()
+        cache = ScaledWallpaperCache(str(cache_dir))
+        results['new, cold cache'].append(new_path(app, wallpaper, args.width, args.height, args.dpr, cache))
+        results['new, warm cache'].append(new_path(app, wallpaper, args.width, args.height, args.dpr, cache))
+    TMP.cleanup()
+
+    print(f"6000x4000 JPEG -> {args.width}x{args.height}@{args.dpr:g} (median of {args.repeat})")
+    print(f"{'':<20}{'first frame':>14}{'wallpaper shown':>18}")
+    for name, samples in results.items():
+        first = statistics.median(s[0] for s in samples) * 1000
+        shown = statistics.median(s[1] for s in samples) * 1000
+        print(f"{name:<20}{first:>12.1f}ms{shown:>16.1f}ms")
+    QTimer.singleShot(0, app.quit)
+
+
+if __name__ == '__main__':
+    main()
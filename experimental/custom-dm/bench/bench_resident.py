@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Logout-to-greeter latency: resident greeter versus a restart
+Runs the greeter headless (bench/mock_pam.py for python-pam), forks
+stand-in sessions and times from the session's exit to the greeter's
+first paint when it stays resident. For comparison, starts the greeter
+cold in a fresh interpreter (what a systemd restart pays, without
+RestartSec) and times to its first paint. Also reports RSS while hidden.
+
+Usage:
+  bench_resident.py
+  bench_resident.py --runs 10 --cold 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+from _common import APP_DIR, BENCH_DIR, setup, spin, report
+
+os.environ['CUSTOM_DM_RESIDENT'] = 'true'
+TMP = setup('resident')
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+import main  # noqa: E402
+
+# A fresh greeter up to its first paint; prints seconds since the
+# interpreter was asked to start (passed in argv)
+COLD_START = '''
+import sys, time
+start = float(sys.argv[1])
+sys.path[:0] = sys.argv[2:4]
+import mock_pam
+sys.modules['pam'] = mock_pam
+from PyQt6.QtWidgets import QApplication
+import main
+
+class Window(main.LoginWindow):
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        print(time.monotonic() - start, flush=True)
+        QApplication.exit(0)
+
+app = QApplication(sys.argv[:1])
+window = Window()
+window.show()
+app.exec()
+'''
+
+
+def cold_start():
+    start = time.monotonic()
+    out = subprocess.run(
+        [sys.executable, '-c', COLD_START, str(start), str(APP_DIR), str(BENCH_DIR)],
+        capture_output=True, text=True, timeout=60,
+    ).stdout.split()
+    return float(out[-1])
+
+
+def resident_return(app, window, session):
+    pid = os.fork()
+    if pid == 0:
+        time.sleep(session)
+        os._exit(0)
+    window.last_return_latency = None
+    window.session_started(pid)
+    hidden_rss = main.rss_kib()
+    spin(app, lambda: window.last_return_latency is not None)
+    return window.last_return_latency, hidden_rss
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='Resident greeter benchmark')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--cold', type=int, default=3, help='cold starts to time')
+    parser.add_argument('--session', type=float, default=0.2, help='seconds each stand-in session runs')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    window = main.LoginWindow()
+    window.show()
+    spin(app, lambda: False, timeout=0.2)
+    shown_rss = main.rss_kib()
+
+    warm, hidden = [], []
+    for _ in range(args.runs):
+        latency, rss = resident_return(app, window, args.session)
+        warm.append(latency)
+        hidden.append(rss)
+    checks = [
+        ('greeter visible again', window.isVisible()),
+        ('clock running again', window.clock_timer.isActive()),
+        ('session reaped', window.session_pid is None and window.session_watcher is None),
+    ]
+    window.close()
+
+    cold = [cold_start() for _ in range(args.cold)]
+
+    print(f"Session exit -> greeter painted ({args.runs} logouts):")
+    print(f"  resident     : median {statistics.median(warm) * 1000:8.1f}ms  max {max(warm) * 1000:8.1f}ms")
+    print(f"  cold restart : median {statistics.median(cold) * 1000:8.1f}ms  max {max(cold) * 1000:8.1f}ms"
+          "  (+ RestartSec)")
+    print(f"RSS shown {shown_rss // 1024} MiB, hidden (trimmed) {statistics.median(hidden) // 1024} MiB")
+    failures = report(checks)
+    TMP.cleanup()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main_bench()
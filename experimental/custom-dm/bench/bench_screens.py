@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Multi-screen greeter check (headless)
+Starts the greeter on the offscreen platform configured with several
+screens and a static wallpaper, then checks that every screen gets a
+background at its own native size, that same-sized screens share one
+decode and one pixmap, and that unplugging and re-plugging a screen
+(simulated: the offscreen platform has no hotplug) adds and removes
+surfaces without touching the rest.
+
+Usage:
+  bench_screens.py
+  bench_screens.py --screens 1920x1080 1920x1080 2560x1440@1.25
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from _common import setup, spin, report
+
+# QT_QPA_PLATFORM is set again by configure(), before the QApplication
+TMP = setup('screens')
+
+
+def configure(specs):
+    """Offscreen platform config with one entry per WxH[@dpr] spec"""
+    screens = []
+    x = 0
+    for i, spec in enumerate(specs):
+        size, _, dpr = spec.partition('@')
+        width, height = map(int, size.split('x'))
+        dpr = float(dpr or 1)
+        screens.append({'name': f"bench-{i}", 'x': x, 'y': 0, 'width': round(width * dpr),
+                        'height': round(height * dpr), 'logicalDpi': 96, 'logicalBaseDpi': 96, 'dpr': dpr})
+        x += round(width * dpr)
+    path = os.path.join(TMP.name, 'screens.json')
+    with open(path, 'w') as f:
+        json.dump({'screens': screens}, f)
+    os.environ['QT_QPA_PLATFORM'] = f"offscreen:configfile={path}"
+
+
+def background_key(window):
+    from PyQt6.QtGui import QPalette
+    brush = window.palette().brush(QPalette.ColorRole.Window)
+    return brush.texture().cacheKey() if not brush.texture().isNull() else None
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='Multi-screen greeter check')
+    parser.add_argument('--screens', nargs='+', default=['1920x1080', '1920x1080', '2560x1440'])
+    args = parser.parse_args()
+    configure(args.screens)
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QImage
+    import main
+
+    walls = Path(TMP.name) / '.config/hypr/wallpapers'
+    walls.mkdir(parents=True)
+    QImage(os.urandom(3840 * 2160 * 4), 3840, 2160, QImage.Format.Format_RGB32).save(
+        str(walls / 'background.jpg'), 'JPG', 90)
+
+    decodes = []
+    load = main.WallpaperLoader.load
+    main.WallpaperLoader.load = lambda self: (decodes.append((self.width, self.height, self.dpr)), load(self))[1]
+
+    app = QApplication(sys.argv)
+    screens = app.screens()
+    window = main.LoginWindow()
+    window.showFullScreen()
+    windows = lambda: [window] + list(window.surfaces.values())  # noqa: E731
+    spin(app, lambda: all(background_key(w) for w in windows()))
+
+    sizes = {main.screen_key(screen) for screen in screens}
+    keys = {}
+    for screen in screens:
+        w = window if screen is app.primaryScreen() else window.surfaces.get(screen)
+        keys.setdefault(main.screen_key(screen), set()).add(background_key(w) if w else None)
+    checks = [
+        (f"{len(screens)} screens, one surface per secondary", len(window.surfaces) == len(screens) - 1),
+        ('surfaces cover their screens',
+         all(s.screen() is sc and s.isVisible() for sc, s in window.surfaces.items())),
+        (f"one decode per distinct size ({len(sizes)})", sorted(decodes) == sorted(sizes)),
+        ('same-sized screens share one pixmap', all(len(k) == 1 and None not in k for k in keys.values())),
+    ]
+
+    # Unplug the last screen, then plug it back in
+    gone = screens[-1]
+    app.screens = lambda: screens[:-1]
+    window.on_screen_removed(gone)
+    checks.append(('unplugged screen loses its surface', gone not in window.surfaces))
+    still_used = any(main.screen_key(screen) == main.screen_key(gone) for screen in screens[:-1])
+    checks.append(('pixmap kept only while a screen of its size remains',
+                   (main.screen_key(gone) in window.backgrounds) == still_used))
+    before = len(decodes)
+    app.screens = lambda: screens
+    window.on_screen_added(gone)
+    spin(app, lambda: gone in window.surfaces and background_key(window.surfaces[gone]))
+    checks.append(('re-plugged screen gets a surface and wallpaper',
+                   gone in window.surfaces and background_key(window.surfaces[gone]) is not None))
+    checks.append(('re-plug decodes only if its size was dropped',
+                   len(decodes) - before <= 1))
+
+    window.hide()
+    checks.append(('surfaces hidden with the greeter', not any(s.isVisible() for s in window.surfaces.values())))
+
+    print(f"Screens: {', '.join(args.screens)}; decodes: {len(decodes)}")
+    failures = report(checks)
+    window.close()
+    TMP.cleanup()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Session exit detection benchmark
+Forks stand-in sessions that run for a moment and exit, and measures how
+long the greeter takes to notice: the old 500ms os.kill() polling versus
+SessionWatcher (pidfd, and the SIGCHLD self-pipe fallback). Also counts
+event-loop wakeups while the session runs and checks the exit status is
+collected, no zombie is left behind, and the fallback restores the
+SIGCHLD handler and wakeup fd it replaced.
+
+Usage:
+  bench_session_exit.py
+  bench_session_exit.py --runs 20 --session 0.5
+"""
+
+import os
+import sys
+import time
+import signal
+import struct
+import argparse
+import statistics
+
+from _common import setup
+
+TMP = setup('session')
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+from PyQt6.QtCore import QTimer, QEventLoop, QAbstractEventDispatcher  # noqa: E402
+import main  # noqa: E402
+
+
+def fork_session(seconds, status, report_fd):
+    """Child sleeps, reports when it exits (CLOCK_MONOTONIC is system-wide)"""
+    pid = os.fork()
+    if pid == 0:
+        time.sleep(seconds)
+        os.write(report_fd, struct.pack('d', time.monotonic()))
+        os._exit(status)
+    return pid
+
+
+def exited_at(report_fd):
+    return struct.unpack('d', os.read(report_fd, 8))[0]
+
+
+class Wakeups:
+    """Counts how often the event loop wakes up"""
+    def __init__(self):
+        self.count = 0
+        QAbstractEventDispatcher.instance().awake.connect(self.tick)
+
+    def tick(self):
+        self.count += 1
+
+
+def run_polling(app, seconds, report):
+    """The old monitor_session: a liveness check every 500ms
+
+    os.kill(pid, 0) alone succeeds on an unreaped zombie, so this adds
+    the waitpid() the old code was missing - its best case.
+    """
+    pid = fork_session(seconds, 0, report[1])
+    loop = QEventLoop()
+    result = {}
+
+    def check():
+        try:
+            os.kill(pid, 0)
+            if os.waitpid(pid, os.WNOHANG)[0] == 0:
+                QTimer.singleShot(500, check)
+                return
+        except OSError:
+            pass
+        result['noticed'] = time.monotonic()
+        loop.quit()
+
+    QTimer.singleShot(100, check)
+    loop.exec()
+    return result['noticed'] - exited_at(report[0]), None
+
+
+def run_watcher(app, seconds, report, status):
+    pid = fork_session(seconds, status, report[1])
+    loop = QEventLoop()
+    result = {}
+    watcher = main.SessionWatcher(pid)
+
+    def exited(child, code):
+        result['noticed'] = time.monotonic()
+        result['code'] = code
+        loop.quit()
+
+    watcher.exited.connect(exited)
+    loop.exec()
+    try:
+        os.waitpid(pid, os.WNOHANG)
+        zombie = True
+    except ChildProcessError:
+        zombie = False
+    return result['noticed'] - exited_at(report[0]), (result['code'], zombie, watcher.pipe is not None)
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='Session exit detection benchmark')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--session', type=float, default=0.3, help='seconds each stand-in session runs')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    wakeups = Wakeups()
+    report = os.pipe()
+    failures = 0
+
+    modes = [('poll 500ms', lambda: run_polling(app, args.session, report))]
+    modes.append(('pidfd', lambda: run_watcher(app, args.session, report, 3)))
+    pidfd_open = os.pidfd_open
+
+    def without_pidfd(pid):
+        raise OSError('pidfd_open disabled for the benchmark')
+
+    def sigchld():
+        os.pidfd_open = without_pidfd
+        try:
+            return run_watcher(app, args.session, report, 3)
+        finally:
+            os.pidfd_open = pidfd_open
+    modes.append(('SIGCHLD pipe', sigchld))
+
+    print(f"{'mode':<14}{'median':>10}{'max':>10}{'wakeups/run':>14}")
+    for name, run in modes:
+        latencies = []
+        before = wakeups.count
+        for _ in range(args.runs):
+            latency, details = run()
+            latencies.append(latency)
+            if details:
+                code, zombie, fallback = details
+                ok = code == 3 and not zombie and fallback == (name != 'pidfd')
+                if not ok:
+                    print(f"FAIL {name}: exit code {code}, zombie={zombie}, fallback={fallback}")
+                    failures += 1
+        per_run = (wakeups.count - before) / args.runs
+        print(f"{name:<14}{statistics.median(latencies) * 1000:>8.2f}ms"
+              f"{max(latencies) * 1000:>8.2f}ms{per_run:>14.1f}")
+
+    # The fallback hands back whatever SIGCHLD setup it found
+    def handler(signum, frame):
+        pass
+    own_read, own_write = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+    signal.signal(signal.SIGCHLD, handler)
+    previous_fd = signal.set_wakeup_fd(own_write)
+    sigchld()
+    restored_fd = signal.set_wakeup_fd(previous_fd)
+    ok = restored_fd == own_write and signal.getsignal(signal.SIGCHLD) is handler
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    os.close(own_read)
+    os.close(own_write)
+    print(f"{'OK  ' if ok else 'FAIL'} previous wakeup fd and SIGCHLD handler restored")
+    failures += not ok
+
+    # A session killed by a signal reports the negative signal number
+    pid = fork_session(30, 0, report[1])
+    watcher = main.SessionWatcher(pid)
+    loop = QEventLoop()
+    codes = []
+    watcher.exited.connect(lambda child, code: (codes.append(code), loop.quit()))
+    QTimer.singleShot(50, lambda: os.kill(pid, 15))
+    loop.exec()
+    ok = codes == [-15]
+    print(f"{'OK  ' if ok else 'FAIL'} killed session reports {codes}")
+    failures += not ok
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Session catalog benchmark
+Builds wayland-sessions/xsessions folders and compares what the greeter
+pays to list sessions: the old listdir at startup plus reading the
+.desktop file at login, a first-boot catalog scan, and a cached resolve.
+Also checks the parsing: Exec arguments and field codes, TryExec,
+DesktopNames, Hidden entries and cache invalidation.
+
+Usage:
+  bench_sessions.py
+  bench_sessions.py --sessions 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sessions import SessionCatalog  # noqa: E402
+
+SESSIONS = {
+    'hyprland.desktop': "[Desktop Entry]\nName=Hyprland\nName[de]=Hyprland DE\nExec=/bin/true --config %f\n"
+                        "Type=Application\nDesktopNames=Hyprland\n",
+    'plasma.desktop': "[Desktop Entry]\nName=Plasma (Wayland)\nExec=/bin/sh -c 'exec startplasma %U'\n"
+                      "TryExec=/bin/sh\nDesktopNames=KDE\n",
+    'gnome.desktop': "[Desktop Entry]\nName=GNOME\nExec=/bin/true\nDesktopNames=GNOME;GNOME-Wayland\n",
+    'missing.desktop': "[Desktop Entry]\nName=Not Installed\nExec=/nonexistent/session\n",
+    'hidden.desktop': "[Desktop Entry]\nName=Hidden\nExec=/bin/true\nHidden=true\n",
+    'tryexec.desktop': "[Desktop Entry]\nName=TryExec Missing\nExec=/bin/true\nTryExec=/nonexistent\n",
+}
+
+
+def build_tree(root, extra):
+    wayland = root / 'wayland-sessions'
+    xsessions = root / 'xsessions'
+    wayland.mkdir()
+    xsessions.mkdir()
+    for name, text in SESSIONS.items():
+        (wayland / name).write_text(text)
+    for i in range(extra):
+        (xsessions / f"wm-{i:03d}.desktop").write_text(
+            f"[Desktop Entry]\nName=Window Manager {i}\nExec=/bin/true\nDesktopNames=wm{i}\n")
+    return [str(wayland), str(xsessions)]
+
+
+def old_listing(dirs):
+    """The old load_sessions, plus the .desktop read get_exec_from_desktop did at login"""
+    sessions = []
+    for d in dirs:
+        if os.path.isdir(d):
+            for f in sorted(os.listdir(d)):
+                if f.endswith('.desktop'):
+                    sessions.append((f.replace('.desktop', '').title(), os.path.join(d, f)))
+    with open(sessions[-1][1]) as f:
+        next((line for line in f if line.startswith('Exec=')), None)
+    return sessions
+
+
+def timed(func, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Session catalog benchmark')
+    parser.add_argument('--sessions', type=int, default=20, help='extra xsessions entries')
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-sessions-') as tmp:
+        root = Path(tmp)
+        dirs = build_tree(root, args.sessions)
+        cache = str(root / 'cache/sessions.json')
+
+        def first_boot():
+            os.path.exists(cache) and os.remove(cache)
+            SessionCatalog(cache, dirs).resolve()
+
+        old = timed(lambda: old_listing(dirs), args.runs)
+        cold = timed(first_boot, args.runs)
+        catalog = SessionCatalog(cache, dirs)
+        catalog.resolve()
+        warm = timed(catalog.resolve, args.runs)
+        scans = catalog.scans
+
+        sessions = {session['id']: session for session in catalog.resolve()}
+        first = catalog.resolve()[0]['id']
+        checks = [
+            ('cached resolve does not rescan', catalog.scans == scans == 0),
+            ('Hyprland listed first', first == 'hyprland'),
+            ('unlocalized Name', sessions['hyprland']['name'] == 'Hyprland'),
+            ('field codes dropped', sessions['hyprland']['argv'] == ['/bin/true', '--config']),
+            ('quoted Exec argument', sessions['plasma']['argv'] == ['/bin/sh', '-c', 'exec startplasma %U']),
+            ('DesktopNames joined', sessions['gnome']['env']['XDG_CURRENT_DESKTOP'] == 'GNOME:GNOME-Wayland'
+             and sessions['gnome']['env']['XDG_SESSION_DESKTOP'] == 'GNOME'),
+            ('uninstalled, hidden and TryExec-missing skipped',
+             not {'missing', 'hidden', 'tryexec'} & set(sessions)),
+        ]
+
+        time.sleep(0.01)
+        Path(dirs[0], 'sway.desktop').write_text("[Desktop Entry]\nName=Sway\nExec=/bin/true\nDesktopNames=sway\n")
+        checks.append(('new session file picked up', 'sway' in {s['id'] for s in catalog.resolve()}))
+        Path(dirs[0], 'gnome.desktop').write_text("[Desktop Entry]\nName=GNOME Classic\nExec=/bin/true\n")
+        checks.append(('edited session file picked up',
+                       any(s['name'] == 'GNOME Classic' for s in catalog.resolve())))
+
+    print(f"{len(SESSIONS) + args.sessions} session files, median of {args.runs}:")
+    print(f"  old listdir + Exec read : {old * 1000:8.3f}ms")
+    print(f"  catalog, first boot     : {cold * 1000:8.3f}ms")
+    print(f"  catalog, cached         : {warm * 1000:8.3f}ms")
+    failures = 0
+    for name, ok in checks:
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        failures += not ok
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Greeter startup benchmark (headless)
+Starts the real greeter again and again under QT_QPA_PLATFORM=offscreen,
+with bench/mock_pam.py for python-pam and bench/mock_mpv.py for mpv. Each
+run writes its startup profile (CUSTOM_DM_PROFILE) and exits once
+interactive. Reports time-to-first-frame and time-to-interactive
+percentiles, measured from exec, and the median of every phase.
+
+Usage:
+  bench_startup.py                          # 20 runs, static wallpaper
+  bench_startup.py --runs 50 --wallpaper video
+  bench_startup.py --cold-cache             # empty cache dir every run
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent
+
+CHILD = '''
+import sys, runpy
+sys.path[:0] = sys.argv[1:3]
+import mock_pam
+sys.modules['pam'] = mock_pam
+runpy.run_path(sys.argv[2] + '/main.py', run_name='__main__')
+'''
+
+
+def make_home(home, wallpaper):
+    walls = home / '.config/hypr/wallpapers'
+    walls.mkdir(parents=True)
+    if wallpaper == 'image':
+        from PyQt6.QtGui import QImage
+        width, height = 3840, 2160
+        # Noise, so the JPEG decode is not trivially cheap
+        pixels = os.urandom(width * height * 4)
+        QImage(pixels, width, height, QImage.Format.Format_RGB32).save(str(walls / 'background.jpg'), 'JPG', 90)
+    elif wallpaper == 'video':
+        (walls / 'live').mkdir()
+        (walls / 'live/login-video.mp4').touch()
+
+
+def make_path(tmp):
+    """PATH with mock_mpv.py installed as `mpv`"""
+    bin_dir = tmp / 'bin'
+    bin_dir.mkdir()
+    mpv = bin_dir / 'mpv'
+    mpv.write_text(f"#!/bin/sh\nexec {sys.executable} {BENCH_DIR / 'mock_mpv.py'} \"$@\"\n")
+    mpv.chmod(0o755)
+    return f"{bin_dir}:{os.environ.get('PATH', '/usr/bin:/bin')}"
+
+
+def run_once(env, profile):
+    if os.path.exists(profile):
+        os.remove(profile)
+    result = subprocess.run([sys.executable, '-c', CHILD, str(BENCH_DIR), str(APP_DIR)],
+                            env=env, capture_output=True, text=True, timeout=60)
+    try:
+        with open(profile) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        sys.exit(f"Greeter run failed (exit {result.returncode}):\n{result.stdout}{result.stderr}")
+
+
+def percentiles(values):
+    if len(values) < 2:
+        return values[0], values[0], values[0]
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return statistics.median(values), cuts[89], cuts[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless greeter startup benchmark')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--wallpaper', choices=('image', 'video', 'none'), default='image')
+    parser.add_argument('--cold-cache', action='store_true', help='start every run with an empty cache dir')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-startup-') as tmp:
+        tmp = Path(tmp)
+        home = tmp / 'home'
+        cache = tmp / 'cache'
+        make_home(home, args.wallpaper)
+        profile = str(tmp / 'profile.json')
+        env = dict(os.environ, HOME=str(home), CUSTOM_DM_CACHE_DIR=str(cache), CUSTOM_DM_PROFILE=profile,
+                   QT_QPA_PLATFORM='offscreen', PATH=make_path(tmp))
+
+        runs = []
+        for _ in range(args.runs):
+            if args.cold_cache:
+                shutil.rmtree(cache, ignore_errors=True)
+            runs.append(run_once(env, profile))
+
+    print(f"{args.runs} runs, wallpaper={args.wallpaper}, "
+          f"{'cold' if args.cold_cache else 'warm'} cache (ms since exec)")
+    print(f"{'':<18}{'p50':>9}{'p90':>9}{'p99':>9}")
+    for point in ('first frame', 'interactive', 'wallpaper shown', 'video playing'):
+        values = [run[point] for run in runs if point in run]
+        if values:
+            p50, p90, p99 = percentiles(values)
+            print(f"{point:<18}{p50:9.1f}{p90:9.1f}{p99:9.1f}")
+
+    print("\nMedian phase durations:")
+    durations = {}
+    for run in runs:
+        last = 0.0
+        for phase, at in run.items():
+            durations.setdefault(phase, []).append(at - last)
+            last = at
+    for phase, values in durations.items():
+        print(f"  {phase:<16}{statistics.median(values):8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Stylesheet and font setup benchmark
+Builds the greeter headless and times styling it two ways: the old
+per-widget setStyleSheet()/setFont(QFont(...)) calls (reproduced here)
+and theme.py's single application stylesheet, installed before the
+window is built as main() does. Also times a theme swap. Each
+measurement includes constructing the window and polishing every
+widget, which is where Qt parses the style sheets. Windows from earlier
+runs are deleted first, so no run repolishes them.
+
+Usage:
+  bench_theme.py
+  bench_theme.py --runs 30
+"""
+
+import sys
+import time
+import argparse
+import statistics
+
+from _common import setup
+
+TMP = setup('theme')
+
+from PyQt6.QtWidgets import QApplication, QWidget  # noqa: E402
+from PyQt6.QtCore import QEvent  # noqa: E402
+from PyQt6.QtGui import QFont  # noqa: E402
+import main  # noqa: E402
+import theme  # noqa: E402
+
+FAMILY = "JetBrainsMono Nerd Font"
+INPUT = """
+    QLineEdit { background-color: rgba(33, 33, 33, 220); color: #e0def4; border: 2px solid transparent;
+                border-radius: 8px; padding: 12px; font-size: 14px; }
+    QLineEdit:focus { border: 2px solid #c4a7e7; }
+"""
+COMBO = """
+    QComboBox { background-color: rgba(33, 33, 33, 220); color: #e0def4; border: 2px solid transparent;
+                border-radius: 8px; padding: 10px; font-size: 12px; }
+    QComboBox:focus { border: 2px solid #c4a7e7; }
+    QComboBox::drop-down { border: none; width: 30px; }
+    QComboBox QAbstractItemView { background-color: #212121; color: #e0def4;
+                                  selection-background-color: #c4a7e7; border-radius: 8px; }
+"""
+
+
+def button(color):
+    return f"""
+        QPushButton {{ background-color: {color}; color: #e0def4; border: none; border-radius: 8px;
+                       padding: 14px; font-size: 14px; font-weight: bold; }}
+        QPushButton:hover {{ background-color: {color}dd; }}
+        QPushButton:pressed {{ background-color: {color}aa; }}
+    """
+
+
+def old_styling(window):
+    """What setup_ui and main() used to do"""
+    font = QFont(FAMILY, 10)
+    if not QFont(font).exactMatch():
+        font = QFont("Noto Sans", 10)
+    QApplication.instance().setFont(font)
+    window.left_panel.setStyleSheet("QWidget { background-color: rgba(25, 23, 36, 220);"
+                                    " border-right: 1px solid rgba(196, 167, 231, 50); }")
+    window.clock_label.setStyleSheet("QLabel { color: #e0def4; font-size: 80px; font-weight: bold; }")
+    window.date_label.setStyleSheet("color: #c4a7e7; font-size: 22px;")
+    for widget in (window.username_input, window.password_input):
+        widget.setStyleSheet(INPUT)
+        widget.setFont(QFont(FAMILY, 14))
+    window.session_combo.setStyleSheet(COMBO)
+    window.session_combo.setFont(QFont(FAMILY, 12))
+    window.login_btn.setStyleSheet(button("#5e81ac"))
+    window.login_btn.setFont(QFont(FAMILY, 14))
+    window.error_label.setStyleSheet("color: #eb6f92; font-size: 14px; padding: 10px;")
+    for name, color in (('shutdownButton', '#bf616a'), ('rebootButton', '#d08770')):
+        widget = window.findChild(QWidget, name)
+        widget.setStyleSheet(button(color))
+        widget.setFont(QFont(FAMILY, 11))
+
+
+def polish(window):
+    window.ensurePolished()
+    for widget in window.findChildren(QWidget):
+        widget.ensurePolished()
+
+
+def dispose(app, window):
+    window.deleteLater()
+    # processEvents() alone leaves deferred deletes queued
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+def timed_build(app, before, after):
+    """Time before() (app-wide setup), building the window, after(window) and polish"""
+    start = time.perf_counter()
+    before()
+    window = main.LoginWindow()
+    after(window)
+    polish(window)
+    took = time.perf_counter() - start
+    dispose(app, window)
+    return took
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='Stylesheet and font setup benchmark')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    def new_setup():
+        # As main() does: font and sheet in place before LoginWindow()
+        app.setFont(theme.app_font())
+        theme.apply_theme(app)
+
+    old, new, swap = [], [], []
+    for _ in range(args.runs):
+        app.setStyleSheet('')
+        old.append(timed_build(app, lambda: None, old_styling))
+        new.append(timed_build(app, new_setup, lambda window: None))
+
+    window = main.LoginWindow()
+    polish(window)
+    for i in range(args.runs):
+        start = time.perf_counter()
+        window.set_theme('rose-pine-dawn' if i % 2 == 0 else 'rose-pine')
+        polish(window)
+        swap.append(time.perf_counter() - start)
+
+    print(f"Family: {theme.font_family()}; median of {args.runs} (window build + polish):")
+    print(f"  per-widget sheets + QFonts : {statistics.median(old) * 1000:8.2f}ms")
+    print(f"  one app stylesheet         : {statistics.median(new) * 1000:8.2f}ms")
+    print(f"  theme swap                 : {statistics.median(swap) * 1000:8.2f}ms")
+    window.close()
+    TMP.cleanup()
+
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Wallpaper discovery benchmark
+Builds a wallpaper tree with a large live-wallpapers folder and compares
+what the greeter's GUI thread pays to pick a background: the old
+listdir-twice-plus-probes search, a first-boot scan, and a cached
+resolve (whose directory check runs on a background thread).
+
+Usage:
+  bench_wallpapers.py                    # 20000 files, no videos
+  bench_wallpapers.py --files 100000 --videos 3
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from wallpapers import WallpaperIndex, VIDEO_EXTENSIONS, IMAGE_EXTENSIONS  # noqa: E402
+
+
+def build_tree(root, files, videos):
+    live = root / 'wallpapers/live-wallpapers'
+    live.mkdir(parents=True)
+    for i in range(files):
+        # Mostly images plus the clutter a synced folder collects
+        suffix = ('.jpg', '.png', '.txt', '.part')[i % 4]
+        (live / f"wall-{i:06d}{suffix}").touch()
+    for i in range(videos):
+        (live / f"zz-clip-{i}.mp4").touch()
+    missing = root / 'missing'
+    return {
+        'video_dirs': [str(live)],
+        'video_paths': [str(missing / f"login-video{i}.mp4") for i in range(8)],
+        'late_video_dirs': [str(root / 'wallpapers')],
+        'image_dirs': [str(live)],
+        'image_paths': [str(missing / f"background{i}.jpg") for i in range(10)],
+    }
+
+
+def legacy_pick(sources):
+    """The search LoginWindow.load_wallpaper used to run on every start"""
+    live = sources['video_dirs'][0]
+    for name in os.listdir(live):
+        if name.lower().endswith(VIDEO_EXTENSIONS):
+            return os.path.join(live, name), None
+    images = [os.path.join(live, name) for name in sorted(os.listdir(live))
+              if name.lower().endswith(IMAGE_EXTENSIONS)]
+    for path in sources['video_paths']:
+        if os.path.exists(path):
+            return path, None
+    for path in images + sources['image_paths']:
+        if os.path.exists(path):
+            return None, path
+    return None, None
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Wallpaper discovery startup benchmark')
+    parser.add_argument('--files', type=int, default=20000, help='files in live-wallpapers')
+    parser.add_argument('--videos', type=int, default=0, help='videos in live-wallpapers')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-wallpapers-') as tmp:
+        root = Path(tmp)
+        sources = build_tree(root, args.files, args.videos)
+        cache = str(root / 'cache/wallpapers.json')
+
+        legacy = timed(lambda: legacy_pick(sources), args.repeat)
+
+        def cold():
+            if os.path.exists(cache):
+                os.remove(cache)
+            WallpaperIndex(cache, sources).resolve()
+        first_boot = timed(cold, args.repeat)
+
+        WallpaperIndex(cache, sources).resolve()
+        warm = timed(lambda: WallpaperIndex(cache, sources).resolve(), args.repeat)
+        index = WallpaperIndex(cache, sources)
+        check = timed(lambda: index.snapshot(), args.repeat)
+
+        # Adding a file must be noticed by the background check
+        (Path(sources['image_dirs'][0]) / '0000-new.jpg').touch()
+        changed = []
+        index = WallpaperIndex(cache, sources)
+        index.resolve(on_change=lambda video, image: changed.append(image))
+        deadline = time.monotonic() + 10
+        while not changed and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    print(f"live-wallpapers: {args.files} files, {args.videos} videos (median of {args.repeat})")
+    print(f"{'old search (GUI thread)':<32}{legacy:>9.2f}ms")
+    print(f"{'first boot scan + cache write':<32}{first_boot:>9.2f}ms")
+    print(f"{'cached resolve (GUI thread)':<32}{warm:>9.2f}ms  ({legacy / warm:.0f}x faster)")
+    print(f"{'mtime check (background)':<32}{check:>9.2f}ms")
+    ok = bool(changed) and changed[0].endswith('0000-new.jpg')
+    print(f"{'OK  ' if ok else 'FAIL'} new wallpaper picked up by the background rescan")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
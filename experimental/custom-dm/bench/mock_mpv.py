@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Stand-in for mpv in headless benchmarks
+Speaks just enough of mpv's JSON IPC over --input-ipc-client=fd://N:
+every command succeeds, loadfile is followed by a playback-restart
+event and quit exits. Nothing is decoded or shown.
+"""
+
+import os
+import sys
+import json
+
+
+def main():
+    fd = next(int(arg.split('fd://', 1)[1]) for arg in sys.argv[1:] if arg.startswith('--input-ipc-client='))
+    with os.fdopen(fd, 'r+b', buffering=0) as ipc:
+        for line in ipc:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                continue
+            command = request.get('command', [None])[0]
+            reply = [{'request_id': request.get('request_id'), 'error': 'success', 'data': None}]
+            if command == 'loadfile':
+                reply.append({'event': 'playback-restart'})
+            ipc.write(b''.join(json.dumps(message).encode() + b'\n' for message in reply))
+            if command == 'quit':
+                return
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Stand-in for python-pam in the custom-dm benchmarks
+Accepts MOCK_PAM_PASSWORD (default "secret") for any user after
+MOCK_PAM_DELAY seconds, the way pam_faillock's delay or a slow network
+backend would, and counts session opens/closes.
+"""
+
+import os
+import time
+
+stats = {'authenticate': 0, 'open_session': 0, 'close_session': 0}
+
+
+class pam:
+    def __init__(self):
+        self.delay = float(os.environ.get('MOCK_PAM_DELAY', '2.0'))
+        self.code = 0
+        self.reason = None
+
+    def authenticate(self, username, password, service='login'):
+        stats['authenticate'] += 1
+        time.sleep(self.delay)
+        ok = password == os.environ.get('MOCK_PAM_PASSWORD', 'secret')
+        self.reason = None if ok else 'Authentication failure'
+        return ok
+
+    def open_session(self):
+        stats['open_session'] += 1
+        return True
+
+    def close_session(self):
+        stats['close_session'] += 1
+        return True
@@ -16,19 +16,37 @@ import fcntl
 import termios
 import signal
 import json
+import shlex
+import time
+import ctypes
+import ctypes.util
+import gc
+from startup import StartupProfile
+
+# Before PyQt6, so its import is timed too
+PROFILE = StartupProfile()
+
 import pam
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, 
     QHBoxLayout, QLineEdit, QPushButton, QLabel,
     QComboBox, QMessageBox, QGraphicsOpacityEffect
 )
-from PyQt6.QtCore import Qt, QTimer, QDateTime, QPropertyAnimation, QEasingCurve, QThread
-from PyQt6.QtGui import QPixmap, QPalette, QColor, QFont, QPainter
+from PyQt6.QtCore import (
+    Qt, QTimer, QDateTime, QPropertyAnimation, QEasingCurve, QThread, QObject,
+    QSocketNotifier, pyqtSignal
+)
+from PyQt6.QtGui import QPixmap, QPixmapCache, QImage, QPalette, QColor, QPainter, QBrush, QLinearGradient
+
+from wallpapers import WallpaperIndex, ScaledWallpaperCache
+from mpv_ipc import MpvController
+from sessions import SessionCatalog, SESSION_PATH
+import theme
+
+PROFILE.mark('import')
 
 # Python <3.13 compatibility for initgroups
 if not hasattr(os, 'initgroups'):
-    import ctypes
-    import ctypes.util
     def initgroups(username, gid):
         libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
         libc.initgroups(username.encode('utf-8'), gid)
@@ -39,85 +57,279 @@ GPU_TYPE = os.environ.get('CUSTOM_DM_GPU', 'unknown')
 IS_VM = os.environ.get('CUSTOM_DM_VM', 'false').lower() == 'true'
 TEST_MODE = os.environ.get('CUSTOM_DM_TEST', 'false').lower() == 'true'
 LOCK_MODE = os.environ.get('CUSTOM_DM_LOCK', 'false').lower() == 'true'
+# Stay running between sessions instead of exiting for systemd to restart us
+RESIDENT = os.environ.get('CUSTOM_DM_RESIDENT', 'true').lower() == 'true'
+
+
+def rss_kib():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def trim_memory():
+    """Give back what the hidden greeter doesn't need; returns RSS before/after (KiB)
 
+    Decoded wallpapers, the session list and widgets stay; this only frees
+    garbage, Qt's pixmap cache and malloc's free pages.
+    """
+    before = rss_kib()
+    gc.collect()
+    QPixmapCache.clear()
+    try:
+        ctypes.CDLL(ctypes.util.find_library('c')).malloc_trim(0)
+    except (OSError, AttributeError):
+        pass  # not glibc
+    return before, rss_kib()
 
-class MpvVideoThread(QThread):
-    """Thread to run mpv for video wallpapers"""
-    def __init__(self, video_path, width, height):
+
+class WallpaperLoader(QThread):
+    """Decode and scale a static wallpaper off the GUI thread
+    
+    Goes through ScaledWallpaperCache: a hit is a raw pixel read, a miss
+    decodes, scales to the screen's physical size and stores the result.
+    """
+    loaded = pyqtSignal(QImage)
+    
+    def __init__(self, path, width, height, dpr, cache):
         super().__init__()
-        self.video_path = video_path
+        self.path = path
         self.width = width
         self.height = height
-        self.process = None
-        
+        self.dpr = dpr
+        self.cache = cache
+    
     def run(self):
-        # Build mpv command with optimal settings for DM background
-        cmd = [
-            'mpv',
-            '--fs',  # Fullscreen
-            '--loop-file=inf',  # Loop forever
-            '--no-audio',  # No sound
-            '--no-osc',  # No on-screen controls
-            '--no-input-default-bindings',  # No key bindings
-            '--hwdec=auto',  # Hardware decoding
-            '--vo=gpu',  # GPU video output
-            '--gpu-api=' + ('d3d11' if GPU_TYPE == 'nvidia' else 'opengl'),
-            '--scale=ewa_lanczossharp',  # High quality scaling
-            f'--geometry={self.width}x{self.height}',
-            '--window-type=desktop',  # Treat as desktop window
-            '--window-drag=no',
-            '--cursor-autohide=no',
-            '--force-window=immediate',
-            '--x11-name=custom-dm-bg',  # Window name for finding it
-            self.video_path
-        ]
-        
-        # VM-specific optimizations
-        if IS_VM:
-            cmd.extend([
-                '--hwdec=no',  # Software decoding for VMs
-                '--vo=gpu',
-                '--scale=bilinear',  # Faster scaling
-            ])
-        
-        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        self.process.wait()
-    
-    def stop(self):
-        if self.process:
-            self.process.terminate()
+        try:
+            image = self.load()
+        except Exception as e:
+            print(f"Failed to load wallpaper {self.path}: {e}")
+            return
+        if image is not None and not image.isNull():
+            self.loaded.emit(image)
+    
+    def load(self):
+        cached = self.cache.load(self.path, self.width, self.height, self.dpr)
+        if cached:
+            width, height, stride, fmt, pixels = cached
+            # copy() detaches the image from the bytes object it wraps
+            return QImage(pixels, width, height, stride, QImage.Format(fmt)).copy()
+        
+        image = QImage(self.path)
+        if image.isNull():
+            return None
+        image = image.scaled(
+            round(self.width * self.dpr), round(self.height * self.dpr),
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        ).convertToFormat(QImage.Format.Format_RGB32)
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        self.cache.store(self.path, self.width, self.height, self.dpr,
+                         image.width(), image.height(), image.bytesPerLine(),
+                         image.format().value, bits.asstring())
+        return image
+
+
+def screen_key(screen):
+    """(width, height, dpr) - screens with equal keys share one decoded wallpaper"""
+    geometry = screen.geometry()
+    return geometry.width(), geometry.height(), screen.devicePixelRatio()
+
+
+def gradient_brush(width, height, theme_name):
+    """Theme gradient - the fallback, and the placeholder while a wallpaper
+    loads (a palette brush, so the image simply replaces it)"""
+    gradient = QLinearGradient(0, 0, width, height)
+    for stop, color in zip((0, 0.5, 1), theme.gradient_colors(theme_name)):
+        gradient.setColorAt(stop, QColor(color))
+    return QBrush(gradient)
+
+
+def set_background(widget, brush):
+    palette = widget.palette()
+    palette.setBrush(QPalette.ColorRole.Window, brush)
+    widget.setPalette(palette)
+    widget.setAutoFillBackground(True)
+
+
+class BackgroundSurface(QWidget):
+    """Wallpaper-only window covering one secondary screen
+    
+    No widgets and no style: just a palette brush (the shared pixmap for
+    its screen size, or the gradient) filled by the window system.
+    """
+    def __init__(self, screen):
+        super().__init__()
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnBottomHint)
+        self.place(screen)
+    
+    def place(self, screen):
+        self.setScreen(screen)
+        self.setGeometry(screen.geometry())
+        if self.isVisible():
+            self.showFullScreen()
+
+
+class AuthThread(QThread):
+    """PAM authenticate + open_session off the GUI thread
+    
+    pam_faillock delays or network-backed auth can take seconds; the UI
+    keeps running meanwhile. PAM calls can't be interrupted, so cancel()
+    only marks the attempt: a session it still manages to open is
+    closed again instead of being handed over.
+    """
+    succeeded = pyqtSignal(str, object)  # username, pam handle
+    failed = pyqtSignal(str)  # message for the error label
+    
+    def __init__(self, username, password):
+        super().__init__()
+        self.username = username
+        self.password = password
+        self.cancelled = False
+    
+    def cancel(self):
+        self.cancelled = True
+    
+    def run(self):
+        try:
+            p = pam.pam()
+            ok = p.authenticate(self.username, self.password, service="login")
+            self.password = None
+            if self.cancelled:
+                return
+            if not ok:
+                self.failed.emit("Invalid username or password")
+                return
+            # Open PAM session (required for proper session setup)
+            if not p.open_session():
+                self.failed.emit("Failed to open session")
+                return
+            if self.cancelled:
+                p.close_session()
+                return
+            self.succeeded.emit(self.username, p)
+        except Exception as e:
+            print(f"PAM error: {e}")
+            self.failed.emit("Authentication error")
+
+
+class SessionWatcher(QObject):
+    """Reaps the session process the moment it exits, without polling
+    
+    A pidfd (Linux 5.3+) becomes readable when the process exits; a
+    QSocketNotifier on it wakes the event loop exactly once. Older
+    kernels fall back to SIGCHLD delivered through a self-pipe. Either
+    way waitpid() collects the child, so it never lingers as a zombie.
+    """
+    exited = pyqtSignal(int, int)  # pid, exit code (negative: killed by signal)
+    
+    def __init__(self, pid):
+        super().__init__()
+        self.pid = pid
+        self.pipe = None
+        self.previous = None  # (wakeup fd, SIGCHLD handler) to restore
+        try:
+            self.fd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            self.fd = self.setup_sigchld()
+        self.notifier = QSocketNotifier(self.fd, QSocketNotifier.Type.Read, self)
+        self.notifier.activated.connect(self.reap)
+        # The child may have exited before the notifier existed; check
+        # once the caller has connected `exited`
+        QTimer.singleShot(0, self.reap)
+    
+    def setup_sigchld(self):
+        read_fd, write_fd = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        self.pipe = (read_fd, write_fd)
+        handler = signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        self.previous = (signal.set_wakeup_fd(write_fd), handler)
+        return read_fd
+    
+    def reap(self):
+        if self.pipe:
             try:
-                self.process.wait(timeout=2)
-            except:
-                self.process.kill()
+                os.read(self.pipe[0], 512)  # drain wakeup bytes
+            except BlockingIOError:
+                pass
+        try:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+        except ChildProcessError:
+            pid, status = self.pid, None  # reaped elsewhere
+        if pid == 0:
+            return  # still running (another child's SIGCHLD)
+        self.close()
+        self.exited.emit(self.pid, os.waitstatus_to_exitcode(status) if status is not None else -1)
+    
+    def close(self):
+        if self.fd is None:
+            return
+        self.notifier.setEnabled(False)
+        if self.pipe:
+            wakeup_fd, handler = self.previous
+            signal.set_wakeup_fd(wakeup_fd)
+            signal.signal(signal.SIGCHLD, handler if handler is not None else signal.SIG_DFL)
+            for fd in self.pipe:
+                os.close(fd)
+        else:
+            os.close(self.fd)
+        self.fd = None
 
 
 class LoginWindow(QMainWindow):
+    # Emitted from the wallpaper index thread when a rescan finds a new pick
+    wallpaper_changed = pyqtSignal(object, object)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Login")
         
-        # TRUE fullscreen - no borders, no decorations
-        self.showFullScreen()
+        # TRUE fullscreen - no borders, no decorations. Flags go first:
+        # changing them on a shown window hides it, and main() shows it
+        # fullscreen once the UI is built
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint |
             Qt.WindowType.WindowStaysOnTopHint |
             Qt.WindowType.CustomizeWindowHint
         )
         
-        # Get actual screen size
-        screen = QApplication.primaryScreen().geometry()
-        self.screen_width = screen.width()
-        self.screen_height = screen.height()
+        # The login window covers the primary screen; every other screen
+        # gets a BackgroundSurface
+        self.screen_width, self.screen_height, self.screen_dpr = screen_key(QApplication.primaryScreen())
+        self.surfaces = {}  # QScreen -> BackgroundSurface
+        self.backgrounds = {}  # screen_key -> QPixmap, shared by same-sized screens
+        self.wallpaper_loaders = {}  # screen_key -> WallpaperLoader
+        self.retired_loaders = set()  # replaced loaders finishing in the background
         
         self.session_pid = None
+        self.session_watcher = None
+        self.session_exited_at = None  # set until the greeter is painted again
+        self.last_return_latency = None
         self.pam_obj = None
+        self.auth_thread = None
+        self.auth_threads = []  # includes cancelled ones still inside PAM
+        self.spinner_frame = 0
+        self.theme = theme.DEFAULT_THEME
         
         print(f"Screen: {self.screen_width}x{self.screen_height}")
         
         self.setup_ui()
+        PROFILE.mark('setup_ui')
         self.load_sessions()
+        PROFILE.mark('sessions')
         self.load_wallpaper()
+        PROFILE.mark('wallpaper')
+        
+        # Monitor hotplug, primary and resolution changes
+        app = QApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.on_screen_removed)
+        app.primaryScreenChanged.connect(lambda screen: self.sync_screens())
+        for screen in app.screens():
+            screen.geometryChanged.connect(lambda geometry: self.sync_screens())
+        self.sync_screens()
         
     def setup_ui(self):
         # Central widget
@@ -130,14 +342,11 @@ class LoginWindow(QMainWindow):
         main_layout.setSpacing(0)
         
         # Left side - Login panel with glass morphism effect
+        # (styles for every widget come from theme.py's app stylesheet,
+        # matched by object name)
         self.left_panel = QWidget()
+        self.left_panel.setObjectName("loginPanel")
         self.left_panel.setFixedWidth(420)
-        self.left_panel.setStyleSheet("""
-            QWidget {
-                background-color: rgba(25, 23, 36, 220);
-                border-right: 1px solid rgba(196, 167, 231, 50);
-            }
-        """)
         
         # Add opacity effect for fade animation
         self.panel_opacity = QGraphicsOpacityEffect(self.left_panel)
@@ -151,20 +360,13 @@ class LoginWindow(QMainWindow):
         
         # Clock with cyberpunk glow
         self.clock_label = QLabel()
-        self.clock_label.setStyleSheet("""
-            QLabel {
-                color: #e0def4;
-                font-size: 80px;
-                font-weight: bold;
-                text-shadow: 0 0 20px rgba(196, 167, 231, 150);
-            }
-        """)
+        self.clock_label.setObjectName("clock")
         self.clock_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         form_layout.addWidget(self.clock_label)
         
         # Date with accent color
         self.date_label = QLabel()
-        self.date_label.setStyleSheet("color: #c4a7e7; font-size: 22px;")
+        self.date_label.setObjectName("date")
         self.date_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         form_layout.addWidget(self.date_label)
         
@@ -174,36 +376,30 @@ class LoginWindow(QMainWindow):
         # Username
         self.username_input = QLineEdit()
         self.username_input.setPlaceholderText("Username")
-        self.username_input.setStyleSheet(self.input_style())
-        self.username_input.setFont(QFont("JetBrainsMono Nerd Font", 14))
         form_layout.addWidget(self.username_input)
         
         # Password
         self.password_input = QLineEdit()
         self.password_input.setPlaceholderText("Password")
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-        self.password_input.setStyleSheet(self.input_style())
-        self.password_input.setFont(QFont("JetBrainsMono Nerd Font", 14))
         self.password_input.returnPressed.connect(self.do_login)
         form_layout.addWidget(self.password_input)
         
         # Session selector
         self.session_combo = QComboBox()
-        self.session_combo.setStyleSheet(self.combo_style())
-        self.session_combo.setFont(QFont("JetBrainsMono Nerd Font", 12))
+        self.session_combo.setObjectName("sessionCombo")
         form_layout.addWidget(self.session_combo)
         
         # Login button
-        login_btn = QPushButton("Login")
-        login_btn.setStyleSheet(self.button_style("#5e81ac"))
-        login_btn.setFont(QFont("JetBrainsMono Nerd Font", 14))
-        login_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        login_btn.clicked.connect(self.do_login)
-        form_layout.addWidget(login_btn)
+        self.login_btn = QPushButton("Login")
+        self.login_btn.setObjectName("loginButton")
+        self.login_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.login_btn.clicked.connect(self.do_login)
+        form_layout.addWidget(self.login_btn)
         
         # Error label
         self.error_label = QLabel()
-        self.error_label.setStyleSheet("color: #eb6f92; font-size: 14px; padding: 10px;")
+        self.error_label.setObjectName("status")
         self.error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         form_layout.addWidget(self.error_label)
         
@@ -214,14 +410,12 @@ class LoginWindow(QMainWindow):
         power_layout = QHBoxLayout()
         
         shutdown_btn = QPushButton("Shutdown")
-        shutdown_btn.setStyleSheet(self.button_style("#bf616a"))
-        shutdown_btn.setFont(QFont("JetBrainsMono Nerd Font", 11))
+        shutdown_btn.setObjectName("shutdownButton")
         shutdown_btn.clicked.connect(self.shutdown)
         power_layout.addWidget(shutdown_btn)
         
         reboot_btn = QPushButton("Reboot")
-        reboot_btn.setStyleSheet(self.button_style("#d08770"))
-        reboot_btn.setFont(QFont("JetBrainsMono Nerd Font", 11))
+        reboot_btn.setObjectName("rebootButton")
         reboot_btn.clicked.connect(self.reboot)
         power_layout.addWidget(reboot_btn)
         
@@ -240,284 +434,359 @@ class LoginWindow(QMainWindow):
         
         # Right side - wallpaper shows here
         right_spacer = QWidget()
-        right_spacer.setStyleSheet("background: transparent;")
+        right_spacer.setObjectName("wallpaperArea")
         main_layout.addWidget(right_spacer, stretch=1)
         
-        # Clock timer
+        # Clock: one coarse single-shot timer per minute boundary, only
+        # while the window is shown (see showEvent/hideEvent)
+        self.clock_date = None
+        self.clock_timer = QTimer(self)
+        self.clock_timer.setSingleShot(True)
+        self.clock_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self.clock_timer.timeout.connect(self.tick_clock)
         self.update_clock()
-        timer = QTimer(self)
-        timer.timeout.connect(self.update_clock)
-        timer.start(1000)
+        
+        # Spinner shown in the error label while PAM is working
+        self.spinner_timer = QTimer(self)
+        self.spinner_timer.setInterval(80)
+        self.spinner_timer.timeout.connect(self.update_spinner)
         
         # Focus username
         self.username_input.setFocus()
         
-    def input_style(self):
-        return """
-            QLineEdit {
-                background-color: rgba(33, 33, 33, 220);
-                color: #e0def4;
-                border: 2px solid transparent;
-                border-radius: 8px;
-                padding: 12px;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #c4a7e7;
-            }
-        """
-    
-    def combo_style(self):
-        return """
-            QComboBox {
-                background-color: rgba(33, 33, 33, 220);
-                color: #e0def4;
-                border: 2px solid transparent;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-            }
-            QComboBox:focus {
-                border: 2px solid #c4a7e7;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #212121;
-                color: #e0def4;
-                selection-background-color: #c4a7e7;
-                border-radius: 8px;
-            }
-        """
-    
-    def button_style(self, color):
-        return f"""
-            QPushButton {{
-                background-color: {color};
-                color: #e0def4;
-                border: none;
-                border-radius: 8px;
-                padding: 14px;
-                font-size: 14px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {color}dd;
-            }}
-            QPushButton:pressed {{
-                background-color: {color}aa;
-            }}
-        """
+    def set_theme(self, name):
+        """Swap the theme: one app stylesheet parse and polish pass"""
+        self.theme = name
+        theme.apply_theme(QApplication.instance(), name)
+        self.paint_backgrounds()
         
     def load_wallpaper(self):
-        """Load wallpaper - searches downloaded Google Drive videos first"""
-        self.video_thread = None
-        
-        # First, scan Google Drive downloaded wallpapers directory for videos
-        gdrive_wallpaper_dir = os.path.expanduser("~/.config/hypr/wallpapers/live-wallpapers")
-        if os.path.isdir(gdrive_wallpaper_dir):
-            # Look for video files in the downloaded folder
-            video_extensions = ('.mp4', '.webm', '.mkv', '.mov', '.avi')
-            try:
-                for filename in os.listdir(gdrive_wallpaper_dir):
-                    if filename.lower().endswith(video_extensions):
-                        video_path = os.path.join(gdrive_wallpaper_dir, filename)
-                        print(f"Found Google Drive video wallpaper: {filename}")
-                        self.setup_mpv_video(video_path)
-                        return
-            except Exception as e:
-                print(f"Error scanning wallpaper dir: {e}")
-        
-        # Fallback to specific video paths
-        video_paths = [
-            os.path.expanduser("~/.config/hypr/wallpapers/live/login-video.mp4"),
-            os.path.expanduser("~/.config/hypr/wallpapers/live/login-video.webm"),
-            os.path.expanduser("~/.config/hypr/wallpapers/background.mp4"),
-            os.path.expanduser("~/.config/hypr/wallpapers/background.webm"),
-            "/usr/share/sddm/themes/sddm-astronaut-theme/background.mp4",
-            "/usr/share/sddm/themes/sddm-astronaut-theme/background.webm",
-            "/usr/share/backgrounds/login-video.mp4",
-            "/usr/share/backgrounds/login-video.webm",
-        ]
-        
-        # Static wallpaper paths (fallback) - also check Google Drive folder
-        static_paths = []
-        
-        # First add any images from Google Drive folder
-        if os.path.isdir(gdrive_wallpaper_dir):
-            img_extensions = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
-            try:
-                for filename in sorted(os.listdir(gdrive_wallpaper_dir)):
-                    if filename.lower().endswith(img_extensions):
-                        static_paths.append(os.path.join(gdrive_wallpaper_dir, filename))
-            except Exception as e:
-                print(f"Error scanning for images: {e}")
-        
-        # Add fallback paths
-        static_paths.extend([
-            "/usr/share/sddm/themes/sddm-astronaut-theme/background.jpg",
-            "/usr/share/sddm/themes/sddm-astronaut-theme/background.png",
-            os.path.expanduser("~/.config/hypr/wallpapers/dark-theme/dark-wall1.jpg"),
-            os.path.expanduser("~/.config/hypr/wallpapers/dark-theme/dark-wall2.jpg"),
-            os.path.expanduser("~/.config/hypr/wallpapers/light-theme/light-wall1.jpg"),
-            os.path.expanduser("~/.config/hypr/wallpapers/background.jpg"),
-            os.path.expanduser("~/.config/hypr/wallpapers/background.png"),
-            "/usr/share/backgrounds/default.png",
-            "/usr/share/backgrounds/default.jpg",
-            "/usr/share/pixmaps/background.png",
-        ])
-        
-        # Check for video first (using mpv)
-        for path in video_paths:
-            if os.path.exists(path):
-                print(f"Found video wallpaper: {path}")
-                self.setup_mpv_video(path)
-                return
-        
-        # Fall back to static image
-        wallpaper = None
-        for path in static_paths:
-            if os.path.exists(path):
-                wallpaper = path
-                print(f"Found static wallpaper: {path}")
-                break
+        """Load wallpaper - video first, then image, then gradient
         
-        if wallpaper:
-            self.setup_static_wallpaper(wallpaper)
-        else:
-            # Fallback to gradient background
-            self.setStyleSheet("""
-                QMainWindow {
-                    background: qlineargradient(
-                        x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 #191724,
-                        stop: 0.5 #1f1d2e,
-                        stop: 1 #26233a
-                    );
-                }
-            """)
+        The pick comes from the wallpaper index cache; the folders are only
+        listed again (off the GUI thread) when one of them has changed.
+        """
+        self.video = None  # MpvController, kept across clips and sessions
+        self.video_path = None
+        self.image_path = None
+        self.pixmap_cache = ScaledWallpaperCache()
+        self.wallpapers = WallpaperIndex()
+        self.wallpaper_changed.connect(self.apply_wallpaper)
+        video, image = self.wallpapers.resolve(on_change=self.wallpaper_changed.emit)
+        self.apply_wallpaper(video, image)
+    
+    def refresh_wallpaper(self):
+        """Pick up wallpapers added during the session (checked in the background)"""
+        current = (self.wallpapers.video, self.wallpapers.image)
+        video, image = self.wallpapers.resolve(on_change=self.wallpaper_changed.emit)
+        if (video, image) != current:
+            self.apply_wallpaper(video, image)
+        elif video:
+            self.setup_mpv_video(video)
+    
+    def apply_wallpaper(self, video, image):
+        """Show the given video (via mpv, primary screen) or image, or the
+        gradient; secondary screens show the image behind a video"""
+        if self.video and not video:
+            self.video.stop()
+            self.video = None
+        
+        if image != self.image_path:
+            self.cancel_wallpaper_loads()
+            self.backgrounds.clear()
+            self.image_path = image
+        self.video_path = video
+        if video:
+            print(f"Found video wallpaper: {video}")
+            self.setup_mpv_video(video)
+        elif image:
+            print(f"Found static wallpaper: {image}")
+        self.paint_backgrounds()
     
     def setup_mpv_video(self, video_path):
-        """Setup video wallpaper using mpv (most efficient)"""
+        """Play a video wallpaper; an mpv already running switches clips"""
         try:
-            self.video_thread = MpvVideoThread(video_path, self.screen_width, self.screen_height)
-            self.video_thread.start()
-            print(f"Video wallpaper started with mpv: {video_path}")
+            if not self.video:
+                self.video = MpvController(self.screen_width, self.screen_height, GPU_TYPE, IS_VM,
+                                           screen=QApplication.primaryScreen().name(), parent=self)
+                self.video.playback_started.connect(self.on_video_playing)
+            self.video.play(video_path)
+            print(f"Video wallpaper playing with mpv: {video_path}")
         except Exception as e:
             print(f"Failed to start mpv video: {e}")
             self.load_static_fallback()
     
-    def setup_static_wallpaper(self, wallpaper_path):
-        """Setup static image wallpaper with smooth scaling"""
-        # Set as palette for smooth scaling
-        palette = self.palette()
-        pixmap = QPixmap(wallpaper_path)
-        scaled_pixmap = pixmap.scaled(
-            self.screen_width, self.screen_height,
-            Qt.AspectRatioMode.IgnoreAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        palette.setBrush(QPalette.ColorRole.Window, scaled_pixmap)
-        self.setPalette(palette)
-        self.setAutoFillBackground(True)
+    def on_video_playing(self):
+        if PROFILE.get('video playing') is None:
+            PROFILE.mark('video playing')
+    
+    def screen_windows(self):
+        """(window, screen_key) for the login window and each surface"""
+        windows = [(self, (self.screen_width, self.screen_height, self.screen_dpr))]
+        return windows + [(surface, screen_key(screen)) for screen, surface in self.surfaces.items()]
+    
+    def paint_backgrounds(self):
+        """Give every screen its wallpaper, or the gradient until it is decoded
+        
+        Each distinct screen size is decoded once (WallpaperLoader, at
+        native resolution) and the pixmap is shared by every screen of
+        that size. The primary screen is left to mpv while a video plays.
+        """
+        in_use = set()
+        for window, key in self.screen_windows():
+            in_use.add(key)
+            if window is self and self.video_path and self.video:
+                continue
+            pixmap = self.backgrounds.get(key) if self.image_path else None
+            if pixmap is None and self.image_path:
+                self.load_background(key)
+            set_background(window, QBrush(pixmap) if pixmap else gradient_brush(key[0], key[1], self.theme))
+        # Sizes no screen has any more
+        for key in set(self.backgrounds) - in_use:
+            del self.backgrounds[key]
+    
+    def load_background(self, key):
+        if key in self.wallpaper_loaders:
+            return
+        width, height, dpr = key
+        loader = WallpaperLoader(self.image_path, width, height, dpr, self.pixmap_cache)
+        loader.key = key
+        loader.loaded.connect(self.on_background_loaded)
+        loader.finished.connect(self.on_loader_finished)
+        self.wallpaper_loaders[key] = loader
+        loader.start()
+    
+    def on_background_loaded(self, image):
+        """A screen size's wallpaper is decoded: show it on those screens"""
+        loader = self.sender()
+        if loader.path != self.image_path:
+            return
+        if PROFILE.get('wallpaper shown') is None:
+            PROFILE.mark('wallpaper shown')
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(loader.key[2])
+        self.backgrounds[loader.key] = pixmap
+        self.paint_backgrounds()
+    
+    def on_loader_finished(self):
+        loader = self.sender()
+        if self.wallpaper_loaders.get(loader.key) is loader:
+            del self.wallpaper_loaders[loader.key]
+    
+    def cancel_wallpaper_loads(self):
+        """A newer pick replaces images still loading
+        
+        The GUI thread doesn't wait for them: each loader finishes its
+        decode in the background, its result is dropped, and it is kept
+        referenced until then (a running QThread must not be destroyed).
+        """
+        for loader in self.wallpaper_loaders.values():
+            loader.loaded.disconnect()
+            loader.finished.disconnect()
+            loader.finished.connect(self.on_retired_loader_finished)
+            if not loader.isFinished():
+                self.retired_loaders.add(loader)
+        self.wallpaper_loaders.clear()
+    
+    def on_retired_loader_finished(self):
+        self.retired_loaders.discard(self.sender())
+    
+    def on_screen_added(self, screen):
+        screen.geometryChanged.connect(lambda geometry: self.sync_screens())
+        self.sync_screens()
+    
+    def on_screen_removed(self, screen):
+        surface = self.surfaces.pop(screen, None)
+        if surface:
+            print(f"Screen removed: {screen.name()}")
+            surface.hide()
+            surface.deleteLater()
+        self.sync_screens()
+    
+    def sync_screens(self):
+        """Match surfaces to the connected screens (hotplug, primary or
+        resolution change) without restarting anything else"""
+        app = QApplication.instance()
+        primary = app.primaryScreen()
+        screens = app.screens()
+        
+        key = screen_key(primary)
+        if key != (self.screen_width, self.screen_height, self.screen_dpr) or self.screen() is not primary:
+            self.screen_width, self.screen_height, self.screen_dpr = key
+            print(f"Primary screen: {primary.name()} {self.screen_width}x{self.screen_height}")
+            self.setScreen(primary)
+            self.setGeometry(primary.geometry())
+            if self.isVisible():
+                self.showFullScreen()
+            if self.video:
+                # mpv was sized for the old primary
+                self.video.stop()
+                self.video = None
+                self.setup_mpv_video(self.video_path)
+        
+        for screen in list(self.surfaces):
+            if screen is primary or screen not in screens:
+                surface = self.surfaces.pop(screen)
+                surface.hide()
+                surface.deleteLater()
+        for screen in screens:
+            if screen is primary:
+                continue
+            surface = self.surfaces.get(screen)
+            if surface is None:
+                print(f"Screen added: {screen.name()} {screen.geometry().width()}x{screen.geometry().height()}")
+                surface = self.surfaces[screen] = BackgroundSurface(screen)
+            else:
+                surface.place(screen)
+            if self.isVisible():
+                surface.showFullScreen()
+        self.paint_backgrounds()
     
     def load_static_fallback(self):
         """Load static wallpaper as fallback"""
-        static_paths = [
-            "/usr/share/sddm/themes/sddm-astronaut-theme/background.jpg",
-            os.path.expanduser("~/.config/hypr/wallpapers/dark-theme/dark-wall1.jpg"),
-            os.path.expanduser("~/.config/hypr/wallpapers/background.jpg"),
-        ]
-        for path in static_paths:
-            if os.path.exists(path):
-                self.setup_static_wallpaper(path)
-                return
-        # Gradient fallback
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(
-                    x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 #191724,
-                    stop: 0.5 #1f1d2e,
-                    stop: 1 #26233a
-                );
-            }
-        """)
+        self.video_path = None
+        if self.video:
+            self.video.stop()
+            self.video = None
+        self.paint_backgrounds()
             
     def load_sessions(self):
-        """Load available desktop sessions"""
-        sessions = []
-        session_dirs = [
-            "/usr/share/wayland-sessions",
-            "/usr/share/xsessions"
-        ]
-        
-        for d in session_dirs:
-            if os.path.isdir(d):
-                for f in sorted(os.listdir(d)):
-                    if f.endswith(".desktop"):
-                        name = f.replace(".desktop", "").replace("-", " ").title()
-                        # Prefer Hyprland
-                        if "hyprland" in f.lower():
-                            sessions.insert(0, (name, os.path.join(d, f)))
-                        else:
-                            sessions.append((name, os.path.join(d, f)))
-        
-        if not sessions:
-            # Fallback
-            sessions = [("Hyprland", "hyprland.desktop")]
-            
-        for name, path in sessions:
-            self.session_combo.addItem(name, path)
-            
-        # Select Hyprland by default
-        for i in range(self.session_combo.count()):
-            if "hyprland" in self.session_combo.itemText(i).lower():
-                self.session_combo.setCurrentIndex(i)
-                break
+        """Load available desktop sessions from the session catalog cache
+        
+        Each combo entry carries the session's argv and its environment
+        (everything but the user's own variables), built here once.
+        """
+        base_env = os.environ.copy()
+        base_env.update({
+            "XDG_SESSION_TYPE": "wayland",
+            "XDG_SEAT": "seat0",
+            "XDG_VTNR": "1",
+            "WAYLAND_DISPLAY": "wayland-1",
+            "PATH": SESSION_PATH,
+            "MOZ_ENABLE_WAYLAND": "1",
+            "QT_QPA_PLATFORM": "wayland",
+            "QT_WAYLAND_DISABLE_WINDOWDECORATION": "1",
+            "SDL_VIDEODRIVER": "wayland",
+            "_JAVA_AWT_WM_NONREPARENTING": "1",
+            "DISPLAY": ":0",
+        })
+        
+        self.sessions = SessionCatalog()
+        for session in self.sessions.resolve():
+            # Hyprland comes first, so it is selected by default
+            self.session_combo.addItem(session['name'], dict(session, env=dict(base_env, **session['env'])))
             
-    def update_clock(self):
-        now = QDateTime.currentDateTime()
-        self.clock_label.setText(now.toString("HH:mm"))
-        self.date_label.setText(now.toString("dddd d MMMM yyyy"))
+    def update_clock(self, now=None):
+        """Set the time, and the date when it has changed (midnight)"""
+        now = now or QDateTime.currentDateTime()
+        text = now.toString("HH:mm")
+        if self.clock_label.text() != text:
+            self.clock_label.setText(text)
+        if self.clock_date is None or now.date() != self.clock_date:
+            self.clock_date = now.date()
+            self.date_label.setText(now.toString("dddd d MMMM yyyy"))
+        return now
+    
+    def tick_clock(self):
+        """Update, then sleep until the next minute starts
+        
+        A coarse timer may fire a little early; then the label is
+        unchanged and the timer is re-armed for the few ms left.
+        """
+        now = self.update_clock()
+        time_of_day = now.time()
+        self.clock_timer.start(60000 - time_of_day.second() * 1000 - time_of_day.msec() + 20)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.tick_clock()
+        for surface in self.surfaces.values():
+            surface.showFullScreen()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.clock_timer.stop()
+        for surface in self.surfaces.values():
+            surface.hide()
         
     def do_login(self):
+        if self.auth_thread:
+            # The login button reads "Cancel" while authenticating
+            self.cancel_login()
+            return
+        
         username = self.username_input.text().strip()
         password = self.password_input.text()
         
         if not username or not password:
             self.error_label.setText("Enter username and password")
             return
-            
-        # Authenticate with PAM
-        p = pam.pam()
-        if p.authenticate(username, password, service="login"):
-            # Open PAM session (required for proper session setup)
-            if p.open_session():
-                self.error_label.setText("")
-                self.error_label.setStyleSheet("color: #9ccfd8; font-size: 14px;")
-                self.error_label.setText("Success! Starting session...")
-                self.pam_obj = p
-                self.start_session(username)
-            else:
-                self.error_label.setStyleSheet("color: #eb6f92; font-size: 14px;")
-                self.error_label.setText("Failed to open session")
-                self.password_input.clear()
-                self.password_input.setFocus()
+        
+        # Authenticate with PAM on a worker thread
+        thread = AuthThread(username, password)
+        thread.succeeded.connect(self.on_auth_succeeded)
+        thread.failed.connect(self.on_auth_failed)
+        thread.finished.connect(lambda: self.auth_threads.remove(thread))
+        self.auth_threads.append(thread)
+        self.auth_thread = thread
+        self.set_auth_pending(True)
+        thread.start()
+    
+    def cancel_login(self):
+        """Abandon the running attempt and give the form back"""
+        self.auth_thread.cancel()
+        self.auth_thread = None
+        self.set_auth_pending(False)
+        self.error_label.setText("Login cancelled")
+        self.password_input.setFocus()
+    
+    def set_auth_pending(self, pending):
+        """Lock the form and spin while PAM runs, unlock afterwards"""
+        for widget in (self.username_input, self.password_input, self.session_combo):
+            widget.setEnabled(not pending)
+        self.login_btn.setText("Cancel" if pending else "Login")
+        theme.set_state(self.error_label, "info" if pending else None)
+        if pending:
+            self.spinner_frame = 0
+            self.update_spinner()
+            self.spinner_timer.start()
         else:
-            self.error_label.setStyleSheet("color: #eb6f92; font-size: 14px;")
-            self.error_label.setText("Invalid username or password")
-            self.password_input.clear()
-            self.password_input.setFocus()
+            self.spinner_timer.stop()
+            self.error_label.setText("")
+    
+    def update_spinner(self):
+        frames = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+        self.error_label.setText(f"{frames[self.spinner_frame % len(frames)]} Authenticating...")
+        self.spinner_frame += 1
+    
+    def on_auth_succeeded(self, username, p):
+        if self.sender() is not self.auth_thread:
+            # Cancelled while PAM was still opening the session
+            p.close_session()
+            return
+        self.auth_thread = None
+        self.set_auth_pending(False)
+        theme.set_state(self.error_label, "info")
+        self.error_label.setText("Success! Starting session...")
+        self.password_input.clear()
+        self.pam_obj = p
+        self.start_session(username)
+    
+    def on_auth_failed(self, message):
+        if self.sender() is not self.auth_thread:
+            return
+        self.auth_thread = None
+        self.set_auth_pending(False)
+        self.error_label.setText(message)
+        self.password_input.clear()
+        self.password_input.setFocus()
             
     def start_session(self, username):
         """Start the user session with proper PAM integration"""
-        session_path = self.session_combo.currentData()
-        session_name = self.session_combo.currentText().lower()
+        session = self.session_combo.currentData()
+        argv = session['argv']
         
-        print(f"Starting session: {session_name} for {username}")
+        print(f"Starting session: {session['name']} for {username}")
         
         # Get user info
         try:
@@ -530,59 +799,24 @@ class LoginWindow(QMainWindow):
             self.error_label.setText("User not found")
             return
         
-        # Determine command based on session
-        if "hyprland" in session_name:
-            cmd = "/usr/bin/Hyprland"
-            session_type = "wayland"
-            desktop_name = "Hyprland"
-        elif "plasma" in session_name or "kde" in session_name:
-            cmd = "/usr/bin/startplasma-wayland"
-            session_type = "wayland"
-            desktop_name = "KDE"
-        elif "gnome" in session_name:
-            cmd = "/usr/bin/gnome-session"
-            session_type = "wayland"
-            desktop_name = "GNOME"
-        elif "sway" in session_name:
-            cmd = "/usr/bin/sway"
-            session_type = "wayland"
-            desktop_name = "sway"
-        else:
-            # Try to read from desktop file
-            cmd = self.get_exec_from_desktop(session_path) or "/usr/bin/Hyprland"
-            session_type = "wayland"
-            desktop_name = session_name.title()
-        
         # Create XDG_RUNTIME_DIR
         runtime_dir = f"/run/user/{uid}"
         os.makedirs(runtime_dir, exist_ok=True)
         os.chown(runtime_dir, uid, gid)
         os.chmod(runtime_dir, 0o700)
         
-        # Build environment
-        env = os.environ.copy()
+        # Session environment (precomputed) plus the user's own variables
+        env = dict(session['env'])
         env["HOME"] = home
         env["USER"] = username
         env["LOGNAME"] = username
         env["SHELL"] = shell
         env["UID"] = str(uid)
-        env["XDG_SESSION_TYPE"] = session_type
-        env["XDG_CURRENT_DESKTOP"] = desktop_name
-        env["XDG_SESSION_DESKTOP"] = desktop_name
-        env["XDG_SEAT"] = "seat0"
-        env["XDG_VTNR"] = "1"
         env["XDG_RUNTIME_DIR"] = runtime_dir
-        env["WAYLAND_DISPLAY"] = "wayland-1"
-        env["PATH"] = "/usr/local/bin:/usr/bin:/bin:/usr/local/sbin:/usr/sbin"
-        env["MOZ_ENABLE_WAYLAND"] = "1"
-        env["QT_QPA_PLATFORM"] = "wayland"
-        env["QT_WAYLAND_DISABLE_WINDOWDECORATION"] = "1"
-        env["SDL_VIDEODRIVER"] = "wayland"
-        env["_JAVA_AWT_WM_NONREPARENTING"] = "1"
-        env["DISPLAY"] = ":0"
-        
-        print(f"Executing: {cmd}")
-        print(f"Environment: XDG_SESSION_TYPE={session_type}, XDG_CURRENT_DESKTOP={desktop_name}")
+        
+        print(f"Executing: {shlex.join(argv)}")
+        print(f"Environment: XDG_SESSION_TYPE={env['XDG_SESSION_TYPE']}, "
+              f"XDG_CURRENT_DESKTOP={env['XDG_CURRENT_DESKTOP']}")
         
         # Fork and start session
         pid = os.fork()
@@ -613,7 +847,7 @@ class LoginWindow(QMainWindow):
                         os.environ[key] = str(val)
                 
                 # Exec the session
-                os.execv(cmd, [cmd])
+                os.execv(argv[0], argv)
             except Exception as e:
                 print(f"Failed to start session: {e}")
                 import traceback
@@ -624,27 +858,36 @@ class LoginWindow(QMainWindow):
             self.session_pid = pid
             print(f"Session started with PID {pid}")
             
-            # Hide the login window immediately
-            self.hide()
-            
-            # Wait for session to exit
-            QTimer.singleShot(100, lambda: self.monitor_session(pid))
+            self.session_started(pid)
     
-    def monitor_session(self, pid):
-        """Monitor session process and restart DM when it exits"""
-        try:
-            # Check if process is still running
-            os.kill(pid, 0)  # Signal 0 just checks if process exists
-            # Still running, check again in 500ms
-            QTimer.singleShot(500, lambda: self.monitor_session(pid))
-        except OSError:
-            # Process has exited
-            print(f"Session {pid} has exited")
-            self.handle_session_exit()
+    def session_started(self, pid):
+        """Hide the greeter while the session runs"""
+        # Hide the login window immediately
+        self.hide()
+        
+        if RESIDENT:
+            # Kept warm for the next login, but idle: no decoding, and the
+            # clock stopped with hideEvent
+            if self.video:
+                self.video.pause()
+            before, after = trim_memory()
+            print(f"Greeter resident while session runs: RSS {before // 1024} -> {after // 1024} MiB")
+        
+        # Woken (once) when the session exits
+        self.session_watcher = SessionWatcher(pid)
+        self.session_watcher.exited.connect(self.on_session_exited)
+    
+    def on_session_exited(self, pid, code):
+        """Session process has exited and been reaped"""
+        print(f"Session {pid} has exited with status {code}")
+        self.session_exited_at = time.monotonic()
+        self.session_pid = None
+        self.session_watcher = None
+        self.handle_session_exit()
     
     def handle_session_exit(self):
-        """Handle session exit - restart DM after delay"""
-        print("Session handler called - restarting DM in 2 seconds")
+        """Handle session exit - close PAM, then show the greeter again
+        (resident) or let systemd restart the DM"""
         
         # Close PAM session if open
         if self.pam_obj:
@@ -655,19 +898,49 @@ class LoginWindow(QMainWindow):
                 print(f"Error closing PAM session: {e}")
             self.pam_obj = None
         
-        QTimer.singleShot(2000, QApplication.quit)
-            
-    def get_exec_from_desktop(self, path):
-        """Extract Exec line from .desktop file"""
-        try:
-            with open(path, 'r') as f:
-                for line in f:
-                    if line.startswith('Exec='):
-                        return line.split('=', 1)[1].strip().split()[0]
-        except:
-            pass
-        return None
+        if not RESIDENT:
+            print("Restarting DM")
+            if self.video:
+                self.video.stop()
+            QApplication.quit()
+            return
+        
+        theme.set_state(self.error_label, None)
+        self.error_label.setText("")
+        self.password_input.clear()
+        self.refresh_wallpaper()
+        self.showFullScreen()
+        self.password_input.setFocus()
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if PROFILE.get('first frame') is None:
+            PROFILE.mark('first frame')
+            QTimer.singleShot(0, self.startup_interactive)
+        if self.session_exited_at is not None:
+            latency = time.monotonic() - self.session_exited_at
+            self.session_exited_at = None
+            self.last_return_latency = latency
+            print(f"Greeter back {latency * 1000:.1f}ms after session exit")
             
+    def startup_interactive(self):
+        """First event-loop turn after the first frame: the form takes input"""
+        PROFILE.mark('interactive')
+        PROFILE.report()
+        if PROFILE.output:
+            # Profiling run (bench/bench_startup.py): exit once the
+            # background wallpaper decode is in as well
+            self.end_profile_run()
+    
+    def end_profile_run(self):
+        loaders = list(self.wallpaper_loaders.values()) + list(self.retired_loaders)
+        if any(loader.isRunning() for loader in loaders):
+            QTimer.singleShot(20, self.end_profile_run)
+            return
+        if self.video:
+            self.video.stop()
+        QApplication.quit()
+    
     def shutdown(self):
         reply = QMessageBox.question(
             self, "Shutdown", 
@@ -689,19 +962,21 @@ class LoginWindow(QMainWindow):
 
 def main():
     app = QApplication(sys.argv)
+    PROFILE.mark('qapplication')
     
-    # Set application-wide font
-    font = QFont("JetBrainsMono Nerd Font", 10)
-    if not QFont(font).exactMatch():
-        font = QFont("Noto Sans", 10)
-    app.setFont(font)
+    # Application-wide font (family resolved once) and the one stylesheet
+    app.setFont(theme.app_font())
+    PROFILE.mark('font')
+    theme.apply_theme(app)
+    PROFILE.mark('stylesheet')
     
     # Set app properties
     app.setApplicationName("custom-dm")
     app.setApplicationDisplayName("Custom Display Manager")
     
     window = LoginWindow()
-    window.show()
+    window.showFullScreen()
+    PROFILE.mark('show')
     
     # Store app reference for session exit handling
     window.app = app
@@ -0,0 +1,347 @@
+"""
+Video wallpaper playback through one long-lived mpv, driven over JSON IPC
+The greeter pauses it while hidden, switches clips with loadfile instead
+of a respawn, and steps the scaler down when playback drops frames.
+"""
+
+import os
+import json
+import time
+import socket
+import subprocess
+
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QLocalSocket
+
+from wallpapers import CACHE_DIR
+
+# Best looking first; playback moves down the list while it drops frames
+SCALERS = ('ewa_lanczossharp', 'spline36', 'bilinear')
+DROP_RATE_LIMIT = 1.0  # dropped frames per second of playback
+DROP_WARMUP = 3.0      # seconds after a start, resume or scaler change not judged
+DROP_WINDOW = 5.0      # shortest stretch of playback a drop rate is taken over
+QUIT_GRACE = 2.0       # seconds mpv gets to quit before it is killed
+REAP_POLL_MS = 50      # poll() interval where pidfd_open is unavailable
+
+OBSERVED = ('frame-drop-count', 'decoder-frame-drop-count', 'estimated-vf-fps',
+            'hwdec-current', 'video-params/w', 'video-params/h')
+
+
+def mpv_options(width, height, gpu='unknown', vm=False, scale=SCALERS[0], screen=None):
+    """mpv options as a dict, so the VM settings replace the defaults
+    instead of being appended after them"""
+    options = {
+        'fs': 'yes',  # Fullscreen
+        'loop-file': 'inf',  # Loop forever
+        'audio': 'no',  # No sound
+        'osc': 'no',  # No on-screen controls
+        'input-default-bindings': 'no',  # No key bindings
+        'hwdec': 'auto',  # Hardware decoding
+        'vo': 'gpu',  # GPU video output
+        'gpu-api': 'd3d11' if gpu == 'nvidia' else 'opengl',
+        'scale': scale,
+        'geometry': f'{width}x{height}',
+        'window-type': 'desktop',  # Treat as desktop window
+        'window-drag': 'no',
+        'cursor-autohide': 'no',
+        'force-window': 'immediate',
+        'x11-name': 'custom-dm-bg',  # Window name for finding it
+        'idle': 'yes',  # Stay up between clips and after a bad file
+    }
+    if screen:
+        options['fs-screen-name'] = screen  # The greeter's primary monitor
+    if vm:
+        options['hwdec'] = 'no'  # Software decoding for VMs
+        options['scale'] = 'bilinear'  # Faster scaling
+    return options
+
+
+class ProcessReaper(QObject):
+    """Collects an exiting Popen from the event loop instead of wait()ing
+
+    A pidfd (Linux 5.3+) wakes a QSocketNotifier when the process exits;
+    without one, poll() is retried on a short timer. A process still up
+    after `grace` seconds is killed.
+    """
+    exited = pyqtSignal(object)  # Popen.returncode
+
+    def __init__(self, process, grace, parent=None):
+        super().__init__(parent)
+        self.process = process
+        self.notifier = None
+        self.poller = QTimer(self)
+        self.poller.timeout.connect(self.check)
+        self.deadline = QTimer(self)
+        self.deadline.setSingleShot(True)
+        self.deadline.timeout.connect(self.kill)
+        self.deadline.start(int(grace * 1000))
+        try:
+            self.fd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            self.fd = None
+            self.poller.start(REAP_POLL_MS)
+        else:
+            self.notifier = QSocketNotifier(self.fd, QSocketNotifier.Type.Read, self)
+            self.notifier.activated.connect(self.check)
+        # It may be gone already
+        QTimer.singleShot(0, self.check)
+
+    def check(self):
+        if self.process is None or self.process.poll() is None:
+            return
+        status = self.process.returncode
+        self.close()
+        self.exited.emit(status)
+
+    def kill(self):
+        if self.process is not None and self.process.poll() is None:
+            print(f"mpv (pid {self.process.pid}) did not quit, killing it")
+            self.process.kill()
+
+    def close(self):
+        self.process = None
+        self.poller.stop()
+        self.deadline.stop()
+        if self.notifier:
+            self.notifier.setEnabled(False)
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class MpvController(QObject):
+    """One mpv for the greeter's lifetime, controlled over its JSON IPC
+
+    mpv gets one end of a socketpair as --input-ipc-client, so there is no
+    socket path to wait for; a QLocalSocket on the other end delivers
+    replies and property changes to the Qt event loop. No thread waits on
+    the process: mpv exiting closes the socket, and an exited or stopped
+    mpv is reaped by a ProcessReaper rather than waited for.
+
+    Frame drops are observed, not polled. When playback drops more than
+    DROP_RATE_LIMIT frames a second, the scaler steps down (SCALERS) at
+    runtime, and the choice is remembered for this GPU and screen size.
+    """
+    # A clip (first or switched to) is showing frames
+    playback_started = pyqtSignal()
+
+    def __init__(self, width, height, gpu='unknown', vm=False, screen=None, state_file=None, parent=None):
+        super().__init__(parent)
+        self.width = width
+        self.height = height
+        self.screen = screen
+        self.gpu = gpu
+        self.vm = vm
+        self.state_file = state_file or os.path.join(CACHE_DIR, 'mpv.json')
+        self.state_key = f"{gpu} {width}x{height}"
+        self.scaler = 'bilinear' if vm else self.load_scaler()
+        self.process = None
+        self.socket = None
+        self.path = None
+        self.paused = False
+        self.request_id = 0
+        self.pending = {}  # request_id -> command name
+        self.reapers = set()  # mpv processes on their way out
+        self.properties = {}
+        self.judge_from = None  # (start, drop count) of the stretch being judged
+        self.switch_sent = None
+        self.last_switch = None  # seconds from loadfile to playback restarting
+        self.spawns = 0
+        self.switches = 0
+        self.scaler_changes = 0
+
+    def load_scaler(self):
+        try:
+            with open(self.state_file) as f:
+                scaler = json.load(f).get(self.state_key)
+        except (OSError, ValueError, AttributeError):
+            scaler = None
+        return scaler if scaler in SCALERS else SCALERS[0]
+
+    def save_scaler(self):
+        try:
+            try:
+                with open(self.state_file) as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            state[self.state_key] = self.scaler
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            tmp = f"{self.state_file}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            print(f"Could not save mpv scaler choice: {e}")
+
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        options = mpv_options(self.width, self.height, self.gpu, self.vm, self.scaler, self.screen)
+        options['input-ipc-client'] = f'fd://{theirs.fileno()}'
+        cmd = ['mpv'] + [f'--{key}={value}' for key, value in options.items()]
+        try:
+            self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                            pass_fds=(theirs.fileno(),))
+        except OSError:
+            ours.close()
+            raise
+        finally:
+            theirs.close()
+        self.spawns += 1
+        self.path = None
+        self.paused = False
+        self.socket = QLocalSocket(self)
+        self.socket.readyRead.connect(self.on_ready_read)
+        self.socket.disconnected.connect(self.on_disconnected)
+        self.socket.setSocketDescriptor(ours.detach())
+        for number, name in enumerate(OBSERVED, 1):
+            self.command('observe_property', number, name)
+        print(f"mpv started (pid {self.process.pid}, scale={options['scale']})")
+
+    def command(self, *args):
+        if not self.socket:
+            return
+        self.request_id += 1
+        self.pending[self.request_id] = args[0]
+        message = json.dumps({'command': list(args), 'request_id': self.request_id})
+        self.socket.write(message.encode() + b'\n')
+        self.socket.flush()
+
+    def play(self, path):
+        """Show `path`, starting mpv if needed; a new clip reuses the process"""
+        if not self.running():
+            self.start()
+        if path != self.path:
+            if self.path:
+                self.switches += 1
+            self.switch_sent = time.monotonic()
+            self.command('loadfile', path, 'replace')
+            self.path = path
+        self.resume()
+
+    def pause(self):
+        """Stop decoding (greeter hidden); the window and decoder stay up"""
+        if self.running() and not self.paused:
+            self.command('set_property', 'pause', True)
+            self.paused = True
+
+    def resume(self):
+        if self.running() and self.paused:
+            self.command('set_property', 'pause', False)
+        self.paused = False
+        self.judge_from = (time.monotonic() + DROP_WARMUP, None)
+
+    def stop(self):
+        """Ask mpv to quit and return at once; it is reaped when it exits,
+        or killed after QUIT_GRACE seconds"""
+        if self.running():
+            self.command('quit')
+        if self.socket:
+            self.socket.disconnected.disconnect()
+            self.socket.abort()
+            self.socket = None
+        if self.process:
+            self.reap(self.process, QUIT_GRACE)
+        self.process = None
+        self.path = None
+
+    def reap(self, process, grace):
+        reaper = ProcessReaper(process, grace, self)
+        self.reapers.add(reaper)
+
+        def on_exited(status):
+            self.reapers.discard(reaper)
+            reaper.deleteLater()
+            print(f"mpv exited with status {status}")
+
+        reaper.exited.connect(on_exited)
+
+    def on_ready_read(self):
+        while self.socket and self.socket.canReadLine():
+            try:
+                message = json.loads(bytes(self.socket.readLine()).decode())
+            except ValueError:
+                continue
+            if 'event' in message:
+                self.on_event(message)
+            elif message.get('request_id') in self.pending:
+                name = self.pending.pop(message['request_id'])
+                if message.get('error') != 'success':
+                    print(f"mpv {name} failed: {message.get('error')}")
+
+    def on_event(self, event):
+        name = event['event']
+        if name == 'property-change':
+            self.properties[event['name']] = event.get('data')
+            if event['name'] == 'frame-drop-count':
+                self.check_drops()
+        elif name == 'playback-restart' and self.switch_sent is not None:
+            self.last_switch = time.monotonic() - self.switch_sent
+            self.switch_sent = None
+            self.playback_started.emit()
+        elif name == 'end-file' and event.get('reason') == 'error':
+            print(f"mpv could not play {self.path}: {event.get('file_error')}")
+
+    def check_drops(self):
+        """Judge the drop rate over stretches of at least DROP_WINDOW seconds"""
+        if self.paused or self.judge_from is None:
+            return
+        start, drops = self.judge_from
+        now = time.monotonic()
+        count = self.properties.get('frame-drop-count') or 0
+        if now < start:
+            return
+        if drops is None:
+            self.judge_from = (now, count)
+            return
+        elapsed = now - start
+        if elapsed < DROP_WINDOW:
+            return
+        rate = (count - drops) / elapsed
+        if rate > DROP_RATE_LIMIT:
+            self.step_down(rate)
+        else:
+            self.judge_from = (now, count)
+
+    def step_down(self, rate):
+        index = SCALERS.index(self.scaler) if self.scaler in SCALERS else len(SCALERS) - 1
+        if index + 1 >= len(SCALERS):
+            self.judge_from = None  # nothing cheaper left
+            return
+        self.scaler = SCALERS[index + 1]
+        self.scaler_changes += 1
+        print(f"mpv dropping {rate:.1f} frames/s, switching scaler to {self.scaler}")
+        self.command('set_property', 'scale', self.scaler)
+        self.save_scaler()
+        self.judge_from = (time.monotonic() + DROP_WARMUP, None)
+
+    def on_disconnected(self):
+        """mpv went away (crash or killed); the next play() starts a new one"""
+        if self.process:
+            # Closing the socket may come just before the exit itself
+            self.reap(self.process, 1.0)
+        self.socket = None
+        self.process = None
+        self.path = None
+
+    def snapshot(self):
+        """Decode and playback stats"""
+        props = self.properties
+        return {
+            'running': self.running(),
+            'path': self.path,
+            'paused': self.paused,
+            'scaler': self.scaler,
+            'frame_drops': props.get('frame-drop-count') or 0,
+            'decoder_drops': props.get('decoder-frame-drop-count') or 0,
+            'fps': props.get('estimated-vf-fps'),
+            'hwdec': props.get('hwdec-current'),
+            'video_size': (props.get('video-params/w'), props.get('video-params/h')),
+            'spawns': self.spawns,
+            'switches': self.switches,
+            'last_switch': self.last_switch,
+            'scaler_changes': self.scaler_changes,
+        }
@@ -0,0 +1,167 @@
+"""
+Session catalog for custom-dm
+Parses the wayland-sessions/xsessions .desktop files once into a cache
+keyed by directory and file mtimes, with each session's exec argv and
+desktop environment variables worked out ahead of time, so starting a
+session reads no .desktop file.
+"""
+
+import os
+import json
+import shlex
+import shutil
+
+from wallpapers import CACHE_DIR, dir_mtime
+
+SESSION_DIRS = ["/usr/share/wayland-sessions", "/usr/share/xsessions"]
+
+# PATH the session runs with; Exec/TryExec are resolved against it
+SESSION_PATH = "/usr/local/bin:/usr/bin:/bin:/usr/local/sbin:/usr/sbin"
+
+# Used when no session files are installed at all
+FALLBACK_SESSION = {
+    'id': 'hyprland',
+    'name': 'Hyprland',
+    'path': None,
+    'argv': ['/usr/bin/Hyprland'],
+    'env': {'XDG_CURRENT_DESKTOP': 'Hyprland', 'XDG_SESSION_DESKTOP': 'Hyprland'},
+}
+
+
+def parse_desktop_file(path):
+    """Keys of the [Desktop Entry] group (unlocalized values only)"""
+    entry = {}
+    group = None
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('['):
+                group = line
+                continue
+            if group != '[Desktop Entry]' or '=' not in line:
+                continue
+            key, _, value = line.partition('=')
+            key = key.strip()
+            if '[' not in key:  # Name[de]=... and friends
+                entry[key] = value.strip()
+    return entry
+
+
+def exec_argv(command):
+    """Exec= value -> argv, with the field codes (%f, %U, ...) dropped"""
+    argv = []
+    for arg in shlex.split(command):
+        if len(arg) == 2 and arg[0] == '%' and arg != '%%':
+            continue
+        argv.append(arg.replace('%%', '%'))
+    return argv
+
+
+def session_from_entry(path, entry):
+    """Catalog entry for a parsed .desktop file, or None if it can't run"""
+    if entry.get('Type', 'Application') != 'Application' or entry.get('Hidden') == 'true':
+        return None
+    try_exec = entry.get('TryExec')
+    if try_exec and not shutil.which(try_exec, path=SESSION_PATH):
+        return None
+    try:
+        argv = exec_argv(entry.get('Exec', ''))
+    except ValueError:
+        return None
+    binary = argv and shutil.which(argv[0], path=SESSION_PATH)
+    if not binary:
+        return None
+    argv[0] = binary
+
+    session_id = os.path.basename(path)[:-len('.desktop')]
+    names = [name for name in entry.get('DesktopNames', '').split(';') if name]
+    desktop = ':'.join(names) or session_id.replace('-', ' ').title()
+    return {
+        'id': session_id,
+        'name': entry.get('Name') or session_id.replace('-', ' ').title(),
+        'path': path,
+        'argv': argv,
+        'env': {'XDG_CURRENT_DESKTOP': desktop, 'XDG_SESSION_DESKTOP': names[0] if names else desktop},
+    }
+
+
+class SessionCatalog:
+    """Installed sessions, parsed once and cached
+
+    The cache holds the mtime of each session directory (a session added
+    or removed) and of each .desktop file (one edited in place); while
+    they all match, loading the catalog is a handful of stat() calls.
+    """
+    def __init__(self, cache_file=None, dirs=None):
+        self.cache_file = cache_file or os.path.join(CACHE_DIR, 'sessions.json')
+        self.dirs = dirs or SESSION_DIRS
+        self.sessions = []
+        self.scans = 0
+
+    def desktop_files(self):
+        files = []
+        for directory in self.dirs:
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            files += [os.path.join(directory, name) for name in names if name.endswith('.desktop')]
+        return files
+
+    def snapshot(self, files):
+        return {
+            'dirs': {path: dir_mtime(path) for path in self.dirs},
+            'files': {path: dir_mtime(path) for path in files},
+        }
+
+    def scan(self):
+        self.scans += 1
+        files = self.desktop_files()
+        sessions = []
+        seen = set()
+        for path in files:
+            session_id = os.path.basename(path)
+            if session_id in seen:
+                continue  # wayland-sessions wins over xsessions
+            seen.add(session_id)
+            try:
+                session = session_from_entry(path, parse_desktop_file(path))
+            except OSError as e:
+                print(f"Could not read session file {path}: {e}")
+                continue
+            if session:
+                sessions.append(session)
+        # Prefer Hyprland
+        sessions.sort(key=lambda session: 'hyprland' not in session['id'].lower())
+        return sessions, self.snapshot(files)
+
+    def load(self):
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, mtimes):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp = f"{self.cache_file}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(dict(mtimes, sessions=self.sessions), f)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            print(f"Could not write session cache: {e}")
+
+    def resolve(self):
+        """Sessions to offer (Hyprland first), from the cache while it is current"""
+        cached = self.load()
+        if cached and cached.get('sessions') is not None:
+            current = self.snapshot(cached.get('files', {}))
+            if current['dirs'] == cached.get('dirs') and current['files'] == cached.get('files'):
+                self.sessions = cached['sessions']
+                return self.sessions or [FALLBACK_SESSION]
+        self.sessions, mtimes = self.scan()
+        self.save(mtimes)
+        return self.sessions or [FALLBACK_SESSION]
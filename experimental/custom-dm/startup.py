@@ -0,0 +1,80 @@
+"""
+Startup phase timings for custom-dm
+Imported before PyQt6 so the import itself can be timed. Times are
+measured from the process start (exec), so interpreter startup counts
+too; they go to stdout, which the service sends to the journal.
+"""
+
+import os
+import sys
+import json
+import time
+
+
+def process_start():
+    """time.monotonic() value of this process's exec (10ms resolution)"""
+    try:
+        with open('/proc/self/stat') as f:
+            ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        age = time.clock_gettime(time.CLOCK_BOOTTIME) - ticks / os.sysconf('SC_CLK_TCK')
+        return time.monotonic() - max(age, 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.monotonic()
+
+
+class StartupProfile:
+    """Named points in the greeter's startup, in ms since exec
+
+    mark() records a point; the summary logged at "interactive" shows
+    how long each phase took (the gap to the previous point). Points
+    reached later, such as a wallpaper decoded in the background, are
+    logged as they arrive. With CUSTOM_DM_PROFILE set to a path, the
+    points are also written there as JSON (for bench/bench_startup.py).
+    """
+    def __init__(self):
+        self.start = process_start()
+        self.marks = []
+        self.reported = False
+        self.output = os.environ.get('CUSTOM_DM_PROFILE')
+        self.mark('python')
+
+    def mark(self, phase):
+        at = (time.monotonic() - self.start) * 1000
+        self.marks.append((phase, at))
+        if self.reported:
+            print(f"Startup: {phase} at {at:.0f}ms")
+            self.write()
+        return at
+
+    def get(self, phase):
+        return next((at for name, at in self.marks if name == phase), None)
+
+    def phases(self):
+        """(phase, duration ms) in the order they were reached"""
+        previous = 0.0
+        durations = []
+        for phase, at in self.marks:
+            durations.append((phase, at - previous))
+            previous = at
+        return durations
+
+    def report(self):
+        """Log the startup summary (once)"""
+        if self.reported:
+            return
+        self.reported = True
+        phases = ', '.join(f"{phase} {duration:.0f}ms" for phase, duration in self.phases())
+        print(f"Startup: {phases}")
+        print(f"Startup: first frame at {self.get('first frame') or 0:.0f}ms, "
+              f"interactive at {self.get('interactive') or 0:.0f}ms")
+        sys.stdout.flush()
+        self.write()
+
+    def write(self):
+        if not self.output:
+            return
+        try:
+            with open(self.output, 'w') as f:
+                json.dump(dict(self.marks), f)
+        except OSError as e:
+            print(f"Could not write startup profile: {e}")
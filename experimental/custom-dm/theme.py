@@ -0,0 +1,144 @@
+"""
+Greeter themes for custom-dm
+One application-level stylesheet addressed by object names, built from a
+colour theme and a font table whose family is resolved once. Switching
+theme is one setStyleSheet() on the application: one parse, one polish.
+"""
+
+import os
+import functools
+
+from PyQt6.QtGui import QFont
+
+THEMES = {
+    'rose-pine': {
+        'text': '#e0def4',
+        'accent': '#c4a7e7',
+        'error': '#eb6f92',
+        'info': '#9ccfd8',
+        'panel': 'rgba(25, 23, 36, 220)',
+        'panel_border': 'rgba(196, 167, 231, 50)',
+        'field': 'rgba(33, 33, 33, 220)',
+        'popup': '#212121',
+        'login': '#5e81ac',
+        'shutdown': '#bf616a',
+        'reboot': '#d08770',
+        'gradient': ('#191724', '#1f1d2e', '#26233a'),
+    },
+    'rose-pine-dawn': {
+        'text': '#575279',
+        'accent': '#907aa9',
+        'error': '#b4637a',
+        'info': '#56949f',
+        'panel': 'rgba(250, 244, 237, 225)',
+        'panel_border': 'rgba(144, 122, 169, 60)',
+        'field': 'rgba(242, 233, 225, 230)',
+        'popup': '#fffaf3',
+        'login': '#286983',
+        'shutdown': '#b4637a',
+        'reboot': '#ea9d34',
+        'gradient': ('#faf4ed', '#fffaf3', '#f2e9e1'),
+    },
+}
+
+DEFAULT_THEME = os.environ.get('CUSTOM_DM_THEME', 'rose-pine')
+
+FONT_FAMILIES = ("JetBrainsMono Nerd Font", "Noto Sans")
+
+# Pixel sizes by role, applied through the stylesheet only; widgets
+# inherit the family from the application font
+FONT_SIZES = {
+    'clock': 80,
+    'date': 22,
+    'input': 14,
+    'combo': 12,
+    'button': 14,
+    'power': 11,  # shutdown/reboot
+    'status': 14,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def font_family():
+    """First installed family of FONT_FAMILIES, looked up once per process"""
+    return next((family for family in FONT_FAMILIES if QFont(family).exactMatch()), FONT_FAMILIES[-1])
+
+
+def app_font():
+    return QFont(font_family(), 10)
+
+
+def stylesheet(name=None):
+    """The whole greeter's stylesheet for theme `name`"""
+    c = dict(THEMES.get(name or DEFAULT_THEME, THEMES['rose-pine']),
+             **{f"{role}_size": size for role, size in FONT_SIZES.items()})
+    return """
+        QWidget#loginPanel {{
+            background-color: {panel};
+            border-right: 1px solid {panel_border};
+        }}
+        QWidget#wallpaperArea {{ background: transparent; }}
+        QLabel#clock {{ color: {text}; font-size: {clock_size}px; font-weight: bold; }}
+        QLabel#date {{ color: {accent}; font-size: {date_size}px; }}
+        QLabel#status {{ color: {error}; font-size: {status_size}px; padding: 10px; }}
+        QLabel#status[state="info"] {{ color: {info}; padding: 0px; }}
+        #loginPanel QLineEdit {{
+            background-color: {field};
+            color: {text};
+            border: 2px solid transparent;
+            border-radius: 8px;
+            padding: 12px;
+            font-size: {input_size}px;
+        }}
+        #loginPanel QLineEdit:focus {{ border: 2px solid {accent}; }}
+        QComboBox#sessionCombo {{
+            background-color: {field};
+            color: {text};
+            border: 2px solid transparent;
+            border-radius: 8px;
+            padding: 10px;
+            font-size: {combo_size}px;
+        }}
+        QComboBox#sessionCombo:focus {{ border: 2px solid {accent}; }}
+        QComboBox#sessionCombo::drop-down {{ border: none; width: 30px; }}
+        QComboBox#sessionCombo QAbstractItemView {{
+            background-color: {popup};
+            color: {text};
+            selection-background-color: {accent};
+            border-radius: 8px;
+        }}
+        #loginPanel QPushButton {{
+            color: {text};
+            border: none;
+            border-radius: 8px;
+            padding: 14px;
+            font-weight: bold;
+        }}
+        QPushButton#loginButton {{ background-color: {login}; font-size: {button_size}px; }}
+        QPushButton#loginButton:hover {{ background-color: {login}dd; }}
+        QPushButton#loginButton:pressed {{ background-color: {login}aa; }}
+        QPushButton#shutdownButton {{ background-color: {shutdown}; font-size: {power_size}px; }}
+        QPushButton#shutdownButton:hover {{ background-color: {shutdown}dd; }}
+        QPushButton#shutdownButton:pressed {{ background-color: {shutdown}aa; }}
+        QPushButton#rebootButton {{ background-color: {reboot}; font-size: {power_size}px; }}
+        QPushButton#rebootButton:hover {{ background-color: {reboot}dd; }}
+        QPushButton#rebootButton:pressed {{ background-color: {reboot}aa; }}
+    """.format(**c)
+
+
+def gradient_colors(name=None):
+    return THEMES.get(name or DEFAULT_THEME, THEMES['rose-pine'])['gradient']
+
+
+def apply_theme(app, name=None):
+    """Install theme `name` (default CUSTOM_DM_THEME) application-wide"""
+    app.setStyleSheet(stylesheet(name))
+
+
+def set_state(widget, state):
+    """Switch a widget between stylesheet states ([state="..."] selectors)"""
+    if widget.property('state') == state:
+        return
+    widget.setProperty('state', state)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
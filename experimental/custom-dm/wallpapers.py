@@ -0,0 +1,229 @@
+"""
+Wallpaper discovery index and scaled-image cache for custom-dm
+Remembers which background to use between starts, keyed by the mtimes of
+every directory the search looks at, so startup does one cache read
+instead of listing folders and probing fallback paths. Wallpapers already
+scaled to a screen are kept as raw pixels, so later starts skip the
+decode and the rescale.
+"""
+
+import os
+import json
+import struct
+import hashlib
+import threading
+
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.mkv', '.mov', '.avi')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+CACHE_DIR = os.environ.get('CUSTOM_DM_CACHE_DIR', '/var/cache/custom-dm')
+
+
+def default_sources():
+    """Search order: (folders to scan for videos, fixed video paths,
+    folders to scan for images, fixed image paths)"""
+    home = os.path.expanduser
+    live = home("~/.config/hypr/wallpapers/live-wallpapers")
+    return {
+        'video_dirs': [live],
+        'video_paths': [
+            home("~/.config/hypr/wallpapers/live/login-video.mp4"),
+            home("~/.config/hypr/wallpapers/live/login-video.webm"),
+            home("~/.config/hypr/wallpapers/background.mp4"),
+            home("~/.config/hypr/wallpapers/background.webm"),
+            "/usr/share/sddm/themes/sddm-astronaut-theme/background.mp4",
+            "/usr/share/sddm/themes/sddm-astronaut-theme/background.webm",
+            "/usr/share/backgrounds/login-video.mp4",
+            "/usr/share/backgrounds/login-video.webm",
+        ],
+        # Any video dropped straight into the wallpapers folder
+        'late_video_dirs': [home("~/.config/hypr/wallpapers")],
+        'image_dirs': [live],
+        'image_paths': [
+            "/usr/share/sddm/themes/sddm-astronaut-theme/background.jpg",
+            "/usr/share/sddm/themes/sddm-astronaut-theme/background.png",
+            home("~/.config/hypr/wallpapers/dark-theme/dark-wall1.jpg"),
+            home("~/.config/hypr/wallpapers/dark-theme/dark-wall2.jpg"),
+            home("~/.config/hypr/wallpapers/light-theme/light-wall1.jpg"),
+            home("~/.config/hypr/wallpapers/background.jpg"),
+            home("~/.config/hypr/wallpapers/background.png"),
+            "/usr/share/backgrounds/default.png",
+            "/usr/share/backgrounds/default.jpg",
+            "/usr/share/pixmaps/background.png",
+        ],
+    }
+
+
+def dir_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class WallpaperIndex:
+    """Cached answer to "which wallpaper should the greeter show?"
+
+    The cache stores the chosen video and image together with the mtime
+    of every directory the search depends on: the scanned folders and
+    the parents of the fixed fallback paths. A directory's mtime changes
+    whenever an entry is added, removed or renamed, so equal mtimes mean
+    the search would give the same answer.
+    """
+    def __init__(self, cache_file=None, sources=None):
+        self.cache_file = cache_file or os.path.join(CACHE_DIR, 'wallpapers.json')
+        self.sources = sources or default_sources()
+        self.video = None
+        self.image = None
+        self.scans = 0
+
+    def watched_dirs(self):
+        dirs = set(self.sources['video_dirs'] + self.sources['late_video_dirs'] + self.sources['image_dirs'])
+        dirs.update(os.path.dirname(path) for path in self.sources['video_paths'] + self.sources['image_paths'])
+        return sorted(dirs)
+
+    def snapshot(self):
+        return {path: dir_mtime(path) for path in self.watched_dirs()}
+
+    def scan(self):
+        """Full search; each folder is listed once"""
+        self.scans += 1
+        listings = {}
+
+        def files(directory, extensions):
+            if directory not in listings:
+                try:
+                    listings[directory] = sorted(os.listdir(directory))
+                except OSError:
+                    listings[directory] = []
+            return [os.path.join(directory, name) for name in listings[directory]
+                    if name.lower().endswith(extensions)]
+
+        def first(candidates):
+            return next((path for path in candidates if os.path.isfile(path)), None)
+
+        sources = self.sources
+        video = first(
+            [p for d in sources['video_dirs'] for p in files(d, VIDEO_EXTENSIONS)]
+            + sources['video_paths']
+            + [p for d in sources['late_video_dirs'] for p in files(d, VIDEO_EXTENSIONS)]
+        )
+        image = first([p for d in sources['image_dirs'] for p in files(d, IMAGE_EXTENSIONS)]
+                      + sources['image_paths'])
+        return video, image
+
+    def load(self):
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, mtimes):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp = f"{self.cache_file}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump({'dirs': mtimes, 'video': self.video, 'image': self.image}, f)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            print(f"Could not write wallpaper cache: {e}")
+
+    def refresh(self):
+        """Rescan and store; returns True if the answer changed"""
+        mtimes = self.snapshot()
+        previous = (self.video, self.image)
+        self.video, self.image = self.scan()
+        self.save(mtimes)
+        return (self.video, self.image) != previous
+
+    def resolve(self, on_change=None):
+        """Return (video, image) right away, from the cache when there is one
+
+        With a cache, the directory check runs on a background thread;
+        if anything changed it rescans, rewrites the cache and calls
+        on_change(video, image) from that thread when the answer differs.
+        Without one (first boot) the scan runs here.
+        """
+        cached = self.load()
+        if not cached:
+            self.refresh()
+            return self.video, self.image
+
+        self.video, self.image = cached.get('video'), cached.get('image')
+        thread = threading.Thread(target=self.validate, args=(cached.get('dirs', {}), on_change),
+                                  name='wallpaper-index', daemon=True)
+        thread.start()
+        return self.video, self.image
+
+    def validate(self, mtimes, on_change=None):
+        try:
+            if self.snapshot() == mtimes:
+                return
+            print("Wallpaper folders changed, rescanning")
+            if self.refresh() and on_change:
+                on_change(self.video, self.image)
+        except Exception as e:
+            print(f"Wallpaper rescan failed: {e}")
+
+
+class ScaledWallpaperCache:
+    """Wallpapers pre-scaled to a screen, stored as raw 32-bit pixels
+
+    Entries are keyed by (path, mtime, size, width, height, DPR), so an
+    edited wallpaper or a new resolution is simply a miss. Loading an
+    entry is one read into an image buffer: no JPEG/PNG decode and no
+    rescale. Only the `keep` most recently used entries are kept.
+    """
+    MAGIC = b'CDMW1'
+    HEADER = struct.Struct('<5sIIII')  # magic, width, height, stride, format
+
+    def __init__(self, cache_dir=None, keep=8):
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, 'scaled')
+        self.keep = keep
+
+    def entry_path(self, path, width, height, dpr):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{width}x{height}@{dpr:g}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.raw')
+
+    def load(self, path, width, height, dpr):
+        """(width, height, stride, format, pixels) or None on a miss"""
+        entry = self.entry_path(path, width, height, dpr)
+        if not entry:
+            return None
+        try:
+            with open(entry, 'rb') as f:
+                magic, w, h, stride, fmt = self.HEADER.unpack(f.read(self.HEADER.size))
+                pixels = f.read()
+            os.utime(entry)  # most recently used
+        except (OSError, struct.error):
+            return None
+        if magic != self.MAGIC or len(pixels) != stride * h:
+            return None
+        return w, h, stride, fmt, pixels
+
+    def store(self, path, width, height, dpr, image_width, image_height, stride, fmt, pixels):
+        entry = self.entry_path(path, width, height, dpr)
+        if not entry:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{entry}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, image_width, image_height, stride, fmt))
+                f.write(pixels)
+            os.replace(tmp, entry)
+            self.prune()
+        except OSError as e:
+            print(f"Could not write scaled wallpaper cache: {e}")
+
+    def prune(self):
+        entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                   if name.endswith('.raw')]
+        entries.sort(key=lambda entry: os.stat(entry).st_mtime, reverse=True)
+        for entry in entries[self.keep:]:
+            os.remove(entry)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Classification benchmark - core scaling on a replayed log burst
+Runs the same burst through BatchClassifier in-process and with 1..N
+worker processes and reports lines/s and speedup over in-process.
+
+Usage:
+  bench_classify.py                       # synthetic 50k-line burst
+  bench_classify.py --burst burst.log     # replay a saved burst
+  bench_classify.py --write-burst burst.log --lines 200000
+Author: iceyxsm
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from botcore import ERROR_PATTERNS, ErrorMatcher, BatchClassifier  # noqa: E402
+
+
+def synthetic_burst(count, seed=1):
+    """A driver spewing errors, mixed with ordinary journal noise"""
+    rng = random.Random(seed)
+    spew = [
+        "kernel: nvidia-modeset: ERROR: GPU:0: Error while waiting for GPU progress: 0x0000c67d:0 2:0:4048:4040",
+        "kernel: amdgpu 0000:03:00.0: amdgpu: [gfxhub] page fault (src_id:0 ring:24 vmid:3 pasid:32771)",
+        "kernel: i915 0000:00:02.0: [drm] *ERROR* CPU pipe A FIFO underrun",
+        "Hyprland[1234]: [ERR] Failed to create EGL context: timeout",
+        "pipewire[987]: spa.alsa: hw:0: snd_pcm_avail after recover: Broken pipe - connection refused",
+    ]
+    noise = [
+        "systemd[1]: Started Session 4 of User ice.",
+        "NetworkManager[612]: <info>  [1697712000.1234] device (wlan0): state change",
+        "kernel: usb 1-2: new high-speed USB device number 7 using xhci_hcd",
+    ]
+    lines = []
+    for i in range(count):
+        source = spew if rng.random() < 0.7 else noise
+        lines.append(f"Oct 19 12:{(i // 60) % 60:02d}:{i % 60:02d} host {rng.choice(source)} #{i}")
+    return lines
+
+
+async def time_run(classifier, lines, repeat):
+    best = None
+    errors = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        errors = await classifier.classify(lines)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, errors
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='BatchClassifier core-scaling benchmark')
+    parser.add_argument('--burst', help='replay lines from this file')
+    parser.add_argument('--lines', type=int, default=50000, help='synthetic burst size')
+    parser.add_argument('--write-burst', help='write the synthetic burst here and exit')
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.burst:
+        with open(args.burst, errors='replace') as f:
+            lines = f.read().splitlines()
+    else:
+        lines = synthetic_burst(args.lines)
+
+    if args.write_burst:
+        with open(args.write_burst, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        print(f"Wrote {len(lines)} lines to {args.write_burst}")
+        return
+
+    matcher = ErrorMatcher(ERROR_PATTERNS)
+
+    print(f"Burst: {len(lines)} lines, chunk size {args.chunk_size}, {os.cpu_count()} CPUs")
+    print(f"{'mode':<12}{'time':>10}{'lines/s':>14}{'speedup':>10}")
+
+    start = time.perf_counter()
+    substring_hits = sum(1 for line in lines if any(p in line for p in ERROR_PATTERNS))
+    substring_time = time.perf_counter() - start
+    start = time.perf_counter()
+    regex_hits = sum(1 for line in lines if matcher.search(line))
+    regex_time = time.perf_counter() - start
+    if regex_hits != substring_hits:
+        print(f"!! compiled matcher found {regex_hits} lines, substring loop {substring_hits}")
+    print(f"Matcher: substring loop {substring_time * 1000:.1f}ms, compiled {regex_time * 1000:.1f}ms "
+          f"({substring_time / regex_time:.1f}x)\n")
+
+    inline = BatchClassifier(matcher, workers=0)
+    baseline, expected = await time_run(inline, lines, args.repeat)
+    print(f"{'in-process':<12}{baseline * 1000:>8.1f}ms{len(lines) / baseline:>14,.0f}{1.0:>9.2f}x")
+
+    workers = 1
+    while workers <= args.max_workers:
+        classifier = BatchClassifier(matcher, workers=workers, threshold=0, chunk_size=args.chunk_size)
+        # Spawn the workers before timing
+        await classifier.classify(lines[:args.chunk_size * workers])
+        elapsed, errors = await time_run(classifier, lines, args.repeat)
+        classifier.shutdown()
+        if errors != expected:
+            print(f"!! {workers} workers: output differs from in-process result")
+        label = f"{workers} worker" + ('s' if workers > 1 else '')
+        print(f"{label:<12}{elapsed * 1000:>8.1f}ms{len(lines) / elapsed:>14,.0f}{baseline / elapsed:>9.2f}x")
+        workers *= 2
+
+    print(f"Matched {len(expected)} error lines")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
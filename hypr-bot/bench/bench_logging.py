@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Logging hot-path benchmark
+Times logger.error() calls during an error storm with the old synchronous
+FileHandler + StreamHandler setup and with botcore's queue-based setup
+(rotation, compression and repeat rate limiting on a listener thread).
+
+Usage:
+  bench_logging.py                    # 50k records, 80% repeats
+  bench_logging.py --records 200000 --unique 0.5
+Author: iceyxsm
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from botcore.logs import setup_logging, stop_listener, LOG_FORMAT  # noqa: E402
+
+
+def storm(count, unique, seed=1):
+    rng = random.Random(seed)
+    repeats = [f"Journal error: read timed out on unit {n}" for n in range(5)]
+    for i in range(count):
+        if rng.random() < unique:
+            yield f"Stage dedupe error: unexpected entry {i}"
+        else:
+            yield rng.choice(repeats)
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def run(logger, messages):
+    """Total time and p99 / worst single-call latency"""
+    calls = []
+    start = time.perf_counter()
+    for message in messages:
+        t0 = time.perf_counter()
+        logger.error(message)
+        calls.append(time.perf_counter() - t0)
+    calls.sort()
+    return time.perf_counter() - start, calls[int(len(calls) * 0.99)], calls[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Logging hot-path benchmark')
+    parser.add_argument('--records', type=int, default=50000)
+    parser.add_argument('--unique', type=float, default=0.2, help='fraction of one-off messages')
+    args = parser.parse_args()
+    messages = list(storm(args.records, args.unique))
+
+    with tempfile.TemporaryDirectory(prefix='bench-logging-') as tmp, open(os.devnull, 'w') as devnull:
+        logger = logging.getLogger('bench')
+
+        # Previous setup: synchronous file + console handlers
+        logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, force=True, handlers=[
+            logging.FileHandler(Path(tmp) / 'sync.log'),
+            logging.StreamHandler(devnull),
+        ])
+        sync_total, sync_p99, sync_worst = run(logger, messages)
+        reset_root()
+
+        listener = setup_logging(Path(tmp) / 'queued.log', stream=devnull, max_bytes=1 << 20)
+        queued_total, queued_p99, queued_worst = run(logger, messages)
+        flush_start = time.perf_counter()
+        stop_listener(listener)
+        flush = time.perf_counter() - flush_start
+        reset_root()
+
+        files = sorted(p.name for p in Path(tmp).iterdir())
+        queued_bytes = sum(p.stat().st_size for p in Path(tmp).glob('queued.log*'))
+        sync_bytes = (Path(tmp) / 'sync.log').stat().st_size
+
+    n = len(messages)
+    print(f"{args.records} records, {args.unique:.0%} unique")
+    print(f"{'setup':<14}{'mean':>10}{'p99':>10}{'worst':>11}{'on disk':>12}")
+    print(f"{'sync handlers':<14}{sync_total / n * 1e6:>8.1f}us{sync_p99 * 1e6:>8.1f}us"
+          f"{sync_worst * 1000:>9.2f}ms{sync_bytes / 1024:>10.0f}KB")
+    print(f"{'queue':<14}{queued_total / n * 1e6:>8.1f}us{queued_p99 * 1e6:>8.1f}us"
+          f"{queued_worst * 1000:>9.2f}ms{queued_bytes / 1024:>10.0f}KB")
+    print(f"Listener drained the backlog in {flush * 1000:.1f}ms after the storm")
+    print(f"Files: {', '.join(files)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Fallback transport check and benchmark
+Runs TelegramClient's stdlib keep-alive transport (the no-aiohttp path)
+against the fake Bot API served over TLS with a throwaway self-signed
+cert, checks every call arrives intact over reused connections, then
+times it against forking curl per message.
+
+Usage:
+  bench_transport.py                 # 200 messages each way
+  bench_transport.py --count 1000 --no-curl
+Author: iceyxsm
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent))
+from fake_telegram import serve_in_thread, self_signed_cert, tls_context  # noqa: E402
+from botcore import TelegramClient, telegram  # noqa: E402
+
+
+def stdlib_client(url, certfile):
+    # Force the fallback even where aiohttp happens to be installed
+    telegram.aiohttp_missing = True
+    return TelegramClient('0:bench', '1', api_url=url, ca_file=certfile)
+
+
+async def check(url, certfile, server):
+    """Every call type arrives intact; connections are reused"""
+    client = stdlib_client(url, certfile)
+    failures = []
+    texts = ['plain', '<b>bold</b> &amp; ünïcödé 🚨', 'x' * 4000, 'line\r\nbreak']
+    for text in texts:
+        if not await client.send_message(text):
+            failures.append(f"sendMessage {text[:20]!r} -> {client.last_status}")
+    if not await client.send_document('errors.txt', 'a\nb\n' * 1000, caption='dump'):
+        failures.append(f"sendDocument -> {client.last_status}")
+    if await client.get_updates(0) != []:
+        failures.append("getUpdates returned unexpected updates")
+    await client.answer_callback('42')
+
+    received = [m['text'] for m in server.messages]
+    for text in texts:
+        if text not in received:
+            failures.append(f"text mangled in transit: {text[:20]!r}")
+    if not any(m['method'] == 'sendDocument' and 'dump' in m['text'] for m in server.messages):
+        failures.append("document caption missing")
+    # One connection for sends, one for polling
+    if client.transport.connections != 1 or client.poll_transport.connections != 1:
+        failures.append(f"connections not reused: {client.transport.connections} send, "
+                        f"{client.poll_transport.connections} poll")
+    await client.close()
+    return failures
+
+
+async def check_stale(certfile):
+    """A server that drops idle connections costs a reconnect, not a failed send"""
+    context = tls_context(certfile, certfile.replace('.crt', '.key'))
+    server = serve_in_thread(ssl_context=context, close_after=3)
+    client = stdlib_client(server.url, certfile)
+    sent = 0
+    for i in range(10):
+        sent += await client.send_message(f"stale {i}")
+        await asyncio.sleep(0.01)
+    await client.close()
+    server.stop_thread()
+    if sent != 10:
+        return [f"only {sent}/10 sends survived server-side connection drops"]
+    return []
+
+
+async def time_stdlib(url, certfile, count):
+    client = stdlib_client(url, certfile)
+    start = time.perf_counter()
+    for i in range(count):
+        await client.send_message(f"bench {i}")
+    elapsed = time.perf_counter() - start
+    connections = client.transport.connections
+    await client.close()
+    return elapsed, connections
+
+
+def time_curl(url, certfile, count):
+    start = time.perf_counter()
+    for i in range(count):
+        subprocess.run(
+            ['curl', '-s', '--cacert', certfile, '-X', 'POST', f"{url}/bot0:bench/sendMessage",
+             '-H', 'Content-Type: application/json', '-d', f'{{"chat_id": "1", "text": "curl {i}"}}',
+             '-o', '/dev/null', '-w', '%{http_code}'],
+            capture_output=True, text=True, timeout=10
+        )
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Stdlib Bot API transport check and benchmark')
+    parser.add_argument('--count', type=int, default=200, help='messages per transport')
+    parser.add_argument('--no-curl', action='store_true', help='skip the curl comparison')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-transport-') as tmp:
+        certfile, keyfile = self_signed_cert(tmp)
+        server = serve_in_thread(ssl_context=tls_context(certfile, keyfile))
+
+        failures = await check(server.url, certfile, server)
+        failures += await check_stale(certfile)
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if not failures:
+            print("OK: stdlib transport over TLS (messages, document, updates, callbacks, reconnect)")
+
+        elapsed, connections = await time_stdlib(server.url, certfile, args.count)
+        print(f"\n{'transport':<22}{'total':>10}{'per msg':>12}")
+        print(f"{'stdlib keep-alive':<22}{elapsed * 1000:>8.1f}ms{elapsed / args.count * 1000:>10.2f}ms"
+              f"  ({connections} connection)")
+        if not args.no_curl:
+            curl = time_curl(server.url, certfile, args.count)
+            print(f"{'curl fork per msg':<22}{curl * 1000:>8.1f}ms{curl / args.count * 1000:>10.2f}ms"
+                  f"  ({curl / elapsed:.1f}x slower)")
+        server.stop_thread()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Coredump enrichment check
+Feeds CrashEnricher systemd-coredump reports whose module lists start
+with the vdso and libc (shared by every process on the host) and checks
+that each crash is keyed on its own executable's build-id, so one
+binary's summary is never served for another's crash.
+
+Usage:
+  coredump_check.py
+Author: iceyxsm
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+from botcore import CrashEnricher, parse_coredump_message  # noqa: E402
+
+
+def report(pid, comm, exe_build_id, frame):
+    return (
+        f"Process {pid} ({comm}) of user 1000 dumped core.\n\n"
+        "Module linux-vdso.so.1 with build-id 0123456789abcdef\n"
+        "Module libc.so.6 from rpm glibc-2.39 with build-id fedcba9876543210\n"
+        f"Module /usr/bin/{comm} with build-id {exe_build_id}\n"
+        f"Stack trace of thread {pid}:\n"
+        f"#0  0x00007f0000001000 {frame} ({comm} + 0x10)\n"
+    )
+
+
+async def main():
+    lookups = []
+
+    async def fetch(pid):
+        lookups.append(pid)
+        return {'MESSAGE': messages[pid], 'COREDUMP_EXE': f"/usr/bin/{comms[pid]}", 'COREDUMP_SIGNAL_NAME': 'SIGSEGV'}
+
+    comms = {'100': 'Hyprland', '200': 'waybar', '300': 'Hyprland'}
+    messages = {
+        '100': report(100, 'Hyprland', 'aaaaaaaaaaaaaaaa', 'CCompositor::crash'),
+        '200': report(200, 'waybar', 'bbbbbbbbbbbbbbbb', 'waybar::Bar::render'),
+        '300': report(300, 'Hyprland', 'aaaaaaaaaaaaaaaa', 'CCompositor::crash'),
+    }
+    enricher = CrashEnricher(fetch=fetch)
+    crashes = {}
+    for pid in ('100', '200', '300'):
+        error = {'process': 'systemd-coredump', 'message': messages[pid],
+                 'coredump': parse_coredump_message(messages[pid])}
+        crashes[pid] = (await enricher.enrich(error))['crash']
+
+    # A failed lookup is not cached: the next crash of that build retries
+    failing = {'first': True}
+
+    async def flaky_fetch(pid):
+        if failing.pop('first', False):
+            raise asyncio.TimeoutError()
+        return await fetch(pid)
+
+    retry = CrashEnricher(fetch=flaky_fetch)
+    for pid in ('100', '300'):
+        error = {'process': 'systemd-coredump', 'message': messages[pid],
+                 'coredump': parse_coredump_message(messages[pid])}
+        crashes['retry ' + pid] = (await retry.enrich(error))['crash']
+
+    # No build-id in the alert's message: nothing stored that can't be read back
+    bare = CrashEnricher(fetch=fetch)
+    no_id = messages['200'].replace('Module /usr/bin/waybar', 'Module /usr/bin/other')
+    await bare.enrich({'process': 'systemd-coredump', 'message': no_id,
+                       'coredump': parse_coredump_message(no_id)})
+
+    parsed = parse_coredump_message(messages['200'])
+    checks = [
+        ('executable module picked, not the vdso', parsed['build_id'] == 'bbbbbbbbbbbbbbbb'),
+        ('exe name matched when comm is cut',
+         parse_coredump_message(report(1, 'a-long-process-name', 'cccccccccccccccc', 'f').replace(
+             '(a-long-process-name)', '(a-long-process-)'))['build_id'] == 'cccccccccccccccc'),
+        ('other binary gets its own summary', crashes['200'].startswith('/usr/bin/waybar')
+         and 'waybar::Bar::render' in crashes['200']),
+        ('repeat crash served from cache', enricher.snapshot()['fetched'] == 2
+         and 'crash #2 of this build' in crashes['300']),
+        ('failed lookup not cached', 'unknown signal' in crashes['retry 100']
+         and 'SIGSEGV' in crashes['retry 300'] and retry.snapshot()['fetched'] == 2),
+        ('nothing cached without a build-id', not bare.cache),
+    ]
+    failures = 0
+    for name, ok in checks:
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        failures += not ok
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
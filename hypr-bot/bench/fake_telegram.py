@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Fake Telegram Bot API server for offline benchmarks
+Speaks just enough HTTP/1.1 (keep-alive, Content-Length bodies) to accept
+sendMessage/sendDocument/answerCallbackQuery and answer getUpdates with
+an empty result. Every received message is recorded with its arrival time.
+
+Standalone:  fake_telegram.py --port 8081 [--tls]
+Then point a bot at it with TELEGRAM_API_URL=http://127.0.0.1:8081
+(with --tls: https://localhost:8081 and TELEGRAM_CA_FILE=<printed cert>)
+Author: iceyxsm
+"""
+
+import re
+import time
+import json
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+from urllib.parse import parse_qs, urlsplit
+
+
+def self_signed_cert(directory):
+    """Write a localhost cert/key pair with openssl; returns (certfile, keyfile)"""
+    certfile = f"{directory}/fake-telegram.crt"
+    keyfile = f"{directory}/fake-telegram.key"
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-keyout', keyfile, '-out', certfile, '-subj', '/CN=localhost',
+         '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1'],
+        check=True, capture_output=True
+    )
+    return certfile, keyfile
+
+
+def tls_context(certfile, keyfile):
+    import ssl
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+class FakeTelegramServer:
+    """Records every Bot API call; optional per-request delay simulates a slow API
+
+    Pass ssl_context (see self_signed_cert/tls_context) to serve HTTPS.
+    connections counts accepted TCP connections, to check keep-alive reuse.
+    close_after=N silently drops each connection after N requests, like a
+    server-side idle timeout.
+    """
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0, on_message=None, ssl_context=None,
+                 close_after=0):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.on_message = on_message
+        self.ssl_context = ssl_context
+        self.messages = []
+        self.calls = {}
+        self.close_after = close_after
+        self.connections = 0
+        self.writers = set()
+        self.server = None
+
+    @property
+    def url(self):
+        if self.ssl_context:
+            # The test cert is issued for localhost
+            return f"https://localhost:{self.port}"
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                                 ssl=self.ssl_context)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        for writer in list(self.writers):
+            writer.close()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        self.connections += 1
+        self.writers.add(writer)
+        served = 0
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                body = b''
+                length = int(headers.get('content-length', 0))
+                if length:
+                    body = await reader.readexactly(length)
+
+                status, payload = await self.dispatch(method, target, headers, body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} OK\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                served += 1
+                if headers.get('connection', '').lower() == 'close':
+                    break
+                if self.close_after and served >= self.close_after:
+                    break
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    def parse_body(self, headers, body, query):
+        content_type = headers.get('content-type', '')
+        if 'json' in content_type:
+            return json.loads(body or b'{}')
+        if 'multipart/form-data' in content_type:
+            # Only the text fields matter here; file parts are counted by size
+            fields = {}
+            boundary = content_type.split('boundary=')[-1].encode()
+            for part in body.split(b'--' + boundary):
+                match = re.search(rb'name="([^"]+)"(?:; filename="[^"]*")?.*?\r\n\r\n(.*)\r\n$', part, re.S)
+                if match:
+                    fields[match.group(1).decode()] = match.group(2).decode(errors='replace')
+            return fields
+        params = parse_qs(body.decode() if body else query)
+        return {key: values[0] for key, values in params.items()}
+
+    async def dispatch(self, method, target, headers, body):
+        parts = urlsplit(target)
+        api_method = parts.path.rsplit('/', 1)[-1]
+        self.calls[api_method] = self.calls.get(api_method, 0) + 1
+
+        if api_method == 'getUpdates':
+            # Behave like an idle long-poll without holding the bot up
+            await asyncio.sleep(0.5)
+            return 200, {'ok': True, 'result': []}
+
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        if api_method in ('sendMessage', 'sendDocument'):
+            params = self.parse_body(headers, body, parts.query)
+            # Documents count as text too so replay markers inside them are found
+            text = '\n'.join(params[key] for key in ('text', 'caption', 'document') if params.get(key))
+            record = {'method': api_method, 'time': time.monotonic(), 'text': text, 'size': len(body)}
+            self.messages.append(record)
+            if self.on_message:
+                self.on_message(record)
+            return 200, {'ok': True, 'result': {'message_id': len(self.messages)}}
+
+        return 200, {'ok': True, 'result': True}
+
+
+def serve_in_thread(**kwargs):
+    """Run a FakeTelegramServer on its own loop in a daemon thread
+
+    The bots' curl fallback blocks the calling event loop, so the server
+    must not share it. Returns the started server; call stop_thread() on it.
+    """
+    ready = threading.Event()
+    holder = {}
+
+    def runner():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        server = FakeTelegramServer(**kwargs)
+        loop.run_until_complete(server.start())
+        server.loop = loop
+        holder['server'] = server
+        ready.set()
+        loop.run_forever()
+        loop.run_until_complete(server.stop())
+        # Let handlers of connections the client left open see EOF and exit
+        loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(loop), return_exceptions=True))
+        loop.close()
+
+    thread = threading.Thread(target=runner, name='fake-telegram', daemon=True)
+    thread.start()
+    ready.wait()
+    server = holder['server']
+
+    def stop_thread():
+        server.loop.call_soon_threadsafe(server.loop.stop)
+        thread.join(timeout=5)
+
+    server.stop_thread = stop_thread
+    return server
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Fake Telegram Bot API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--delay', type=float, default=0.0, help='seconds to stall each send')
+    parser.add_argument('--tls', action='store_true', help='serve HTTPS with a throwaway self-signed cert')
+    args = parser.parse_args()
+
+    context = None
+    if args.tls:
+        certfile, keyfile = self_signed_cert(tempfile.mkdtemp(prefix='fake-telegram-'))
+        context = tls_context(certfile, keyfile)
+        print(f"TLS cert: {certfile}")
+
+    def show(record):
+        print(f"[{record['method']}] {record['text'][:120]!r}")
+
+    server = await FakeTelegramServer(args.host, args.port, args.delay, on_message=show,
+                                      ssl_context=context).start()
+    print(f"Fake Telegram API listening on {server.url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
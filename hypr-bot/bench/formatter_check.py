@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Alert formatter check
+Packs alerts full of characters that grow when HTML-escaped (`<`, `"`,
+`&`) and checks every message Telegram would get: within the size limit,
+tags balanced, no entity cut in half. Alerts too long for one message
+must reach the .txt document whole instead of being truncated.
+
+Usage:
+  formatter_check.py
+Author: iceyxsm
+"""
+
+import re
+import sys
+from pathlib import Path
+from html.parser import HTMLParser
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+from botcore import AlertFormatter  # noqa: E402
+
+ENTITY = re.compile(r'&(?!(?:amp|lt|gt|quot|#x27);)')
+
+
+class TagBalance(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.open = []
+        self.broken = False
+
+    def handle_starttag(self, tag, attrs):
+        self.open.append(tag)
+
+    def handle_endtag(self, tag):
+        if not self.open or self.open.pop() != tag:
+            self.broken = True
+
+
+def valid_html(message, limit):
+    parser = TagBalance()
+    parser.feed(message)
+    parser.close()
+    return len(message) <= limit and not parser.broken and not parser.open and not ENTITY.search(message)
+
+
+def alert(n, message, crash=None, process='app'):
+    error = {'id': f"E{n:04d}", 'process': process, 'message': message}
+    if crash:
+        error['crash'] = crash
+    return error
+
+
+def main():
+    formatter = AlertFormatter()
+    limit = formatter.limit
+    cases = [
+        ('escaped message and crash', [alert(1, '<' * 999, crash='"' * 999)], False),
+        ('entity at the clip point', [alert(2, 'a' * 995 + '&&&&&&&&&&')], False),
+        ('packed batch', [alert(n, f'<tag> "{n}" & ' * 40, crash='x & y\n' * 50) for n in range(3)], False),
+        ('compact mode', [alert(n, '<' * 500, crash='"' * 500) for n in range(40)], True),
+        ('process name too long for a message', [alert(3, 'boom', process='<' * 2000)], False),
+    ]
+
+    failures = 0
+    for name, errors, compact in cases:
+        messages, document = formatter.pack(errors, compact)
+        ok = all(valid_html(message, limit) for message in messages)
+        print(f"{'OK  ' if ok else 'FAIL'} {name}: {len(messages)} message(s), "
+              f"longest {max(map(len, messages), default=0)}, document {'yes' if document else 'no'}")
+        failures += not ok
+
+    # A tiny limit forces whole alerts out of the messages
+    small = AlertFormatter(limit=300)
+    errors = [alert(1, 'short one'), alert(2, '<' * 999, crash='"' * 999)]
+    messages, document = small.pack(errors)
+    ok = (all(valid_html(message, 300) for message in messages)
+          and document is not None and '<' * 999 in document and '"' * 999 in document
+          and 'short one' in messages[0])
+    print(f"{'OK  ' if ok else 'FAIL'} oversized alert sent whole as a document")
+    failures += not ok
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
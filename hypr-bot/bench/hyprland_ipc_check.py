@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Hyprland IPC listener check
+Runs HyprlandEventListener against stub .socket2.sock/.socket.sock
+servers in a temp dir: no compositor at first, then one that sends
+monitoradded, configreloaded (with a new config error) and monitorremoved
+and closes the socket, then a second instance the listener must reconnect
+to, which finally stops answering commands. Also checks the Hyprland bot
+leaves compositor-down alerts to the listener, so one outage is one alert,
+and stops its listener and watchdog tasks when it is stopped.
+
+Usage:
+  hyprland_ipc_check.py
+Author: iceyxsm
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+import importlib.util
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent.parent
+HYPRLAND_BOT = REPO_DIR / '.config/hypr/scripts/telegram-error-bot.py'
+sys.path.insert(0, str(BENCH_DIR.parent))
+from botcore import HyprlandEventListener, procfs  # noqa: E402
+
+# The bot's log listener flushes at exit, so its HOME outlives main()
+HOME = tempfile.TemporaryDirectory(prefix='bench-hypr-home-')
+
+
+class StubHyprland:
+    """Event and command sockets of a fake compositor instance"""
+    def __init__(self, socket_dir):
+        self.socket_dir = socket_dir
+        self.config_errors = []
+        self.hang = False
+        self.hung_closed = asyncio.Event()
+        self.connections = asyncio.Queue()
+        self.servers = []
+
+    async def start(self):
+        self.servers = [
+            await asyncio.start_unix_server(self.on_event_client, str(self.socket_dir / '.socket2.sock')),
+            await asyncio.start_unix_server(self.on_command, str(self.socket_dir / '.socket.sock')),
+        ]
+
+    async def stop(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        for name in ('.socket2.sock', '.socket.sock'):
+            (self.socket_dir / name).unlink(missing_ok=True)
+
+    async def on_event_client(self, reader, writer):
+        await self.connections.put(writer)
+
+    async def on_command(self, reader, writer):
+        command = (await reader.read(1024)).decode()
+        if self.hang:
+            await reader.read()  # never answers; returns once the client gives up
+            self.hung_closed.set()
+        elif command == 'j/configerrors':
+            errors = self.config_errors or ['']
+            writer.write(('[' + ','.join(f'"{error}"' for error in errors) + ']').encode())
+        await writer.drain()
+        writer.close()
+
+
+async def wait_for(alerts, text, timeout=5):
+    """True once an alert containing `text` has arrived"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        if any(text in alert for alert in alerts):
+            return True
+        await asyncio.sleep(0.02)
+    return False
+
+
+async def check_listener(socket_dir):
+    alerts = []
+
+    async def on_alert(batch):
+        alerts.extend(batch)
+
+    listener = HyprlandEventListener(on_alert, socket_dir=socket_dir, coalesce=0.1, max_backoff=0.5,
+                                     request_timeout=0.3)
+    runner = asyncio.create_task(listener.run())
+    checks = [('compositor down reported', await wait_for(alerts, 'Hyprland is not running'))]
+
+    hypr = StubHyprland(socket_dir)
+    await hypr.start()
+    try:
+        writer = await asyncio.wait_for(hypr.connections.get(), 5)
+        checks.append(('connected once the socket exists', listener.connected))
+
+        hypr.config_errors = ['config error at line 3']
+        writer.write(b'monitoradded>>DP-1\nconfigreloaded>>\nmonitorremoved>>DP-1\n')
+        await writer.drain()
+        checks += [
+            ('monitoradded alerted', await wait_for(alerts, 'Monitor added: DP-1')),
+            ('configreloaded reports the new error', await wait_for(alerts, 'Config error: config error at line 3')),
+            ('monitorremoved alerted', await wait_for(alerts, 'Monitor removed: DP-1')),
+        ]
+
+        writer.close()
+        checks.append(('socket close alerted', await wait_for(alerts, 'event socket closed')))
+        try:
+            writer = await asyncio.wait_for(hypr.connections.get(), 5)
+            reconnected = True
+        except asyncio.TimeoutError:
+            reconnected = False
+        checks.append(('reconnected after the socket closed', reconnected))
+
+        if reconnected:
+            writer.write(b'monitoradded>>HDMI-A-1\n')
+            await writer.drain()
+            checks.append(('events flow after reconnecting', await wait_for(alerts, 'Monitor added: HDMI-A-1')))
+            await asyncio.sleep(0.3)
+            repeats = sum('Config error' in alert for alert in alerts)
+            checks.append(('known config error not re-alerted on reconnect', repeats == 1))
+            writer.close()
+
+        hypr.hang = True
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            await listener.request('j/configerrors')
+            timed_out = False
+        except asyncio.TimeoutError:
+            timed_out = True
+        checks.append(('hung command socket times out', timed_out and loop.time() - start < 1))
+        try:
+            await asyncio.wait_for(hypr.hung_closed.wait(), 1)
+            closed = True
+        except asyncio.TimeoutError:
+            closed = False
+        checks.append(('timed out request closes its connection', closed))
+    finally:
+        runner.cancel()
+        try:
+            await runner
+        except asyncio.CancelledError:
+            pass
+        await hypr.stop()
+    checks.append(('one down alert for the outage', sum('not running' in alert for alert in alerts) == 1))
+    return checks, alerts
+
+
+def load_bot(home):
+    (home / '.config/hypr/logs').mkdir(parents=True)
+    os.environ['HOME'] = str(home)
+    spec = importlib.util.spec_from_file_location('hyprland_bot', HYPRLAND_BOT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.HyprlandMonitorBot()
+
+
+def check_bot_process_alerts(bot):
+    """The bot's process check must not repeat the listener's down alert"""
+    real = procfs.missing_processes
+    procfs.missing_processes = lambda names: list(names)  # nothing running, Hyprland included
+    try:
+        errors = bot.check_system_errors()
+    finally:
+        procfs.missing_processes = real
+    return [('bot leaves compositor down to the listener', not any('Hyprland' in error for error in errors))]
+
+
+async def check_bot_shutdown(bot):
+    """Stopping the bot must take its IPC and watchdog tasks down with it"""
+    async def quiet():
+        return None
+
+    bot.send_status_report = quiet
+    bot.check_system_errors = lambda: []
+    before = asyncio.all_tasks()
+    runner = asyncio.create_task(bot.run())
+    await asyncio.sleep(0.2)
+    started = len(asyncio.all_tasks() - before) > 1
+    runner.cancel()
+    try:
+        await runner
+    except asyncio.CancelledError:
+        pass
+    left = [task for task in asyncio.all_tasks() - before if not task.done()]
+    return [('bot cancels its background tasks on shutdown', started and not left)]
+
+
+async def main():
+    with tempfile.TemporaryDirectory(prefix='bench-hypr-') as tmp:
+        socket_dir = Path(tmp) / 'hypr/stub'
+        socket_dir.mkdir(parents=True)
+        checks, alerts = await check_listener(socket_dir)
+    bot = load_bot(Path(HOME.name))
+    checks += check_bot_process_alerts(bot)
+    checks += await check_bot_shutdown(bot)
+
+    failures = 0
+    for name, ok in checks:
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        failures += not ok
+    for alert in alerts:
+        print(f"     {alert}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
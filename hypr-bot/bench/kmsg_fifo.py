@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+/dev/kmsg reader check with a FIFO stand-in
+Points SystemMonitorBot's KmsgReader at a named pipe, writes kmsg-format
+records into it (noise, errors, an OOM kill, two sequence gaps, split and
+continuation lines, a writer reconnect) and checks what reaches the fake
+Telegram API. A journald copy of one kernel error is replayed through the
+journal source as well, to check it is deduplicated against the kmsg one.
+
+Usage:
+  kmsg_fifo.py
+Author: iceyxsm
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent))
+from fake_telegram import serve_in_thread  # noqa: E402
+from replay import SYSTEM_BOT, load_module, prepare_env  # noqa: E402
+from botcore import merge_sources  # noqa: E402
+
+IO_ERROR = 'blk_update_request: I/O error, dev nvme0n1, sector 2048 op 0x1:(WRITE) flags 0x800'
+OOM_CONTEXT = ('oom-kill:constraint=CONSTRAINT_MEMCG,nodemask=(null),cpuset=/,mems_allowed=0,'
+               'oom_memcg=/user.slice/user-1000.slice,'
+               'task_memcg=/user.slice/user-1000.slice/app-firefox.scope,task=firefox,pid=4242,uid=1000')
+OOM_KILL = ('Memory cgroup out of memory: Killed process 4242 (firefox) total-vm:9437184kB, '
+            'anon-rss:3145728kB, file-rss:65536kB, shmem-rss:1024kB, UID:1000 pgtables:8192kB oom_score_adj:0')
+
+
+def record(prio, seq, message):
+    return f"{prio},{seq},{seq * 1000},-;{message}\n".encode()
+
+
+def write_records(fifo, sent):
+    """Writer side of the FIFO; open() blocks until the bot is reading"""
+    with open(fifo, 'wb', buffering=0) as out:
+        out.write(record(6, 100, 'usb 1-2: new high-speed USB device number 7'))
+        sent['io_error'] = time.monotonic()
+        out.write(record(3, 101, IO_ERROR) + b' SUBSYSTEM=block\n DEVICE=b259:0\n')
+        out.write(record(6, 102, OOM_CONTEXT))
+        out.write(record(3, 103, OOM_KILL))
+        # seq 104-109 were overwritten before we read them
+        split = record(2, 110, 'mce: [Hardware Error]: Machine check events logged')
+        out.write(split[:20])
+        time.sleep(0.05)
+        out.write(split[20:])
+    time.sleep(0.2)
+    # The reader reopens once the writer goes away
+    with open(fifo, 'wb', buffering=0) as out:
+        out.write(record(3, 111, 'i915 0000:00:02.0: [drm] GPU HANG: ecode 12:1:85dffffb'))
+        # A second overrun: seq 112-114 lost
+        out.write(record(3, 115, 'nvme nvme0: I/O 17 QID 3 timeout, aborting'))
+
+
+async def journal_copy(delay):
+    """journald relaying the same kernel error a poll interval later"""
+    await asyncio.sleep(delay)
+    yield [json.dumps({'SYSLOG_IDENTIFIER': 'kernel', 'MESSAGE': IO_ERROR})]
+
+
+async def run(workdir, server):
+    fifo = workdir / 'kmsg'
+    os.mkfifo(fifo)
+    os.environ['KMSG_PATH'] = str(fifo)
+    bot = load_module('hypr_bot', SYSTEM_BOT).SystemMonitorBot()
+    bot.kmsg.reopen_delay = 0.05
+
+    sent = {}
+    writer = threading.Thread(target=write_records, args=(fifo, sent), daemon=True)
+    writer.start()
+    bot.pipeline = bot.build_pipeline(source=merge_sources(bot.kmsg_source(), journal_copy(1.0)))
+    sender = asyncio.create_task(bot.drain_spool())
+    runner = asyncio.create_task(bot.pipeline.run())
+    await asyncio.sleep(1.5)
+    bot.pipeline.stop()
+    await runner
+    await bot.spool_empty()
+    sender.cancel()
+    await bot.telegram.close()
+    bot.spool.close()
+    writer.join(timeout=1)
+    return bot, sent
+
+
+def check(server, bot, sent):
+    text = '\n'.join(m['text'] for m in server.messages)
+    failures = []
+    expectations = [
+        ('info record filtered', 'USB device' not in text),
+        ('error alerted', 'I/O error, dev nvme0n1' in text),
+        ('journald copy deduplicated', text.count('I/O error, dev nvme0n1') == 1),
+        ('continuation lines dropped', 'SUBSYSTEM=' not in text),
+        ('OOM victim and RSS', 'killed firefox (pid 4242), RSS 3137 MiB' in text),
+        ('OOM cgroup', 'app-firefox.scope' in text and 'CONSTRAINT_MEMCG' in text),
+        ('gap reported', '6 kernel log message(s) lost before seq 110' in text),
+        ('second gap not deduplicated', '3 kernel log message(s) lost before seq 115' in text),
+        ('split record reassembled', 'Machine check events logged' in text),
+        ('reopened after writer left', 'GPU HANG' in text),
+    ]
+    for name, ok in expectations:
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    stats = bot.kmsg.snapshot()
+    print(f"\nkmsg: {stats['records']} records, {stats['filtered']} filtered, {stats['lost']} lost")
+    first = next((m['time'] for m in server.messages if 'nvme0n1' in m['text']), None)
+    if first and 'io_error' in sent:
+        print(f"Kernel error -> alert: {(first - sent['io_error']) * 1000:.1f}ms "
+              f"(journal polling: up to {bot.poll_interval}s)")
+    return failures
+
+
+async def main():
+    server = serve_in_thread()
+    with tempfile.TemporaryDirectory(prefix='hypr-bot-kmsg-') as tmp:
+        prepare_env(Path(tmp), server.url)
+        bot, sent = await run(Path(tmp), server)
+    server.stop_thread()
+    failures = check(server, bot, sent)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
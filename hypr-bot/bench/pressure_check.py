@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Resource-pressure monitor check
+Arms a real CPU PSI trigger, oversubscribes the CPUs with busy processes
+and times how long the kernel takes to wake PressureMonitor (no polling
+involved). Then checks memory.events attribution against a fake cgroup
+tree: OOM kills in a nested app scope, in a service, and in a service
+whose cgroup is already gone.
+
+Usage:
+  pressure_check.py
+  pressure_check.py --stall 100 --busy 3
+Author: iceyxsm
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+from botcore import PressureMonitor  # noqa: E402
+
+
+def burn(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+async def check_psi(stall_ms, busy):
+    """Seconds from load start to the trigger's alert, or None"""
+    monitor = PressureMonitor([('cpu', 'some', stall_ms * 1000, 2000000)])
+    if not monitor.start():
+        return None, 'no PSI trigger could be armed (kernel without PSI or not permitted)'
+
+    workers = [multiprocessing.Process(target=burn, args=(6,)) for _ in range(os.cpu_count() * busy)]
+    start = time.monotonic()
+    for worker in workers:
+        worker.start()
+    events = monitor.events()
+    try:
+        errors = await asyncio.wait_for(events.__anext__(), 8)
+        took = time.monotonic() - start
+    except asyncio.TimeoutError:
+        errors, took = None, None
+    finally:
+        await events.aclose()
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+    return took, errors[0]['message'] if errors else 'trigger never fired'
+
+
+def write_events(path, **counters):
+    path.mkdir(parents=True, exist_ok=True)
+    fields = dict({'low': 0, 'high': 0, 'max': 0, 'oom': 0, 'oom_kill': 0, 'oom_group_kill': 0}, **counters)
+    (path / 'memory.events').write_text(''.join(f"{key} {value}\n" for key, value in fields.items()))
+
+
+def check_memory_events(root):
+    system = root / 'system.slice'
+    user = root / 'user.slice'
+    user_manager = user / 'user-1000.slice/user@1000.service'
+    firefox = user_manager / 'app.slice/app-firefox.scope'
+    for path in (system, user, user_manager, firefox, system / 'nginx.service', system / 'sshd.service'):
+        write_events(path)
+    write_events(system / 'batch-job.service')
+
+    monitor = PressureMonitor([], cgroup_root=str(root))
+    watched = monitor.snapshot_cgroups()
+
+    # firefox OOM-killed twice; nginx hit memory.max; batch-job killed and gone
+    write_events(firefox, oom=2, oom_kill=2)
+    write_events(user_manager, oom=2, oom_kill=2)
+    write_events(user / 'user-1000.slice', oom=2, oom_kill=2)
+    write_events(user, oom=2, oom_kill=2)
+    write_events(system / 'nginx.service', oom=3)
+    (system / 'batch-job.service/memory.events').unlink()
+    (system / 'batch-job.service').rmdir()
+    write_events(system, oom=4, oom_kill=1)
+
+    alerts = []
+    for path in watched:
+        alerts += monitor.on_memory_events(path)
+    again = sum(len(monitor.on_memory_events(path)) for path in watched)
+
+    by_unit = {alert['process']: alert['message'] for alert in alerts}
+    return [
+        ('slices watched', sorted(os.path.basename(p) for p in watched) == ['system.slice', 'user.slice']),
+        ('nested app scope attributed',
+         by_unit.get('app-firefox.scope', '').startswith('2 OOM kill(s), 2 allocation failure(s)')),
+        ('user manager not double-counted', 'user@1000.service' not in by_unit),
+        ('service at memory.max', by_unit.get('nginx.service', '').startswith('3 allocation failure(s)')),
+        ('vanished unit reported on slice', by_unit.get('system.slice', '').startswith('1 OOM kill(s)')),
+        ('idle sshd silent', 'sshd.service' not in by_unit),
+        ('no repeat without new events', again == 0),
+    ], alerts
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='PSI trigger and memory.events check')
+    parser.add_argument('--stall', type=int, default=150, help='cpu some stall ms per 2s window')
+    parser.add_argument('--busy', type=int, default=3, help='busy processes per CPU')
+    args = parser.parse_args()
+
+    failures = 0
+    took, detail = await check_psi(args.stall, args.busy)
+    if took is None and 'armed' in detail:
+        print(f"SKIP PSI trigger: {detail}")
+    elif took is None:
+        print(f"FAIL PSI trigger: {detail}")
+        failures += 1
+    else:
+        print(f"OK   PSI trigger woke the monitor {took * 1000:.0f}ms after load started")
+        print(f"     {detail}")
+
+    with tempfile.TemporaryDirectory(prefix='bench-cgroup-') as tmp:
+        checks, alerts = check_memory_events(Path(tmp))
+    for name, ok in checks:
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        failures += not ok
+    for alert in alerts:
+        print(f"     {alert['process']}: {alert['message']}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Offline replay / load-test harness for the monitor bots
+Replays journal JSON (recorded with `journalctl -o json` or synthetic)
+into SystemMonitorBot, or Hyprland log lines into HyprlandMonitorBot, at a
+fixed rate against a local fake Telegram API. No journal, token or network
+needed - everything lives in a temp dir.
+
+Usage:
+  replay.py system --rate 2000 --count 20000
+  replay.py system --journal recorded.json --delay 0.05
+  replay.py hyprland --rate 20 --count 300 --poll 1
+  journalctl -o json --since today > recorded.json   # record real input
+
+Reports throughput, end-to-end alert latency percentiles (inject -> fake
+API receipt), peak RSS and messages sent.
+Author: iceyxsm
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import resource
+import tempfile
+import importlib.util
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent.parent
+SYSTEM_BOT = REPO_DIR / 'hypr-bot/hypr-bot.py'
+HYPRLAND_BOT = REPO_DIR / '.config/hypr/scripts/telegram-error-bot.py'
+
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent))
+from fake_telegram import serve_in_thread  # noqa: E402
+from botcore import FileTailer  # noqa: E402
+
+MARKER = re.compile(r'\[replay:(\d+)\]')
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_journal(count, seed=1):
+    """Journal JSON entries: recurring errors, one-off errors and noise"""
+    rng = random.Random(seed)
+    recurring = [
+        ('kernel', 'nvidia-modeset: ERROR: GPU:0: Error while waiting for GPU progress'),
+        ('Hyprland', '[ERR] Failed to create EGL context'),
+        ('pipewire', 'spa.alsa: hw:0: snd_pcm_recover failed: Broken pipe'),
+    ]
+    noise = [
+        ('systemd', 'Started Session 4 of User ice.'),
+        ('NetworkManager', '<info> device (wlan0): state change: activated'),
+    ]
+    usec = int(time.time() * 1e6)
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.6:
+            process, message = rng.choice(recurring)
+        elif roll < 0.8:
+            process, message = 'app', f'Unable to open /tmp/cache-{i}.db: Permission denied'
+        else:
+            process, message = rng.choice(noise)
+        yield {
+            '__CURSOR': f's=replay;i={i:x}',
+            '__REALTIME_TIMESTAMP': str(usec + i),
+            'SYSLOG_IDENTIFIER': process,
+            'MESSAGE': message,
+        }
+
+
+def recorded_journal(path):
+    with open(path, errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('{'):
+                yield json.loads(line)
+
+
+def synthetic_hyprland_log(count, seed=1):
+    rng = random.Random(seed)
+    templates = [
+        '[ERR] Config error in file hyprland.conf at line {n}: invalid field',
+        '[ERR] [AQ] Failed to commit frame on output DP-{n}',
+        '[LOG] Workspace {n} created',
+        '[WARN] permission denied opening /dev/input/event{n}',
+    ]
+    for i in range(count):
+        yield rng.choice(templates).format(n=rng.randint(1, 9))
+
+
+def recorded_lines(path):
+    with open(path, errors='replace') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
+class LatencyTracker:
+    """Maps replay markers to injection times and fake-API receipt times"""
+    def __init__(self):
+        self.injected = {}
+        self.total = 0
+        self.latencies = []
+        self.messages = 0
+
+    def inject(self, seq):
+        self.injected[seq] = time.monotonic()
+        self.total += 1
+
+    def received(self, record):
+        self.messages += 1
+        for seq in MARKER.findall(record['text']):
+            sent = self.injected.pop(int(seq), None)
+            if sent is not None:
+                self.latencies.append(record['time'] - sent)
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def paced(items, rate, batch_interval):
+    """Yield lists of items so that `rate` items/s are released"""
+    per_batch = max(1, int(rate * batch_interval))
+    start = time.monotonic()
+    batch = []
+    released = 0
+    for item in items:
+        batch.append(item)
+        if len(batch) >= per_batch:
+            yield batch
+            released += len(batch)
+            batch = []
+            delay = start + released / rate - time.monotonic()
+            await asyncio.sleep(max(0, delay))
+    if batch:
+        yield batch
+
+
+def prepare_env(workdir, api_url):
+    """Point both bots at the temp dir and the fake API"""
+    os.environ.update({
+        'HOME': str(workdir),
+        'HYPR_BOT_LOG_DIR': str(workdir / 'log'),
+        'HYPR_BOT_DATA_DIR': str(workdir / 'data'),
+        'HYPR_BOT_CONFIG': str(workdir / 'system.env'),
+        'TELEGRAM_API_URL': api_url,
+    })
+    credentials = 'TELEGRAM_BOT_TOKEN=0:replay\nTELEGRAM_CHAT_ID=1\n'
+    (workdir / 'system.env').write_text(credentials)
+    (workdir / '.config/hypr/logs').mkdir(parents=True)
+    (workdir / '.config/hypr/scripts').mkdir(parents=True)
+    (workdir / '.config/hypr/scripts/.env').write_text(credentials)
+
+
+async def replay_system(args, tracker):
+    bot_module = load_module('hypr_bot', SYSTEM_BOT)
+    bot = bot_module.SystemMonitorBot()
+    entries = recorded_journal(args.journal) if args.journal else synthetic_journal(args.count)
+
+    def marked():
+        for seq, entry in enumerate(entries):
+            if args.count and seq >= args.count:
+                return
+            # Keep the marker past the 100 chars the bot fingerprints, so
+            # deduplication behaves as it would on the unmarked input
+            entry['MESSAGE'] = f"{entry.get('MESSAGE', '')}".ljust(100) + f" [replay:{seq}]"
+            tracker.inject(seq)
+            yield json.dumps(entry)
+
+    bot.pipeline = bot.build_pipeline(source=paced(marked(), args.rate, args.batch_interval))
+    start = time.monotonic()
+    sender = asyncio.create_task(bot.drain_spool())
+    await bot.pipeline.run()
+    await bot.spool_empty()
+    elapsed = time.monotonic() - start
+    sender.cancel()
+    await bot.telegram.close()
+    bot.spool.close()
+    bot.classifier.shutdown()
+    return elapsed, tracker.total, bot.format_metrics()
+
+
+async def replay_hyprland(args, tracker):
+    bot_module = load_module('hyprland_bot', HYPRLAND_BOT)
+    bot = bot_module.HyprlandMonitorBot()
+    bot.poll_interval = args.poll
+    bot.hyprland_log = Path(os.environ['HOME']) / '.hyprland/hyprland.log'
+    bot.hyprland_log.parent.mkdir(parents=True, exist_ok=True)
+    bot.hyprland_log.touch()
+    bot.tailer = FileTailer(bot.hyprland_log)
+    if not args.process_checks:
+        bot.check_system_errors = lambda: []
+
+    lines = recorded_lines(args.hypr_log) if args.hypr_log else synthetic_hyprland_log(args.count)
+    runner = asyncio.create_task(bot.run())
+    start = time.monotonic()
+    written = 0
+    with open(bot.hyprland_log, 'a') as log:
+        async for batch in paced(lines, args.rate, args.batch_interval):
+            for line in batch:
+                if args.count and written >= args.count:
+                    break
+                log.write(f"{line} [replay:{written}]\n")
+                tracker.inject(written)
+                written += 1
+            log.flush()
+    # Let the bot catch up with its poll cadence before stopping it
+    await asyncio.sleep(args.poll * 2)
+    elapsed = time.monotonic() - start
+    runner.cancel()
+    try:
+        await runner
+    except asyncio.CancelledError:
+        pass
+    return elapsed, written, ''
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Replay logs into the monitor bots')
+    parser.add_argument('bot', choices=['system', 'hyprland'])
+    parser.add_argument('--journal', help='journalctl -o json file to replay (system)')
+    parser.add_argument('--hypr-log', help='Hyprland log file to replay (hyprland)')
+    parser.add_argument('--count', type=int, default=5000, help='max entries to replay (0 = all)')
+    parser.add_argument('--rate', type=float, default=1000, help='entries per second')
+    parser.add_argument('--batch-interval', type=float, default=0.1, help='seconds between batches')
+    parser.add_argument('--poll', type=float, default=1.0, help='hyprland bot poll interval')
+    parser.add_argument('--delay', type=float, default=0.0, help='fake API latency per send')
+    parser.add_argument('--process-checks', action='store_true', help='keep process checks (hyprland)')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    tracker = LatencyTracker()
+    server = serve_in_thread(delay=args.delay, on_message=tracker.received)
+
+    with tempfile.TemporaryDirectory(prefix='hypr-bot-replay-') as tmp:
+        prepare_env(Path(tmp), server.url)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if args.bot == 'system':
+            elapsed, injected, metrics = await replay_system(args, tracker)
+        else:
+            elapsed, injected, metrics = await replay_hyprland(args, tracker)
+        rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    server.stop_thread()
+
+    lat = tracker.latencies
+    report = {
+        'bot': args.bot,
+        'entries': injected,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_per_s': round(injected / elapsed, 1) if elapsed else 0,
+        'messages_sent': tracker.messages,
+        'api_calls': server.calls,
+        'alerted_entries': len(lat),
+        'latency_ms': {
+            p: round(percentile(lat, int(p[1:])) * 1000, 2) for p in ('p50', 'p90', 'p99')
+        },
+        'latency_max_ms': round(max(lat) * 1000, 2) if lat else None,
+        'rss_peak_kb': rss_peak,
+        'rss_growth_kb': rss_peak - rss_before,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n=== {args.bot} bot replay ===")
+    print(f"Entries replayed : {injected} in {elapsed:.2f}s ({report['throughput_per_s']}/s)")
+    print(f"Messages sent    : {tracker.messages}  (API calls: {server.calls})")
+    print(f"Entries alerted  : {len(lat)}")
+    lat_ms = report['latency_ms']
+    print(f"Alert latency    : p50 {lat_ms['p50']}ms  p90 {lat_ms['p90']}ms  "
+          f"p99 {lat_ms['p99']}ms  max {report['latency_max_ms']}ms")
+    print(f"Peak RSS         : {rss_peak / 1024:.1f} MiB (+{report['rss_growth_kb'] / 1024:.1f} MiB)")
+    if metrics:
+        print(f"Pipeline:\n{metrics}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
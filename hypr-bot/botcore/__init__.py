@@ -0,0 +1,41 @@
+"""
+Shared monitoring core for hypr-bot and telegram-error-bot
+Both bots are thin configurations over these pieces, so fixes and
+benchmarks apply to every deployment at once. Stdlib only; aiohttp is
+optional and imported lazily by TelegramClient.
+Author: iceyxsm
+"""
+
+from .pipeline import STOP, StageMetrics, StageQueue, PipelineStage, Pipeline, merge_sources
+from .matcher import ERROR_PATTERNS, ErrorMatcher
+from .journal import fingerprint, parse_journal_json, classify_journal_line, classify_chunk, BatchClassifier
+from .formatter import AlertFormatter
+from .coredump import CrashEnricher, parse_coredump_message, fetch_coredump_entry
+from .kmsg import KmsgReader, kmsg_error, parse_oom_kill
+from .pressure import PressureMonitor, parse_psi, parse_memory_events
+from .spool import OutboundSpool
+from .httpclient import AsyncHTTPClient, HTTPError
+from .telegram import TelegramClient
+from .config import load_env_file, load_credentials
+from .dedup import DedupStore
+from .tailer import FileTailer
+from .hyprland import HyprlandEventListener
+from .watchdog import LoopWatchdog, sd_notify, watchdog_timeout
+from .logs import setup_logging, CompressingRotatingFileHandler, RateLimitFilter
+from .profile import StartupProfile, import_breakdown, importable
+from . import procfs
+
+__all__ = [
+    'STOP', 'StageMetrics', 'StageQueue', 'PipelineStage', 'Pipeline', 'merge_sources',
+    'ERROR_PATTERNS', 'ErrorMatcher',
+    'fingerprint', 'parse_journal_json', 'classify_journal_line', 'classify_chunk', 'BatchClassifier',
+    'AlertFormatter', 'CrashEnricher', 'parse_coredump_message', 'fetch_coredump_entry',
+    'KmsgReader', 'kmsg_error', 'parse_oom_kill',
+    'PressureMonitor', 'parse_psi', 'parse_memory_events',
+    'OutboundSpool', 'AsyncHTTPClient', 'HTTPError', 'TelegramClient',
+    'load_env_file', 'load_credentials',
+    'DedupStore', 'FileTailer', 'HyprlandEventListener',
+    'LoopWatchdog', 'sd_notify', 'watchdog_timeout',
+    'setup_logging', 'CompressingRotatingFileHandler', 'RateLimitFilter',
+    'StartupProfile', 'import_breakdown', 'importable', 'procfs',
+]
@@ -0,0 +1,53 @@
+"""
+Credential loading
+.env (KEY=VALUE) files with a legacy JSON fallback
+Author: iceyxsm
+"""
+
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def load_env_file(path):
+    """Read KEY=VALUE lines into os.environ; returns the keys found"""
+    values = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            values[key.strip()] = value.strip()
+    os.environ.update(values)
+    return values
+
+
+def load_credentials(env_file=None, json_file=None):
+    """Return (bot_token, chat_id), or (None, None) if neither file has them
+
+    env_file wins; json_file is the older {"bot_token", "chat_id"} format.
+    """
+    if env_file and os.path.exists(env_file):
+        try:
+            load_env_file(env_file)
+            token = os.environ.get('TELEGRAM_BOT_TOKEN')
+            chat_id = os.environ.get('TELEGRAM_CHAT_ID')
+            if token and chat_id:
+                logger.info(f"Config loaded from {env_file}")
+                return token, chat_id
+        except Exception as e:
+            logger.error(f"Error loading {env_file}: {e}")
+
+    if json_file and os.path.exists(json_file):
+        try:
+            with open(json_file) as f:
+                config = json.load(f)
+            logger.info(f"Config loaded from {json_file}")
+            return config.get('bot_token'), config.get('chat_id')
+        except Exception as e:
+            logger.error(f"Error loading {json_file}: {e}")
+
+    return None, None
@@ -0,0 +1,182 @@
+"""
+Crash enrichment from systemd-coredump metadata
+Turns "dumped core" journal entries into a compact crash summary
+Author: iceyxsm
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# MESSAGE_ID of systemd-coredump's "Process N (comm) ... dumped core" entries
+COREDUMP_MESSAGE_ID = 'fc2e22bc6ee647b6b90729ab34a250b1'
+
+CORE_RE = re.compile(r'Process (\d+) \((.*?)\) of user \d+ (?:dumped core|terminated abnormally)')
+MODULE_RE = re.compile(r'Module (\S+)(?: from .*?)? with build-id ([0-9a-f]{8,})')
+FRAME_RE = re.compile(r'^\s*#\d+\s+0x[0-9a-f]+\s+(.+?)\s*$', re.M)
+
+
+def executable_build_id(message, comm, exe=None):
+    """Build-id of the crashed executable among the report's modules
+
+    systemd-coredump lists modules in no particular order, and the vdso or
+    libc often come first, so the module is picked by name: COREDUMP_EXE's
+    file name when known, else comm (which the kernel cuts to 15 chars).
+    """
+    names = {os.path.basename(exe)} if exe else set()
+    for name, build_id in MODULE_RE.findall(message):
+        name = os.path.basename(name)
+        if name in names or name[:15] == comm[:15]:
+            return build_id
+    return None
+
+
+def parse_coredump_message(message, frames=3, exe=None):
+    """Pull pid, comm, build-id and top frames out of a coredump MESSAGE
+
+    Returns None for anything that isn't a systemd-coredump report.
+    build_id is the executable's (None if no module matches it).
+    """
+    match = CORE_RE.search(message)
+    if not match:
+        return None
+    # Only the crashing thread's stack (the first one listed)
+    first_stack = message.split('Stack trace of thread', 2)
+    stack = first_stack[1] if len(first_stack) > 1 else ''
+    return {
+        'pid': match.group(1),
+        'comm': match.group(2),
+        'build_id': executable_build_id(message, match.group(2), exe),
+        'frames': FRAME_RE.findall(stack)[:frames],
+    }
+
+
+async def fetch_coredump_entry(pid, timeout=5):
+    """Full journal entry (all COREDUMP_* fields) for a crashed pid"""
+    proc = await asyncio.create_subprocess_exec(
+        'journalctl', '--no-pager', '-o', 'json', '-n', '1',
+        f'MESSAGE_ID={COREDUMP_MESSAGE_ID}', f'COREDUMP_PID={pid}',
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    lines = stdout.decode(errors='replace').strip().splitlines()
+    return json.loads(lines[-1]) if lines else {}
+
+
+def field(entry, name):
+    value = entry.get(name)
+    if isinstance(value, list):
+        value = bytes(value).decode(errors='replace')
+    return value
+
+
+class CrashEnricher:
+    """Pipeline stage adding a crash summary to coredump alerts
+
+    Summaries are cached per (comm, executable build-id), read from the
+    alert's own message, so a repeat crash of the same binary needs no
+    journal lookup at all; failed lookups and alerts without a build-id
+    aren't cached. New crashes cost one journalctl query, capped by
+    `timeout` and by a budget of `budget` lookups per `window` seconds;
+    past that, alerts go out without the summary rather than holding up
+    the stage behind a crash storm.
+    """
+    def __init__(self, fetch=fetch_coredump_entry, cache_size=256, timeout=3.0,
+                 budget=10, window=60.0, clock=time.monotonic):
+        self.fetch = fetch
+        self.cache = OrderedDict()  # (comm, build-id) -> summary dict
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self.budget = budget
+        self.window = window
+        self.clock = clock
+        self.window_start = None
+        self.window_used = 0
+        self.fetched = 0
+        self.cached = 0
+        self.skipped = 0
+
+    def _take_budget(self):
+        now = self.clock()
+        if self.window_start is None or now - self.window_start >= self.window:
+            self.window_start = now
+            self.window_used = 0
+        if self.window_used >= self.budget:
+            return False
+        self.window_used += 1
+        return True
+
+    async def enrich(self, error):
+        info = error.get('coredump')
+        if not info:
+            return error
+
+        key = (info['comm'], info['build_id']) if info.get('build_id') else None
+        summary = self.cache.get(key) if key else None
+        if summary:
+            self.cached += 1
+            self.cache.move_to_end(key)
+        elif not self._take_budget():
+            self.skipped += 1
+            return error
+        else:
+            try:
+                entry = await asyncio.wait_for(self.fetch(info['pid']), self.timeout)
+            except Exception as e:
+                logger.warning(f"Coredump lookup for pid {info['pid']} failed: {e!r}")
+                entry = {}
+            self.fetched += 1
+            summary = self.summarize(entry, info)
+            # Stored under the key it is looked up by, and only when the
+            # journal answered: a failed lookup must not pin "unknown signal"
+            if key and entry:
+                self.cache[key] = summary
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+        summary['crashes'] = summary.get('crashes', 0) + 1
+        return dict(error, crash=self.format(summary))
+
+    def summarize(self, entry, info):
+        message = field(entry, 'MESSAGE') or ''
+        parsed = parse_coredump_message(message, exe=field(entry, 'COREDUMP_EXE')) or {}
+        signal = field(entry, 'COREDUMP_SIGNAL_NAME')
+        if not signal and field(entry, 'COREDUMP_SIGNAL'):
+            signal = f"signal {field(entry, 'COREDUMP_SIGNAL')}"
+        return {
+            'exe': field(entry, 'COREDUMP_EXE') or info['comm'],
+            'signal': signal or 'unknown signal',
+            'unit': field(entry, 'COREDUMP_UNIT') or field(entry, 'COREDUMP_USER_UNIT'),
+            'build_id': info.get('build_id') or parsed.get('build_id'),
+            'frames': info.get('frames') or parsed.get('frames') or [],
+        }
+
+    def format(self, summary):
+        """A few plain-text lines; the formatter escapes them"""
+        head = f"{summary['exe']} killed by {summary['signal']}"
+        if summary['unit']:
+            head += f" ({summary['unit']})"
+        lines = [head] + [f"  {frame}" for frame in summary['frames']]
+        tail = []
+        if summary['build_id']:
+            tail.append(f"build-id {summary['build_id'][:12]}")
+        if summary['crashes'] > 1:
+            tail.append(f"crash #{summary['crashes']} of this build")
+        if tail:
+            lines.append(', '.join(tail))
+        return '\n'.join(lines)
+
+    def snapshot(self):
+        return {'fetched': self.fetched, 'cached': self.cached, 'skipped': self.skipped}
@@ -0,0 +1,52 @@
+"""
+Bounded dedup store
+Constant-time "seen recently?" checks with size and age limits
+Author: iceyxsm
+"""
+
+import time
+from collections import OrderedDict
+
+
+class DedupStore:
+    """Remembers up to `maxsize` keys, each for at most `ttl` seconds
+
+    seen(key) returns True if the key was recorded and hasn't expired,
+    otherwise records it and returns False. Hits don't refresh a key, so
+    a recurring error is reported again once it ages out. ttl=None keeps
+    keys until they are evicted by size.
+    """
+    def __init__(self, maxsize=1000, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> time recorded, oldest first
+
+    def _expire(self, now):
+        if self.ttl is None:
+            return
+        while self.entries:
+            key, recorded = next(iter(self.entries.items()))
+            if now - recorded < self.ttl:
+                break
+            self.entries.popitem(last=False)
+
+    def seen(self, key):
+        now = self.clock()
+        self._expire(now)
+        if key in self.entries:
+            return True
+        self.entries[key] = now
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return False
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+    def __contains__(self, key):
+        self._expire(self.clock())
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
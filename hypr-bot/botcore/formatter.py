@@ -0,0 +1,111 @@
+"""
+Telegram alert formatting
+HTML-escaped, size-aware packing of alerts into messages
+Author: iceyxsm
+"""
+
+import html
+from collections import defaultdict
+
+
+class AlertFormatter:
+    """Packs alerts into as few Telegram messages as possible
+
+    Log text is HTML-escaped exactly once here, so a stray `<` can't make
+    Telegram reject the send. Lengths are measured after escaping and
+    clipped between source characters, so a cut never lands inside a tag
+    or an entity. Alerts are packed greedily into messages of at most
+    `limit` characters; one that can't fit a message on its own goes out
+    in full as a .txt document instead, and if a batch would need more
+    than `max_messages` messages, a short summary is sent with the whole
+    batch as the document.
+    """
+    LIMIT = 4096
+
+    def __init__(self, limit=LIMIT, alert_chars=1000, max_messages=3):
+        self.limit = limit
+        self.alert_chars = alert_chars
+        self.max_messages = max_messages
+
+    def clip(self, text, size):
+        """`text` HTML-escaped, at most `size` characters long once escaped"""
+        escaped = html.escape(text)
+        if len(escaped) <= size:
+            return escaped
+        pieces = []
+        used = 1  # the ellipsis
+        for char in text:
+            piece = html.escape(char)
+            if used + len(piece) > size:
+                break
+            pieces.append(piece)
+            used += len(piece)
+        return ''.join(pieces) + '…'
+
+    def format_alert(self, error, compact=False):
+        """One alert as escaped HTML"""
+        error_id = html.escape(error['id'])
+        process = html.escape(error['process'])
+        crash = error.get('crash')
+        # The crash summary replaces the raw stack trace in the message
+        text = error['message'].split('\n', 1)[0] if crash else error['message']
+        if compact:
+            # Multi-package mode
+            message = self.clip(text, 200)
+            if crash:
+                headline = crash.split('\n', 1)[0]
+                message += f" - {self.clip(headline, 200)}"
+            return f"<b>{error_id}</b> [{process}]: {message}"
+        message = self.clip(text, self.alert_chars)
+        block = f"🚨 <b>Error {error_id}</b>\n\n<b>Process:</b> <code>{process}</code>\n<b>Message:</b> {message}"
+        if crash:
+            block += f"\n<b>Crash:</b>\n<pre>{self.clip(crash, self.alert_chars)}</pre>"
+        return block
+
+    def format_plain(self, error):
+        line = f"{error['id']} [{error['process']}] {error['message']}"
+        if error.get('crash'):
+            line += '\n' + error['crash']
+        return line
+
+    def pack(self, errors, compact=False):
+        """Return (html_messages, text_document_or_None) for a batch of alerts"""
+        separator = '\n' if compact else '\n\n'
+        messages = []
+        oversized = []
+        current = ''
+        for error in errors:
+            block = self.format_alert(error, compact)
+            if len(block) > self.limit:
+                # Cutting it would leave unbalanced tags; send it whole as a file
+                oversized.append(error)
+                continue
+            if current and len(current) + len(separator) + len(block) > self.limit:
+                messages.append(current)
+                current = block
+            else:
+                current = f"{current}{separator}{block}" if current else block
+        if current:
+            messages.append(current)
+
+        if len(messages) <= self.max_messages:
+            if not oversized:
+                return messages, None
+            messages.append(f"🚨 <b>{len(oversized)} alert(s) too long for a message</b> - full text attached")
+            return messages, self.document(oversized)
+
+        return [self.summary(errors)], self.document(errors)
+
+    def document(self, errors):
+        return '\n'.join(self.format_plain(error) for error in errors) + '\n'
+
+    def summary(self, errors):
+        counts = defaultdict(int)
+        for error in errors:
+            counts[error['process']] += 1
+        lines = [f"🚨 <b>{len(errors)} errors</b> - full list attached\n"]
+        for process, count in sorted(counts.items(), key=lambda kv: -kv[1])[:20]:
+            lines.append(f"<code>{count:5}</code> | {self.clip(process, 100)}")
+        if len(counts) > 20:
+            lines.append(f"... and {len(counts) - 20} more processes")
+        return '\n'.join(lines)
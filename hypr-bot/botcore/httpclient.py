@@ -0,0 +1,174 @@
+"""
+Minimal asyncio HTTP/1.1 client
+Zero-dependency transport for the Bot API when aiohttp isn't installed
+Author: iceyxsm
+"""
+
+import os
+import json
+import asyncio
+import logging
+from urllib.parse import urlsplit, urlencode
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """The server closed or garbled a response"""
+
+
+class AsyncHTTPClient:
+    """Keep-alive HTTP/1.1 over one connection per client
+
+    Requests are serialized on a single connection (TLS via ssl when the
+    base URL is https), which is reopened transparently if the server
+    closed it while idle. Bodies go over the socket, never into argv.
+    ca_file adds a trusted CA, e.g. for a self-signed test server.
+    """
+    def __init__(self, base_url, timeout=10, ca_file=None):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'https'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.scheme == 'https' else 80)
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.ca_file = ca_file
+        self.reader = None
+        self.writer = None
+        self.lock = asyncio.Lock()
+        self.connections = 0
+        self.requests = 0
+
+    def _ssl_context(self):
+        if self.scheme != 'https':
+            return None
+        import ssl
+        context = ssl.create_default_context()
+        if self.ca_file:
+            context.load_verify_locations(self.ca_file)
+        return context
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self._ssl_context(),
+            server_hostname=self.host if self.scheme == 'https' else None
+        )
+        self.connections += 1
+
+    def _drop(self):
+        if self.writer:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def close(self):
+        writer = self.writer
+        self._drop()
+        if writer:
+            try:
+                await writer.wait_closed()
+            except (OSError, ConnectionError):
+                pass
+
+    async def request(self, method, path, body=b'', headers=None):
+        """Send one request; returns (status, body bytes)"""
+        async with self.lock:
+            return await asyncio.wait_for(self._request(method, path, body, headers or {}), self.timeout)
+
+    async def _request(self, method, path, body, headers):
+        head = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host}",
+                "Connection: keep-alive", f"Content-Length: {len(body)}"]
+        head += [f"{key}: {value}" for key, value in headers.items()]
+        data = ('\r\n'.join(head) + '\r\n\r\n').encode() + body
+
+        try:
+            return await self._exchange(data)
+        except BaseException:
+            # Timed out, cancelled or broken mid-response - the stream is unusable
+            self._drop()
+            raise
+
+    async def _send(self, data):
+        if self.writer is None:
+            await self._connect()
+        self.writer.write(data)
+        await self.writer.drain()
+        return await self.reader.readline()
+
+    async def _exchange(self, data):
+        reused = self.writer is not None
+        try:
+            status_line = await self._send(data)
+            if not status_line and reused:
+                raise ConnectionResetError("idle connection closed by server")
+        except (OSError, ConnectionError):
+            if not reused:
+                raise
+            # Keep-alive connection went stale before answering, so resend
+            self._drop()
+            status_line = await self._send(data)
+        return await self._read_response(status_line)
+
+    async def _read_response(self, status_line):
+        parts = status_line.decode('latin-1').split(' ', 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise HTTPError(f"bad status line: {status_line!r}")
+        status = int(parts[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n'):
+                break
+            if not line:
+                raise HTTPError("connection closed in headers")
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._read_chunked()
+        elif 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            body = await self.reader.read()
+            headers['connection'] = 'close'
+
+        self.requests += 1
+        if headers.get('connection', '').lower() == 'close':
+            self._drop()
+        return status, body
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                # Skip trailers up to the blank line
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+    async def get(self, path, params=None):
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        return await self.request('GET', path)
+
+    async def post_json(self, path, payload):
+        body = json.dumps(payload).encode()
+        return await self.request('POST', path, body, {'Content-Type': 'application/json'})
+
+    async def post_multipart(self, path, fields, files):
+        """fields: {name: value}; files: {name: (filename, bytes, content_type)}"""
+        boundary = os.urandom(16).hex()
+        parts = []
+        for name, value in fields.items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+                         + str(value).encode() + b'\r\n')
+        for name, (filename, content, content_type) in files.items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+                         f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n'.encode()
+                         + content + b'\r\n')
+        body = b''.join(parts) + f'--{boundary}--\r\n'.encode()
+        return await self.request('POST', path, body,
+                                  {'Content-Type': f'multipart/form-data; boundary={boundary}'})
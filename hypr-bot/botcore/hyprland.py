@@ -0,0 +1,162 @@
+"""
+Hyprland IPC listener
+Streams compositor events from .socket2.sock and queries .socket.sock
+Author: iceyxsm
+"""
+
+import os
+import json
+import asyncio
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class HyprlandEventListener:
+    """Streams Hyprland's event socket (.socket2.sock) instead of polling hyprctl
+
+    Events arrive as `EVENT>>DATA` lines. Alerts produced within `coalesce`
+    seconds of each other are handed to on_alert as a single list, so a
+    flapping monitor or a reload storm becomes one message. If the socket
+    closes (Hyprland exited or crashed) it reconnects with backoff.
+    Command socket requests give up after `request_timeout` seconds.
+    """
+    def __init__(self, on_alert, socket_dir=None, coalesce=2.0, max_backoff=30, request_timeout=2.0):
+        self.on_alert = on_alert
+        self.socket_dir = Path(socket_dir) if socket_dir else None
+        self.coalesce = coalesce
+        self.max_backoff = max_backoff
+        self.request_timeout = request_timeout
+        self.connected = False
+        self.down_alerted = False
+        self.config_errors = set()
+        self.pending = []
+        self.flush_task = None
+        self.events_seen = 0
+    
+    def find_socket_dir(self):
+        """Locate $XDG_RUNTIME_DIR/hypr/<signature> (or the legacy /tmp/hypr)"""
+        if self.socket_dir:
+            return self.socket_dir
+        
+        runtime = Path(os.environ.get('XDG_RUNTIME_DIR', f'/run/user/{os.getuid()}'))
+        signature = os.environ.get('HYPRLAND_INSTANCE_SIGNATURE')
+        roots = [runtime / 'hypr', Path('/tmp/hypr')]
+        
+        if signature:
+            for root in roots:
+                if (root / signature / '.socket2.sock').exists():
+                    return root / signature
+        
+        # Started outside the session env - take the newest running instance
+        candidates = [
+            sock.parent for root in roots if root.is_dir()
+            for sock in root.glob('*/.socket2.sock')
+        ]
+        if candidates:
+            return max(candidates, key=lambda d: d.stat().st_mtime)
+        return None
+    
+    async def request(self, command):
+        """One-shot request on the command socket (.socket.sock), no hyprctl fork
+
+        Each step is capped at request_timeout, so a compositor that hangs
+        mid-reply raises asyncio.TimeoutError instead of stalling the caller.
+        """
+        socket_dir = self.find_socket_dir()
+        if not socket_dir:
+            return None
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(str(socket_dir / '.socket.sock')), self.request_timeout)
+        try:
+            writer.write(command.encode())
+            await asyncio.wait_for(writer.drain(), self.request_timeout)
+            return (await asyncio.wait_for(reader.read(), self.request_timeout)).decode(errors='replace')
+        finally:
+            writer.close()
+    
+    def alert(self, text):
+        self.pending.append(text)
+        if not self.flush_task or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self.flush_later())
+    
+    async def flush_later(self):
+        await asyncio.sleep(self.coalesce)
+        alerts, self.pending = list(dict.fromkeys(self.pending)), []
+        if alerts:
+            try:
+                await self.on_alert(alerts)
+            except Exception as e:
+                logger.error(f"IPC alert error: {e}")
+    
+    async def handle_event(self, name, data):
+        """React to a single socket2 event"""
+        self.events_seen += 1
+        if name == 'configreloaded':
+            await self.check_config_errors()
+        elif name == 'monitorremoved':
+            self.alert(f"🖥️ Monitor removed: {data}")
+        elif name == 'monitoradded':
+            self.alert(f"🖥️ Monitor added: {data}")
+    
+    async def check_config_errors(self):
+        try:
+            reply = await self.request('j/configerrors')
+            errors = [e for e in json.loads(reply or '[]') if e.strip()]
+        except Exception as e:
+            logger.error(f"configerrors request failed: {e!r}")
+            return
+        # Only report errors that weren't already there before the reload
+        current = {error.strip() for error in errors}
+        for error in sorted(current - self.config_errors):
+            self.alert(f"⚙️ Config error: {error}")
+        self.config_errors = current
+    
+    async def run(self):
+        """Listen until cancelled; an alert batch still coalescing is dropped"""
+        try:
+            await self.listen()
+        finally:
+            if self.flush_task:
+                self.flush_task.cancel()
+    
+    async def listen(self):
+        backoff = 1
+        while True:
+            socket_dir = self.find_socket_dir()
+            try:
+                if not socket_dir:
+                    raise FileNotFoundError("no Hyprland instance socket")
+                reader, writer = await asyncio.open_unix_connection(str(socket_dir / '.socket2.sock'))
+            except OSError as e:
+                if not self.down_alerted:
+                    logger.warning(f"Hyprland IPC unavailable ({e}), retrying")
+                    self.alert("⚠️ Hyprland is not running!")
+                    self.down_alerted = True
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            
+            logger.info(f"Connected to Hyprland IPC at {socket_dir}")
+            self.connected = True
+            self.down_alerted = False
+            backoff = 1
+            # A reload may have happened while we were disconnected
+            await self.check_config_errors()
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    name, _, data = line.decode(errors='replace').rstrip('\n').partition('>>')
+                    await self.handle_event(name, data)
+            except (ConnectionError, OSError) as e:
+                logger.error(f"Hyprland IPC read error: {e}")
+            finally:
+                writer.close()
+            
+            self.connected = False
+            self.down_alerted = True
+            self.alert("🚨 Hyprland event socket closed - compositor exited or crashed!")
+            await asyncio.sleep(backoff)
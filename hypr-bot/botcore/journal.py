@@ -0,0 +1,139 @@
+"""
+Journal entry classification
+Parses journalctl lines (JSON or short format) into error dicts
+Author: iceyxsm
+"""
+
+import json
+import asyncio
+import hashlib
+import logging
+
+from .coredump import parse_coredump_message
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(error_text):
+    """Short stable ID for an error (first 100 chars hashed)"""
+    return hashlib.md5(error_text[:100].encode()).hexdigest()[:8].upper()
+
+
+def parse_journal_json(line):
+    """Pull (process, message) out of a journalctl -o json entry"""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None, None
+    message = entry.get('MESSAGE')
+    # Non-UTF-8 messages are exported as a list of byte values
+    if isinstance(message, list):
+        message = bytes(message).decode(errors='replace')
+    process = entry.get('SYSLOG_IDENTIFIER') or entry.get('_COMM') or 'system'
+    return process, message
+
+
+def classify_journal_line(line, matcher):
+    """Turn a journal line into an error dict, or None if it isn't one"""
+    if not line or line.startswith('--'):
+        return None
+    
+    if line.startswith('{'):
+        process, message = parse_journal_json(line)
+        if not message or not matcher.search(message):
+            return None
+        error = {
+            'process': process,
+            'message': message,
+            'raw': line,
+            'fingerprint': fingerprint(f"{process}: {message}")
+        }
+        if 'of user' in message:
+            # systemd-coredump report; CrashEnricher adds the details later
+            coredump = parse_coredump_message(message)
+            if coredump:
+                error['coredump'] = coredump
+        return error
+    
+    # Parse short-format log line
+    # Format: Mon DD HH:MM:SS hostname process[pid]: message
+    if ':' not in line:
+        return None
+    parts = line.split(':', 2)
+    if len(parts) < 3:
+        return None
+    
+    process_part = parts[1].strip()
+    message = parts[2].strip()
+    
+    # Check if it's an error
+    if not matcher.search(message):
+        return None
+    
+    # Extract process name
+    process = process_part.split('[')[0].strip()
+    if not process:
+        process = 'system'
+    
+    return {
+        'process': process,
+        'message': message,
+        'raw': line,
+        'fingerprint': fingerprint(f"{process}: {message}")
+    }
+
+
+def classify_chunk(lines, matcher):
+    """Classify a list of lines; module-level so worker processes can run it"""
+    errors = []
+    for line in lines:
+        error = classify_journal_line(line, matcher)
+        if error:
+            errors.append(error)
+    return errors
+
+
+class BatchClassifier:
+    """Classifies line batches in-process, or across a process pool for bursts
+
+    Batches smaller than threshold are handled inline since pickling them
+    to a worker costs more than matching them. Larger batches are split
+    into chunk_size pieces; results come back in the original line order.
+    workers=0 disables the pool entirely.
+    """
+    def __init__(self, matcher, workers=0, threshold=5000, chunk_size=2000):
+        self.matcher = matcher
+        self.workers = workers
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self.pool = None
+        self.pooled_batches = 0
+        self.inline_batches = 0
+
+    def _get_pool(self):
+        if self.pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            logger.info(f"Classification pool started with {self.workers} workers")
+        return self.pool
+
+    async def classify(self, lines):
+        if not self.workers or len(lines) < self.threshold:
+            self.inline_batches += 1
+            return classify_chunk(lines, self.matcher)
+        
+        self.pooled_batches += 1
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        chunks = [lines[i:i + self.chunk_size] for i in range(0, len(lines), self.chunk_size)]
+        # gather() keeps submission order, so reassembly is a plain concat
+        results = await asyncio.gather(*[
+            loop.run_in_executor(pool, classify_chunk, chunk, self.matcher)
+            for chunk in chunks
+        ])
+        return [error for chunk_errors in results for error in chunk_errors]
+
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
@@ -0,0 +1,229 @@
+"""
+Kernel log reader
+Streams /dev/kmsg directly instead of waiting for journald to relay it
+Author: iceyxsm
+"""
+
+import os
+import re
+import errno
+import asyncio
+import logging
+
+from .journal import fingerprint
+
+logger = logging.getLogger(__name__)
+
+KMSG_LEVELS = ('emerg', 'alert', 'crit', 'err', 'warning', 'notice', 'info', 'debug')
+
+OOM_KILL_RE = re.compile(
+    r'(?:Memory cgroup out of memory|Out of memory): Killed process (\d+) \((.*?)\) '
+    r'total-vm:(\d+)kB, anon-rss:(\d+)kB, file-rss:(\d+)kB, shmem-rss:(\d+)kB'
+)
+
+
+def parse_oom_context(message):
+    """Fields of an `oom-kill:constraint=...,task=...,pid=...` line"""
+    fields = {}
+    for part in message[len('oom-kill:'):].split(','):
+        key, _, value = part.partition('=')
+        if value:
+            fields[key] = value
+    return fields
+
+
+def parse_oom_kill(message, context=None):
+    """Structured OOM kill from the "Killed process" line, or None
+
+    context is the preceding oom-kill: line (logged at info level, so it
+    is kept aside even when info records are filtered out); it supplies
+    the cgroup and constraint when it names the same pid.
+    """
+    match = OOM_KILL_RE.search(message)
+    if not match:
+        return None
+    pid, victim, total_vm, anon, file_rss, shmem = match.groups()
+    oom = {
+        'pid': int(pid),
+        'victim': victim,
+        'rss_kb': int(anon) + int(file_rss) + int(shmem),
+        'total_vm_kb': int(total_vm),
+        'cgroup': None,
+        'constraint': None,
+        'memcg_oom': message.startswith('Memory cgroup'),
+    }
+    if context and context.get('pid') == pid:
+        oom['cgroup'] = context.get('task_memcg') or context.get('oom_memcg')
+        oom['constraint'] = context.get('constraint')
+    return oom
+
+
+def format_oom(oom):
+    rss_mib = oom['rss_kb'] / 1024
+    text = f"OOM killer: killed {oom['victim']} (pid {oom['pid']}), RSS {rss_mib:.0f} MiB"
+    if oom['cgroup']:
+        text += f", cgroup {oom['cgroup']}"
+    if oom['constraint'] and oom['constraint'] != 'CONSTRAINT_NONE':
+        text += f" [{oom['constraint']}]"
+    return text
+
+
+def kmsg_error(record):
+    """Error dict for the alert pipeline, shaped like a classified journal line
+
+    The fingerprint uses the raw kernel text, the same way journald's
+    relayed copy of the message is fingerprinted, so dedupe drops the
+    journal duplicate that arrives later.
+    """
+    message = record['message']
+    key = f"kernel: {record['message']}"
+    if record.get('gap'):
+        message = f"{record['gap']} kernel log message(s) lost before seq {record['seq']} (ring buffer overrun)"
+        # Gap records have no text of their own; each overrun is its own alert
+        key = f"kernel: {message}"
+    elif record.get('oom'):
+        message = format_oom(record['oom'])
+    return {
+        'process': 'kernel',
+        'message': message,
+        'raw': record['message'],
+        'fingerprint': fingerprint(key),
+        'level': KMSG_LEVELS[record['level']],
+        'oom': record.get('oom'),
+    }
+
+
+class KmsgReader:
+    """Async reader of /dev/kmsg records at or above a syslog level
+
+    Records look like `prio,seq,usec,flags;message` (plus indented
+    key=value continuation lines, which are ignored). Records above
+    `max_level` are dropped after parsing only the header. Sequence
+    numbers are tracked, and a jump (the ring buffer overwrote records
+    before we read them) becomes a synthetic gap record.
+
+    Any file that yields the same format works as `path`; a FIFO is
+    reopened whenever its writer goes away.
+    """
+    def __init__(self, path='/dev/kmsg', max_level=3, from_end=True, reopen_delay=1.0,
+                 max_reads=512):
+        self.path = path
+        self.max_level = max_level
+        self.from_end = from_end
+        self.reopen_delay = reopen_delay
+        self.max_reads = max_reads
+        self.next_seq = None
+        self.buffer = b''
+        self.oom_context = None
+        self.records = 0
+        self.filtered = 0
+        self.lost = 0
+
+    def parse(self, line):
+        """Record dict for one header line, or None if filtered out"""
+        header, sep, message = line.partition(';')
+        if not sep:
+            return None
+        fields = header.split(',', 4)
+        try:
+            prio, seq = int(fields[0]), int(fields[1])
+        except (ValueError, IndexError):
+            return None
+        level = prio & 7
+        self.records += 1
+
+        gap = 0
+        if self.next_seq is not None and seq > self.next_seq:
+            gap = seq - self.next_seq
+            self.lost += gap
+        self.next_seq = seq + 1
+
+        if message.startswith('oom-kill:'):
+            self.oom_context = parse_oom_context(message)
+        if level > self.max_level:
+            self.filtered += 1
+            # Still report the gap even if this record itself is filtered
+            return {'seq': seq, 'level': 3, 'message': '', 'gap': gap} if gap else None
+
+        record = {'seq': seq, 'level': level, 'message': message}
+        if gap:
+            record['gap'] = gap
+        if 'Killed process' in message:
+            record['oom'] = parse_oom_kill(message, self.oom_context)
+        return record
+
+    def feed(self, data):
+        """Parse a chunk of raw bytes into records; partial lines are held"""
+        self.buffer += data
+        lines = self.buffer.split(b'\n')
+        self.buffer = lines.pop()
+        records = []
+        for raw in lines:
+            if not raw or raw.startswith(b' '):
+                continue  # continuation (dictionary) line
+            line = raw.decode(errors='replace')
+            record = self.parse(line)
+            if record:
+                if record.get('gap') and record['message']:
+                    # Report the gap and the record that revealed it separately
+                    records.append({'seq': record['seq'], 'level': 3, 'message': '', 'gap': record.pop('gap')})
+                records.append(record)
+        return records
+
+    def _open(self):
+        fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.from_end:
+            try:
+                # Only records logged from now on; the journal has the history
+                os.lseek(fd, 0, os.SEEK_END)
+            except OSError:
+                pass  # FIFOs can't seek
+        return fd
+
+    def _drain(self, fd):
+        """Read what's available; returns (records, eof)"""
+        records = []
+        for _ in range(self.max_reads):
+            try:
+                data = os.read(fd, 8192)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EPIPE:
+                    continue  # records overwritten; the seq jump reports it
+                raise
+            if not data:
+                return records, True
+            records += self.feed(data)
+        return records, False
+
+    async def batches(self):
+        """Yield lists of records as they arrive"""
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        while True:
+            try:
+                fd = self._open()
+            except OSError as e:
+                logger.warning(f"Cannot open {self.path}: {e}")
+                await asyncio.sleep(self.reopen_delay * 30)
+                continue
+
+            loop.add_reader(fd, readable.set)
+            try:
+                while True:
+                    await readable.wait()
+                    readable.clear()
+                    records, eof = self._drain(fd)
+                    if records:
+                        yield records
+                    if eof:
+                        break
+            finally:
+                loop.remove_reader(fd)
+                os.close(fd)
+            self.buffer = b''
+            await asyncio.sleep(self.reopen_delay)
+
+    def snapshot(self):
+        return {'records': self.records, 'filtered': self.filtered, 'lost': self.lost}
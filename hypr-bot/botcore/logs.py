@@ -0,0 +1,132 @@
+"""
+Non-blocking logging setup
+QueueHandler on the hot path, file/console I/O on a listener thread
+Author: iceyxsm
+"""
+
+import os
+import sys
+import gzip
+import time
+import queue
+import shutil
+import atexit
+import logging
+import logging.handlers
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-based rotation; rotated files are gzipped (bot.log.1.gz, ...)
+
+    Rotation runs on the listener thread, so compression never touches
+    the event loop.
+    """
+    def __init__(self, filename, max_bytes=5 << 20, backups=5):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backups, delay=True)
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self.compress
+
+    @staticmethod
+    def compress(source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets at most `burst` identical records through per `window` seconds
+
+    Identical means same logger, level and message text. Once a window
+    has passed, the next matching record goes out with a note saying how
+    many copies were held back.
+    """
+    def __init__(self, burst=5, window=60.0, max_keys=1024, clock=time.monotonic):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.max_keys = max_keys
+        self.clock = clock
+        self.counters = {}  # key -> [window start, passed, suppressed]
+        self.suppressed = 0
+
+    def filter(self, record):
+        now = self.clock()
+        key = (record.name, record.levelno, record.getMessage())
+        counter = self.counters.get(key)
+        if counter is None or now - counter[0] >= self.window:
+            if len(self.counters) >= self.max_keys:
+                self._prune(now)
+            held = counter[2] if counter else 0
+            self.counters[key] = [now, 1, 0]
+            if held:
+                record.msg = f"{record.getMessage()} ({held} similar messages suppressed)"
+                record.args = None
+            return True
+        if counter[1] < self.burst:
+            counter[1] += 1
+            return True
+        counter[2] += 1
+        self.suppressed += 1
+        return False
+
+    def _prune(self, now):
+        expired = [key for key, (start, _, _) in self.counters.items() if now - start >= self.window]
+        for key in expired:
+            del self.counters[key]
+        if len(self.counters) >= self.max_keys:
+            self.counters.clear()
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a listener in the same process
+
+    The stock prepare() formats every record on the calling thread so it
+    can be pickled; here the listener's handlers do the formatting, and
+    the caller only pays for the queue put.
+    """
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def setup_logging(log_file=None, level=logging.INFO, stream=sys.stdout,
+                  max_bytes=5 << 20, backups=5, burst=5, window=60.0):
+    """Route all logging through a queue to a background listener thread
+
+    Logging calls only format the record and put it on a queue; the
+    rotating file and console writes happen on the listener thread.
+    Returns the started QueueListener (stopped and flushed at exit).
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    if log_file:
+        handlers.append(CompressingRotatingFileHandler(log_file, max_bytes, backups))
+    if stream:
+        handlers.append(logging.StreamHandler(stream))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(records)
+    queue_handler.addFilter(RateLimitFilter(burst, window))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
+
+
+def stop_listener(listener):
+    """Flush queued records and stop the listener thread (safe to call twice)"""
+    if listener._thread is not None:
+        listener.stop()
@@ -0,0 +1,279 @@
+"""
+Pipeline stages connected by bounded asyncio queues
+Backpressure policies, per-stage metrics and graceful drain
+Author: iceyxsm
+"""
+
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Marks the end of the stream; pushed through every stage on shutdown
+STOP = object()
+
+
+class StageMetrics:
+    """Counters for a single pipeline stage"""
+    def __init__(self, name):
+        self.name = name
+        self.received = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.max_time = 0.0
+
+    def snapshot(self):
+        avg = self.busy_time / self.received if self.received else 0.0
+        return {
+            'received': self.received,
+            'emitted': self.emitted,
+            'errors': self.errors,
+            'avg_ms': round(avg * 1000, 2),
+            'max_ms': round(self.max_time * 1000, 2),
+        }
+
+
+class StageQueue:
+    """Bounded asyncio queue with an overflow policy
+
+    Policies:
+      block       - producer waits for room (backpressure)
+      drop-oldest - discard the oldest queued item to make room
+      summarize   - discard the new item and count it; the consumer gets a
+                    single summary item once the queue has drained
+
+    Summarized items are kept as a count plus one sample per fingerprint
+    (at most `max_groups` of them; the rest share one catch-all group),
+    so a storm costs bounded memory. summarize(groups) gets a list of
+    (count, sample) pairs and returns the summary item.
+    """
+    POLICIES = ('block', 'drop-oldest', 'summarize')
+
+    def __init__(self, name, maxsize=100, policy='block', summarize=None, batch=0, max_groups=256):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.name = name
+        self.queue = asyncio.Queue(maxsize)
+        self.policy = policy
+        self.summarize = summarize
+        self.batch = batch
+        self.dropped = 0
+        self.high_water = 0
+        self.max_groups = max_groups
+        self.suppressed = {}  # fingerprint -> [count, sample]
+        self.held_stop = False
+
+    def qsize(self):
+        return self.queue.qsize()
+
+    async def put(self, item):
+        if item is STOP or self.policy == 'block' or not self.queue.full():
+            await self.queue.put(item)
+        elif self.policy == 'drop-oldest':
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+            self.queue.put_nowait(item)
+        else:
+            self.dropped += 1
+            self._suppress(item)
+        self.high_water = max(self.high_water, self.queue.qsize())
+
+    async def get(self):
+        if self.held_stop:
+            return STOP
+        # Summary goes out once the burst has drained, ahead of the stop marker
+        if self.suppressed and self.queue.empty():
+            return self._flush_summary()
+        item = await self.queue.get()
+        self.queue.task_done()
+        if item is STOP and self.suppressed:
+            self.queue.put_nowait(STOP)
+            return self._flush_summary()
+        return item
+
+    async def get_batch(self, max_items):
+        """Wait for one item, then take whatever else is already queued"""
+        item = await self.get()
+        if item is STOP:
+            return STOP
+        items = [item]
+        while len(items) < max_items and not self.queue.empty():
+            item = self.queue.get_nowait()
+            self.queue.task_done()
+            if item is STOP:
+                # Hand out what we have; the next get() ends the stage
+                self.held_stop = True
+                break
+            items.append(item)
+        return items
+
+    def _suppress(self, item):
+        key = item.get('fingerprint') if isinstance(item, dict) else None
+        if key not in self.suppressed and len(self.suppressed) >= self.max_groups:
+            key = None  # catch-all group
+        group = self.suppressed.get(key)
+        if group:
+            group[0] += 1
+        else:
+            self.suppressed[key] = [1, item]
+
+    def _flush_summary(self):
+        groups, self.suppressed = list(self.suppressed.values()), {}
+        if self.summarize:
+            return self.summarize([tuple(group) for group in groups])
+        return groups[-1][1]
+
+    def snapshot(self):
+        return {
+            'size': self.queue.qsize(),
+            'maxsize': self.queue.maxsize,
+            'high_water': self.high_water,
+            'dropped': self.dropped,
+            'policy': self.policy,
+        }
+
+
+class PipelineStage:
+    """Runs handler(item) for every item in inbox and forwards the results
+
+    The handler may be sync or async and returns None (item consumed),
+    a single item, or a list of items for the outbox. If the inbox has a
+    batch size, the handler gets a list of up to that many queued items.
+    """
+    def __init__(self, name, handler, inbox, outbox=None):
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self.metrics = StageMetrics(name)
+
+    async def run(self):
+        while True:
+            if self.inbox.batch:
+                item = await self.inbox.get_batch(self.inbox.batch)
+            else:
+                item = await self.inbox.get()
+            if item is STOP:
+                if self.outbox:
+                    await self.outbox.put(STOP)
+                return
+
+            self.metrics.received += len(item) if self.inbox.batch else 1
+            start = time.monotonic()
+            try:
+                result = self.handler(item)
+                if asyncio.iscoroutine(result):
+                    result = await result
+            except Exception as e:
+                self.metrics.errors += 1
+                logger.error(f"Stage {self.name} error: {e}")
+                continue
+            finally:
+                elapsed = time.monotonic() - start
+                self.metrics.busy_time += elapsed
+                self.metrics.max_time = max(self.metrics.max_time, elapsed)
+
+            if result is None:
+                continue
+            results = result if isinstance(result, list) else [result]
+            self.metrics.emitted += len(results)
+            if self.outbox:
+                for out in results:
+                    await self.outbox.put(out)
+
+
+class Pipeline:
+    """Source feeding a chain of stages connected by bounded queues
+
+    source is an async iterator of items for the first stage. stages is a
+    list of (name, handler, StageQueue) tuples, where the queue is the
+    stage's inbox. Calling stop() ends ingestion; every item already
+    queued is still processed before run() returns.
+    """
+    def __init__(self, source, stages):
+        self.source = source
+        self.stages = []
+        for i, (name, handler, inbox) in enumerate(stages):
+            outbox = stages[i + 1][2] if i + 1 < len(stages) else None
+            self.stages.append(PipelineStage(name, handler, inbox, outbox))
+        self.ingested = 0
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        if not self._stopping.is_set():
+            logger.info("Pipeline stopping - draining queues...")
+            self._stopping.set()
+
+    async def _ingest(self):
+        inbox = self.stages[0].inbox
+        source = self.source.__aiter__()
+        stop_wait = asyncio.ensure_future(self._stopping.wait())
+        try:
+            while True:
+                next_item = asyncio.ensure_future(source.__anext__())
+                await asyncio.wait({next_item, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_item.done():
+                    next_item.cancel()
+                    break
+                try:
+                    item = next_item.result()
+                except StopAsyncIteration:
+                    break
+                self.ingested += 1
+                await inbox.put(item)
+        finally:
+            stop_wait.cancel()
+            await inbox.put(STOP)
+
+    async def run(self, drain_timeout=30):
+        workers = [asyncio.create_task(stage.run()) for stage in self.stages]
+        await self._ingest()
+        try:
+            await asyncio.wait_for(asyncio.gather(*workers), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Pipeline drain timed out, dropping queued items")
+            for worker in workers:
+                worker.cancel()
+
+    def metrics(self):
+        stats = {'ingest': {'emitted': self.ingested}}
+        for stage in self.stages:
+            stats[stage.name] = dict(stage.metrics.snapshot(), queue=stage.inbox.snapshot())
+        return stats
+
+
+async def merge_sources(*sources):
+    """Interleave several async sources into one, in arrival order
+
+    Lets independent inputs (journal polling, /dev/kmsg) feed the same
+    pipeline. Ends once every source is exhausted; closing the merged
+    iterator cancels the readers.
+    """
+    queue = asyncio.Queue(maxsize=len(sources))
+    done = object()
+
+    async def pump(source):
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as e:
+            logger.error(f"Source error: {e}")
+        finally:
+            await queue.put(done)
+
+    tasks = [asyncio.create_task(pump(source)) for source in sources]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is done:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,308 @@
+"""
+Resource-pressure alerts from PSI triggers and cgroup memory.events
+Event-driven: the kernel wakes us, nothing is sampled on a timer
+Author: iceyxsm
+"""
+
+import os
+import time
+import select
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+PSI_RESOURCES = ('cpu', 'memory', 'io')
+
+# resource:some|full:stall ms:window ms - unprivileged triggers need
+# windows in multiples of 2s
+DEFAULT_TRIGGERS = 'memory:some:150:2000,io:full:500:2000,cpu:some:1000:2000'
+
+# memory.events counters worth an alert, with how they read in one
+MEMORY_EVENTS = (
+    ('oom_kill', 'OOM kill(s)'),
+    ('oom_group_kill', 'group OOM kill(s)'),
+    ('oom', 'allocation failure(s) at memory.max'),
+)
+
+
+def parse_triggers(spec):
+    """'memory:some:150:2000,...' -> [(resource, kind, stall_us, window_us)]"""
+    triggers = []
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        try:
+            resource, kind, stall, window = item.split(':')
+            if resource not in PSI_RESOURCES or kind not in ('some', 'full'):
+                raise ValueError(item)
+            triggers.append((resource, kind, int(stall) * 1000, int(window) * 1000))
+        except ValueError:
+            logger.error(f"Ignoring bad PSI trigger {item!r} (want resource:some|full:stall_ms:window_ms)")
+    return triggers
+
+
+def parse_psi(text):
+    """'some avg10=1.00 ... total=N' lines -> {'some': {'avg10': 1.0, ...}}"""
+    stats = {}
+    for line in text.splitlines():
+        kind, _, fields = line.partition(' ')
+        stats[kind] = {key: float(value) for key, _, value in
+                       (field.partition('=') for field in fields.split())}
+    return stats
+
+
+def parse_memory_events(text):
+    counters = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(' ')
+        if value.isdigit():
+            counters[key] = int(value)
+    return counters
+
+
+def read_text(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def cgroup2_root():
+    """Mount point of the cgroup2 hierarchy (unified or hybrid layout)"""
+    try:
+        with open('/proc/self/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 2 and fields[2] == 'cgroup2':
+                    return fields[1]
+    except OSError:
+        pass
+    return None
+
+
+def unit_cgroups(root):
+    """(unit name, cgroup dir) for every innermost service and scope
+
+    A unit containing other units (user@1000.service holds the session's
+    app scopes) is skipped; its hierarchical counters would double-count
+    the units below it.
+    """
+    contains_unit = set()
+    for dirpath, _, _ in os.walk(root, topdown=False):
+        name = os.path.basename(dirpath)
+        is_unit = name.endswith(('.service', '.scope'))
+        if is_unit and dirpath not in contains_unit:
+            yield name, dirpath
+        if is_unit or dirpath in contains_unit:
+            contains_unit.add(os.path.dirname(dirpath))
+
+
+class PressureMonitor:
+    """Alerts when PSI triggers fire or a unit's cgroup hits its memory limit
+
+    Each /proc/pressure/<resource> trigger and each top-level slice's
+    memory.events file is registered with one epoll instance, and a
+    helper thread blocks on it, so the monitor costs nothing until the
+    kernel reports an event. (The epoll fd can't go in the asyncio loop:
+    the loop's readiness check would consume PSI's one-shot event.) Only
+    then are cgroups walked, on that thread: a PSI event is attributed to
+    the units with the highest pressure, a memory.events change (counters
+    are hierarchical) to the units whose own counters went up since the
+    last look.
+
+    A resource alerts at most once per `cooldown` seconds; PSI keeps
+    firing every window while the pressure lasts.
+    """
+    def __init__(self, triggers=None, proc_root='/proc/pressure', cgroup_root=None,
+                 cooldown=300.0, top=3, clock=time.monotonic):
+        triggers = triggers or DEFAULT_TRIGGERS
+        self.triggers = parse_triggers(triggers) if isinstance(triggers, str) else list(triggers)
+        self.proc_root = proc_root
+        self.cgroup_root = cgroup_root or cgroup2_root()
+        self.cooldown = cooldown
+        self.top = top
+        self.clock = clock
+        self.watches = {}  # fd -> ('psi', trigger) or ('events', cgroup dir)
+        self.baseline = {}  # cgroup dir -> memory.events counters
+        self.last_alert = {}
+        self.epoll = None
+        self.alerts = 0
+        self.suppressed = 0
+
+    def start(self):
+        """Register triggers and memory.events watches; returns how many"""
+        self.epoll = select.epoll()
+        for trigger in self.triggers:
+            resource, kind, stall, window = trigger
+            try:
+                fd = os.open(os.path.join(self.proc_root, resource), os.O_RDWR | os.O_NONBLOCK | os.O_CLOEXEC)
+            except OSError as e:
+                logger.warning(f"PSI {resource} unavailable: {e}")
+                continue
+            try:
+                os.write(fd, f"{kind} {stall} {window}\0".encode())
+                self.epoll.register(fd, select.EPOLLPRI)
+            except OSError as e:
+                logger.warning(f"PSI trigger {kind} {stall} {window} on {resource} rejected: {e}")
+                os.close(fd)
+                continue
+            self.watches[fd] = ('psi', trigger)
+
+        if self.cgroup_root:
+            for path in self.snapshot_cgroups():
+                self.watch_events(path)
+        logger.info(f"Pressure monitor watching {len(self.watches)} trigger(s)/cgroup(s)")
+        return len(self.watches)
+
+    def watch_events(self, path):
+        try:
+            fd = os.open(os.path.join(path, 'memory.events'), os.O_RDONLY | os.O_CLOEXEC)
+        except OSError as e:
+            logger.warning(f"Cannot watch {path}/memory.events: {e}")
+            return
+        try:
+            os.read(fd, 4096)  # arms the change notification
+            self.epoll.register(fd, select.EPOLLPRI)
+        except OSError as e:
+            logger.warning(f"Cannot watch {path}/memory.events: {e}")
+            os.close(fd)
+            return
+        self.watches[fd] = ('events', path)
+
+    def snapshot_cgroups(self):
+        """Record memory.events of every unit and top-level slice
+
+        Returns the slices, whose hierarchical counters are the ones watched.
+        """
+        slices = [os.path.join(self.cgroup_root, name) for name in sorted(os.listdir(self.cgroup_root))
+                  if name.endswith('.slice')]
+        for path in slices + [path for _, path in unit_cgroups(self.cgroup_root)]:
+            self._changes(path)
+        return [path for path in slices if path in self.baseline]
+
+    def close(self):
+        for fd in self.watches:
+            os.close(fd)
+        self.watches.clear()
+        if self.epoll:
+            self.epoll.close()
+
+    async def events(self):
+        """Yield lists of alert dicts as the kernel reports pressure"""
+        if self.epoll is None and not self.start():
+            self.close()
+            return
+        loop = asyncio.get_running_loop()
+        alerts = asyncio.Queue()
+        wake_read, wake_write = os.pipe()
+        self.epoll.register(wake_read, select.EPOLLIN)
+        thread = threading.Thread(target=self._poll, args=(loop, alerts, wake_read),
+                                  name='pressure-poll', daemon=True)
+        thread.start()
+        try:
+            while True:
+                yield await alerts.get()
+        finally:
+            os.write(wake_write, b'x')
+            thread.join(timeout=1)
+            os.close(wake_read)
+            os.close(wake_write)
+            self.close()
+
+    def _poll(self, loop, alerts, wake_fd):
+        while True:
+            errors = []
+            for fd, _ in self.epoll.poll():
+                if fd == wake_fd:
+                    return
+                kind, target = self.watches.get(fd, (None, None))
+                try:
+                    if kind == 'psi':
+                        errors += self.on_pressure(target)
+                    elif kind == 'events':
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        os.read(fd, 4096)  # re-arm
+                        errors += self.on_memory_events(target)
+                except Exception as e:
+                    logger.error(f"Pressure event error: {e}")
+            if errors:
+                loop.call_soon_threadsafe(alerts.put_nowait, errors)
+
+    def _cooled_down(self, key):
+        now = self.clock()
+        last = self.last_alert.get(key)
+        if last is not None and now - last < self.cooldown:
+            self.suppressed += 1
+            return False
+        self.last_alert[key] = now
+        self.alerts += 1
+        return True
+
+    def top_units(self, resource, kind):
+        """Units with the highest <resource>.pressure avg10, highest first"""
+        if not self.cgroup_root:
+            return []
+        ranked = []
+        for name, path in unit_cgroups(self.cgroup_root):
+            text = read_text(os.path.join(path, f"{resource}.pressure"))
+            if not text:
+                continue
+            avg10 = parse_psi(text).get(kind, {}).get('avg10', 0.0)
+            if avg10 > 0:
+                ranked.append((avg10, name))
+        ranked.sort(reverse=True)
+        return ranked[:self.top]
+
+    def on_pressure(self, trigger):
+        resource, kind, stall, window = trigger
+        if not self._cooled_down(('psi', resource)):
+            return []
+        text = read_text(os.path.join(self.proc_root, resource)) or ''
+        avg10 = parse_psi(text).get(kind, {}).get('avg10', 0.0)
+        units = self.top_units(resource, kind)
+        message = (f"{resource.upper()} pressure: {kind} stall over {stall // 1000}ms per "
+                   f"{window // 1000000}s window (avg10 {avg10:.1f}%)")
+        if units:
+            message += '. Top: ' + ', '.join(f"{name} {value:.1f}%" for value, name in units)
+        return [{
+            'process': units[0][1] if units else 'kernel',
+            'message': message,
+            'raw': text,
+        }]
+
+    def _changes(self, path):
+        """memory.events counters of a cgroup that went up since last read"""
+        counters = parse_memory_events(read_text(os.path.join(path, 'memory.events')) or '')
+        before = self.baseline.get(path, {})
+        if counters:
+            self.baseline[path] = counters
+        return {key: counters[key] - before.get(key, 0) for key, _ in MEMORY_EVENTS
+                if counters.get(key, 0) > before.get(key, 0)}
+
+    def _events_alert(self, name, path, changes):
+        relative = os.path.relpath(path, self.cgroup_root)
+        text = ', '.join(f"{changes[key]} {label}" for key, label in MEMORY_EVENTS if key in changes)
+        return {'process': name, 'message': f"{text} in /{relative}", 'raw': ''}
+
+    def on_memory_events(self, slice_path):
+        """Units under slice_path whose memory.events counters went up
+
+        Whatever the slice counted beyond its live units (a killed
+        service whose cgroup is already gone) is reported for the slice.
+        """
+        errors = []
+        unexplained = self._changes(slice_path)
+        for name, path in unit_cgroups(slice_path):
+            changes = self._changes(path)
+            for key, delta in changes.items():
+                unexplained[key] = unexplained.get(key, 0) - delta
+            if changes and self._cooled_down(('events', path)):
+                errors.append(self._events_alert(name, path, changes))
+        unexplained = {key: delta for key, delta in unexplained.items() if delta > 0}
+        if unexplained and self._cooled_down(('events', slice_path)):
+            errors.append(self._events_alert(os.path.basename(slice_path), slice_path, unexplained))
+        return errors
+
+    def snapshot(self):
+        return {'watching': len(self.watches), 'alerts': self.alerts, 'suppressed': self.suppressed}
@@ -0,0 +1,67 @@
+"""
+/proc helpers
+Host facts and process lookups without forking ps, pgrep or uptime
+Author: iceyxsm
+"""
+
+import os
+import socket
+
+
+def hostname():
+    try:
+        return socket.gethostname()
+    except OSError:
+        return 'unknown-host'
+
+
+def read_uptime():
+    """Uptime from /proc/uptime, formatted like `uptime -p`"""
+    try:
+        with open('/proc/uptime') as f:
+            seconds = int(float(f.read().split()[0]))
+    except (OSError, ValueError, IndexError):
+        return 'unknown'
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes = seconds // 60
+    parts = [f"{n} {unit}{'s' if n != 1 else ''}"
+             for n, unit in ((days, 'day'), (hours, 'hour'), (minutes, 'minute')) if n]
+    return 'up ' + (', '.join(parts) or '0 minutes')
+
+
+def loadavg():
+    """Load averages as a string, or None if unavailable"""
+    try:
+        return ', '.join(f"{n:.2f}" for n in os.getloadavg())
+    except OSError:
+        return None
+
+
+def process_names():
+    """Sorted unique command names of running processes (like `ps -eo comm=`)"""
+    names = set()
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return []
+    for pid in entries:
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/comm') as f:
+                names.add(f.read().rstrip('\n'))
+        except OSError:
+            continue  # exited while we were scanning
+    names.discard('')
+    return sorted(names)
+
+
+def missing_processes(names):
+    """Subset of names with no running process, from a single /proc scan
+
+    Matches the kernel's comm field exactly, like `pgrep -x`, so names
+    longer than 15 characters are compared on their first 15.
+    """
+    running = set(process_names())
+    return [name for name in names if name[:15] not in running]
@@ -0,0 +1,53 @@
+"""
+Startup profiling helpers
+Phase timings and -X importtime breakdowns for --profile-startup
+Author: iceyxsm
+"""
+
+import sys
+import time
+import subprocess
+import importlib.util
+
+
+class StartupProfile:
+    """Records how long each startup phase took (see --profile-startup)"""
+    def __init__(self, t0):
+        self.t0 = t0
+        self.last = t0
+        self.phases = []
+        self.enabled = '--profile-startup' in sys.argv
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last, now - self.t0))
+        self.last = now
+
+    def report(self):
+        lines = [f"{'phase':<28}{'took':>10}{'since start':>14}"]
+        for phase, took, total in self.phases:
+            lines.append(f"{phase:<28}{took * 1000:>8.1f}ms{total * 1000:>12.1f}ms")
+        return '\n'.join(lines)
+
+
+def import_breakdown(modules, top=12):
+    """Per-module import cost, measured in a fresh interpreter with -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+        capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    rows.sort(reverse=True)
+    return '\n'.join(f"{cumulative / 1000:>8.1f}ms  {name}" for cumulative, name in rows[:top])
+
+
+def importable(module):
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
@@ -0,0 +1,212 @@
+"""
+Durable outbound message spool
+Segmented append-only log of pending Telegram sends
+Author: iceyxsm
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundSpool:
+    """Append-only on-disk queue of outbound Telegram sends
+
+    Entries are JSON lines in numbered segment files under `directory`.
+    Appends are fsynced in batches (every `sync_every` records or after
+    `sync_delay` seconds), the dispatcher acks entries in order, and a
+    segment is deleted once everything in it is acked. Re-queueing an
+    entry that is still pending only bumps its repeat count, so a long
+    outage doesn't grow the spool with copies of the same alert (repeat
+    counts themselves are kept in memory only). If the
+    spool still exceeds `max_bytes`, the oldest segment is dropped and
+    the loss is reported with the next delivery.
+    """
+    def __init__(self, directory, segment_bytes=1 << 20, max_bytes=64 << 20,
+                 sync_every=32, sync_delay=0.2):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ack_file = self.directory / 'acked'
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.sync_every = sync_every
+        self.sync_delay = sync_delay
+        
+        self.pending = deque()  # entries not yet acked, in seq order
+        self.by_key = {}  # key -> pending entry, for collapsing repeats
+        self.segments = []  # [path, last_seq, size] oldest first
+        self.acked = 0
+        self.next_seq = 1
+        self.lost = 0
+        self.fd = None
+        self.unsynced = 0
+        self.sync_handle = None
+        self.ack_dirty = False
+        self.changed = asyncio.Event()
+        self.load()
+    
+    def load(self):
+        """Rebuild the pending queue from disk after a restart"""
+        try:
+            self.acked = int(self.ack_file.read_text().strip() or 0)
+        except (OSError, ValueError):
+            self.acked = 0
+        self.next_seq = self.acked + 1
+        
+        for path in sorted(self.directory.glob('seg-*.log')):
+            last_seq = 0
+            with open(path, 'rb') as f:
+                for raw in f:
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        continue  # torn write from a crash
+                    last_seq = entry['seq']
+                    self.next_seq = max(self.next_seq, last_seq + 1)
+                    if entry['seq'] > self.acked:
+                        self._track(entry)
+            if last_seq <= self.acked:
+                path.unlink()
+            else:
+                self.segments.append([path, last_seq, path.stat().st_size])
+        
+        if self.pending:
+            logger.info(f"Spool: {len(self.pending)} unsent message(s) recovered")
+    
+    def _track(self, entry):
+        previous = self.by_key.get(entry['key'])
+        if previous:
+            previous['repeat'] = previous.get('repeat', 1) + entry.get('repeat', 1)
+            return
+        self.pending.append(entry)
+        self.by_key[entry['key']] = entry
+    
+    def _open_segment(self, first_seq):
+        path = self.directory / f"seg-{first_seq:012d}.log"
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        self.segments.append([path, 0, 0])
+    
+    def append(self, method, payload):
+        """Queue a Bot API call; returns its sequence number"""
+        key = hashlib.md5(f"{method}:{json.dumps(payload, sort_keys=True)}".encode()).hexdigest()
+        pending = self.by_key.get(key)
+        if pending:
+            # Same alert still waiting - count it instead of storing it again
+            pending['repeat'] = pending.get('repeat', 1) + 1
+            return pending['seq']
+        
+        entry = {'seq': self.next_seq, 'key': key, 'method': method,
+                 'payload': payload, 'ts': time.time()}
+        self.next_seq += 1
+        line = (json.dumps(entry) + '\n').encode()
+        
+        if self.fd is None or self.segments[-1][2] + len(line) > self.segment_bytes:
+            self.sync()
+            if self.fd is not None:
+                os.close(self.fd)
+            self._open_segment(entry['seq'])
+        os.write(self.fd, line)
+        segment = self.segments[-1]
+        segment[1] = entry['seq']
+        segment[2] += len(line)
+        
+        self._track(entry)
+        self._schedule_sync()
+        self._enforce_limit()
+        self.changed.set()
+        return entry['seq']
+    
+    def _schedule_sync(self):
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every:
+            self.sync()
+            return
+        if self.sync_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.sync()
+                return
+            self.sync_handle = loop.call_later(self.sync_delay, self.sync)
+    
+    def sync(self):
+        """fsync pending appends and the ack pointer"""
+        if self.sync_handle:
+            self.sync_handle.cancel()
+            self.sync_handle = None
+        if self.fd is not None and self.unsynced:
+            os.fsync(self.fd)
+        self.unsynced = 0
+        if self.ack_dirty:
+            tmp = self.ack_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                f.write(str(self.acked))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.ack_file)
+            self.ack_dirty = False
+    
+    def peek(self):
+        return self.pending[0] if self.pending else None
+    
+    def ack(self, seq):
+        """Mark entry `seq` delivered and compact old segments
+
+        Only the oldest pending entry can be acked. If it isn't `seq`, the
+        entry was dropped by the size limit while it was being sent, and
+        nothing else may be popped in its place.
+        """
+        if not self.pending or self.pending[0]['seq'] != seq:
+            return
+        entry = self.pending.popleft()
+        self.by_key.pop(entry['key'], None)
+        self.acked = max(self.acked, seq)
+        self.ack_dirty = True
+        self._compact()
+        self._schedule_sync()
+    
+    def _compact(self):
+        while self.segments and self.segments[0][1] <= self.acked:
+            path = self.segments.pop(0)[0]
+            if not self.segments and self.fd is not None:
+                # Active segment fully delivered - the next append starts a new one
+                self.sync()
+                os.close(self.fd)
+                self.fd = None
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    
+    def _enforce_limit(self):
+        while len(self.segments) > 1 and sum(seg[2] for seg in self.segments) > self.max_bytes:
+            path, last_seq, _ = self.segments.pop(0)
+            dropped = 0
+            while self.pending and self.pending[0]['seq'] <= last_seq:
+                entry = self.pending.popleft()
+                self.by_key.pop(entry['key'], None)
+                dropped += 1
+            self.lost += dropped
+            self.acked = max(self.acked, last_seq)
+            self.ack_dirty = True
+            path.unlink()
+            logger.warning(f"Spool over {self.max_bytes} bytes, dropped {dropped} oldest message(s)")
+    
+    async def wait(self):
+        """Block until something is pending"""
+        while not self.pending:
+            self.changed.clear()
+            await self.changed.wait()
+    
+    def close(self):
+        self.sync()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
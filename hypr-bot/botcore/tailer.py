@@ -0,0 +1,69 @@
+"""
+Incremental log file tailer
+Reads only what was appended since the last call
+Author: iceyxsm
+"""
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FileTailer:
+    """Returns new complete lines from a growing log file
+
+    The first read returns the last `backlog_lines` lines so recent
+    history isn't missed. After that only appended bytes are read. If the
+    file is replaced (new inode) or truncated, reading restarts from the
+    beginning. A trailing partial line is held back until its newline
+    arrives.
+    """
+    def __init__(self, path, backlog_lines=50, chunk_size=1 << 16):
+        self.path = path
+        self.backlog_lines = backlog_lines
+        self.chunk_size = chunk_size
+        self.position = None
+        self.inode = None
+        self.partial = b''
+
+    def _start_position(self, f, size):
+        """Offset of the first of the last backlog_lines lines"""
+        if not self.backlog_lines:
+            return size
+        offset = size
+        tail = b''
+        while offset > 0 and tail.count(b'\n') <= self.backlog_lines:
+            step = min(self.chunk_size, offset)
+            offset -= step
+            f.seek(offset)
+            tail = f.read(step) + tail
+        # The last piece is whatever follows the final newline (maybe nothing)
+        keep = b'\n'.join(tail.split(b'\n')[-(self.backlog_lines + 1):])
+        return size - len(keep)
+
+    def read_lines(self):
+        """New lines since the last call (decoded, newline stripped)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self.position = None
+            return []
+
+        with open(self.path, 'rb') as f:
+            if self.position is None:
+                self.position = self._start_position(f, stat.st_size)
+            elif stat.st_ino != self.inode or stat.st_size < self.position:
+                logger.info(f"{self.path} was rotated or truncated, reading from the start")
+                self.position = 0
+                self.partial = b''
+            self.inode = stat.st_ino
+            if stat.st_size == self.position:
+                return []
+            f.seek(self.position)
+            data = self.partial + f.read()
+            self.position = f.tell()
+
+        lines = data.split(b'\n')
+        self.partial = lines.pop()
+        return [line.decode(errors='replace').rstrip('\r') for line in lines]
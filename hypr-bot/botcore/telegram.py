@@ -0,0 +1,205 @@
+"""
+Telegram Bot API client
+One pooled aiohttp session per process, or the stdlib client without it
+Author: iceyxsm
+"""
+
+import os
+import json
+import asyncio
+import logging
+
+from .httpclient import AsyncHTTPClient
+
+logger = logging.getLogger(__name__)
+
+# Set by the first failed import: a failed import isn't cached by Python,
+# so without this every call would search sys.path for aiohttp again
+aiohttp_missing = False
+
+
+def import_aiohttp():
+    """The aiohttp module; ImportError (without retrying) once it's known missing"""
+    global aiohttp_missing
+    if aiohttp_missing:
+        raise ImportError('aiohttp is not installed')
+    try:
+        import aiohttp
+    except ImportError:
+        aiohttp_missing = True
+        logger.info("aiohttp not installed, using the stdlib HTTP client")
+        raise
+    return aiohttp
+
+
+class TelegramClient:
+    """Bot API calls over a shared keep-alive session
+
+    aiohttp is imported on first use, so constructing a client costs
+    nothing at startup. Without aiohttp the same calls go through
+    AsyncHTTPClient: one keep-alive TLS connection for sends and a second
+    one for getUpdates, so polling never holds up an alert.
+    last_status holds the HTTP status of the latest send (None if the
+    request never got an answer), for callers deciding whether to retry.
+    ca_file (or TELEGRAM_CA_FILE) adds a trusted CA for either transport.
+    """
+    def __init__(self, token, chat_id, api_url=None, timeout=10, ca_file=None):
+        self.token = token
+        self.chat_id = str(chat_id) if chat_id else None
+        self.api_url = (api_url or os.environ.get('TELEGRAM_API_URL', 'https://api.telegram.org')).rstrip('/')
+        self.timeout = timeout
+        self.ca_file = ca_file or os.environ.get('TELEGRAM_CA_FILE') or None
+        self.session = None
+        self.transport = None
+        self.poll_transport = None
+        self.last_status = None
+
+    @property
+    def configured(self):
+        return bool(self.token and self.chat_id)
+
+    def url(self, method):
+        return f"{self.api_url}/bot{self.token}/{method}"
+
+    def path(self, method):
+        return f"/bot{self.token}/{method}"
+
+    async def get_session(self):
+        """Shared aiohttp session (keep-alive pool); raises ImportError without aiohttp"""
+        if self.session is None:
+            aiohttp = import_aiohttp()
+            connector = None
+            if self.ca_file:
+                import ssl
+                connector = aiohttp.TCPConnector(ssl=ssl.create_default_context(cafile=self.ca_file))
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout * 3)
+            )
+        return self.session
+
+    def get_transport(self, poll=False):
+        """Stdlib keep-alive client, used when aiohttp isn't installed"""
+        if poll:
+            if self.poll_transport is None:
+                self.poll_transport = AsyncHTTPClient(self.api_url, self.timeout, self.ca_file)
+            return self.poll_transport
+        if self.transport is None:
+            self.transport = AsyncHTTPClient(self.api_url, self.timeout, self.ca_file)
+        return self.transport
+
+    async def warm(self):
+        """Load the HTTP stack off the event loop and open the first connection"""
+        try:
+            try:
+                await asyncio.to_thread(import_aiohttp)
+                session = await self.get_session()
+                if self.token:
+                    async with session.get(self.url('getMe')) as response:
+                        await response.read()
+            except ImportError:
+                if self.token:
+                    await self.get_transport().get(self.path('getMe'))
+            return True
+        except Exception as e:
+            logger.info(f"HTTP warm-up skipped: {e}")
+            return False
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        for transport in (self.transport, self.poll_transport):
+            if transport:
+                await transport.close()
+        self.transport = self.poll_transport = None
+
+    async def send_message(self, text, parse_mode='HTML', reply_markup=None):
+        """Send a message to the configured chat"""
+        if not self.configured:
+            logger.warning("Telegram not configured")
+            return False
+
+        payload = {'chat_id': self.chat_id, 'text': text, 'parse_mode': parse_mode}
+        if reply_markup:
+            payload['reply_markup'] = json.dumps(reply_markup)
+
+        try:
+            try:
+                session = await self.get_session()
+            except ImportError:
+                status, _ = await self.get_transport().post_json(self.path('sendMessage'), payload)
+            else:
+                async with session.post(self.url('sendMessage'), json=payload) as response:
+                    status = response.status
+            self.last_status = status
+            if status == 200:
+                return True
+            logger.error(f"Failed to send: {status}")
+            return False
+        except Exception as e:
+            self.last_status = None
+            logger.error(f"Send error: {e!r}")
+            return False
+
+    async def send_document(self, filename, content, caption=None):
+        """Upload text as a .txt document (for dumps too big for messages)"""
+        if not self.configured:
+            logger.warning("Telegram not configured")
+            return False
+
+        fields = {'chat_id': self.chat_id}
+        if caption:
+            fields['caption'] = caption
+        try:
+            try:
+                aiohttp = import_aiohttp()
+            except ImportError:
+                status, _ = await self.get_transport().post_multipart(
+                    self.path('sendDocument'), fields,
+                    {'document': (filename, content.encode(), 'text/plain')}
+                )
+            else:
+                form = aiohttp.FormData()
+                for name, value in fields.items():
+                    form.add_field(name, value)
+                form.add_field('document', content.encode(), filename=filename, content_type='text/plain')
+                session = await self.get_session()
+                async with session.post(self.url('sendDocument'), data=form) as response:
+                    status = response.status
+            self.last_status = status
+            if status == 200:
+                return True
+            logger.error(f"Failed to send document: {status}")
+            return False
+        except Exception as e:
+            self.last_status = None
+            logger.error(f"Document error: {e!r}")
+            return False
+
+    async def get_updates(self, offset=0, limit=10):
+        """Pending updates (an empty list on any non-200 answer)"""
+        params = {'offset': offset, 'limit': limit}
+        try:
+            session = await self.get_session()
+        except ImportError:
+            status, body = await self.get_transport(poll=True).get(self.path('getUpdates'), params)
+            return json.loads(body).get('result', []) if status == 200 else []
+        async with session.get(self.url('getUpdates'), params=params) as response:
+            if response.status != 200:
+                return []
+            data = await response.json()
+            return data.get('result', [])
+
+    async def answer_callback(self, callback_id):
+        """Answer a callback query to remove the button's loading spinner"""
+        payload = {'callback_query_id': callback_id}
+        try:
+            try:
+                session = await self.get_session()
+            except ImportError:
+                await self.get_transport().post_json(self.path('answerCallbackQuery'), payload)
+                return
+            async with session.post(self.url('answerCallbackQuery'), json=payload):
+                pass  # We don't care about the response
+        except Exception:
+            pass
@@ -0,0 +1,139 @@
+"""
+systemd notify/watchdog support and event-loop stall detection
+sd_notify over $NOTIFY_SOCKET in pure Python (no libsystemd)
+Author: iceyxsm
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import logging
+import threading
+import traceback
+
+logger = logging.getLogger(__name__)
+
+
+def sd_notify(state):
+    """Send a state string (READY=1, WATCHDOG=1, ...) to systemd
+
+    Returns False when not running under a Type=notify unit.
+    """
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address:
+        return False
+    if address.startswith('@'):
+        # Abstract namespace socket
+        address = '\0' + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC) as sock:
+            sock.sendto(state.encode(), address)
+        return True
+    except OSError as e:
+        logger.error(f"sd_notify({state}) failed: {e}")
+        return False
+
+
+def watchdog_timeout():
+    """WatchdogSec= of our unit in seconds, or None if the watchdog is off"""
+    usec = os.environ.get('WATCHDOG_USEC')
+    pid = os.environ.get('WATCHDOG_PID')
+    if not usec or (pid and pid != str(os.getpid())):
+        return None
+    try:
+        return int(usec) / 1e6
+    except ValueError:
+        return None
+
+
+class LoopWatchdog:
+    """Heartbeat task on the event loop, watched from a helper thread
+
+    The task wakes every `interval` seconds, records how late it woke
+    (loop lag) and pings the systemd watchdog at half of WatchdogSec, so
+    systemd only hears from us while the loop is actually turning. If
+    no heartbeat lands for `threshold` seconds the thread logs the stack
+    of the loop thread (which shows the coroutine stuck in a blocking
+    call), the running task and every other thread, once per stall.
+    """
+    def __init__(self, threshold=1.0, interval=0.25, notify=sd_notify):
+        self.threshold = threshold
+        self.interval = interval
+        self.notify = notify
+        self.ping_every = None
+        self.loop = None
+        self.loop_thread = None
+        self.last_beat = None
+        self.stalled_since = None
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.worst_stall = 0.0
+        self._stopped = threading.Event()
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.last_beat = time.monotonic()
+        timeout = watchdog_timeout()
+        if timeout:
+            self.ping_every = timeout / 2
+            logger.info(f"systemd watchdog enabled, pinging every {self.ping_every:.1f}s")
+        threading.Thread(target=self._monitor, name='loop-watchdog', daemon=True).start()
+
+        last_ping = 0.0
+        try:
+            while True:
+                expected = time.monotonic() + self.interval
+                await asyncio.sleep(self.interval)
+                now = time.monotonic()
+                self.max_lag = max(self.max_lag, now - expected)
+                self.last_beat = now
+                if self.ping_every and now - last_ping >= self.ping_every:
+                    self.notify('WATCHDOG=1')
+                    last_ping = now
+        finally:
+            self._stopped.set()
+
+    def _monitor(self):
+        while not self._stopped.wait(self.interval):
+            silent = time.monotonic() - self.last_beat
+            if silent > self.threshold + self.interval:
+                if self.stalled_since is None:
+                    self.stalled_since = self.last_beat
+                    self.stalls += 1
+                    logger.warning(f"Event loop stalled for {silent:.2f}s\n{self.dump_stacks()}")
+            elif self.stalled_since is not None:
+                took = self.last_beat - self.stalled_since
+                self.worst_stall = max(self.worst_stall, took)
+                self.stalled_since = None
+                logger.warning(f"Event loop recovered after a {took:.2f}s stall")
+
+    def dump_stacks(self):
+        """Stacks of the running task, the loop thread and all other threads"""
+        frames = sys._current_frames()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        lines = []
+
+        task = asyncio.current_task(self.loop)
+        if task:
+            lines.append(f"Running task: {task.get_name()} ({task.get_coro().__qualname__})")
+        frame = frames.pop(self.loop_thread, None)
+        if frame:
+            lines.append(f"Event loop thread ({names.get(self.loop_thread, 'main')}):")
+            lines += [entry.rstrip() for entry in traceback.format_stack(frame)]
+
+        frames.pop(threading.get_ident(), None)
+        for ident, frame in frames.items():
+            lines.append(f"Thread {names.get(ident, ident)}:")
+            lines += [entry.rstrip() for entry in traceback.format_stack(frame)]
+        return '\n'.join(lines)
+
+    def snapshot(self):
+        return {
+            'max_lag_ms': round(self.max_lag * 1000, 1),
+            'stalls': self.stalls,
+            'worst_stall_ms': round(self.worst_stall * 1000, 1),
+            'stalled': self.stalled_since is not None,
+        }
@@ -5,37 +5,71 @@ Monitors all system errors, not just Hyprland
 Author: iceyxsm
 """
 
-import os
 import sys
 import time
+
+# Taken before anything else is imported so --profile-startup sees import cost
+STARTUP_T0 = time.perf_counter()
+
+import os
 import json
-import hashlib
-import subprocess
+import html
+import signal
 import asyncio
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict, deque
+from collections import defaultdict
+
+# botcore/ is deployed next to this script
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from botcore import (
+    ERROR_PATTERNS,
+    ErrorMatcher,
+    BatchClassifier,
+    fingerprint,
+    Pipeline,
+    StageQueue,
+    merge_sources,
+    AlertFormatter,
+    CrashEnricher,
+    OutboundSpool,
+    TelegramClient,
+    KmsgReader,
+    kmsg_error,
+    PressureMonitor,
+    DedupStore,
+    LoopWatchdog,
+    StartupProfile,
+    import_breakdown,
+    importable,
+    load_env_file,
+    procfs,
+    sd_notify,
+    setup_logging,
+)
+
+# Imported on first use (or warmed in the background), never at startup
+LAZY_IMPORTS = ['aiohttp', 'concurrent.futures.process']
+
+STARTUP = StartupProfile(STARTUP_T0)
+STARTUP.mark('imports')
 
 # Configure logging
-LOG_DIR = Path('/var/log/hypr-bot')
-LOG_DIR.mkdir(exist_ok=True)
+LOG_DIR = Path(os.environ.get('HYPR_BOT_LOG_DIR', '/var/log/hypr-bot'))
+LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_DIR / 'bot.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Disk and console writes happen on a listener thread, off the event loop
+setup_logging(LOG_DIR / 'bot.log')
 logger = logging.getLogger('system-bot')
+STARTUP.mark('logging setup')
+
 
 class SystemMonitorBot:
     def __init__(self):
-        self.config_file = Path('/etc/hypr-bot/.env')
-        self.data_dir = Path('/var/lib/hypr-bot')
-        self.data_dir.mkdir(exist_ok=True)
+        self.config_file = Path(os.environ.get('HYPR_BOT_CONFIG', '/etc/hypr-bot/.env'))
+        self.data_dir = Path(os.environ.get('HYPR_BOT_DATA_DIR', '/var/lib/hypr-bot'))
+        self.data_dir.mkdir(parents=True, exist_ok=True)
         
         # Storage files
         self.ignored_file = self.data_dir / 'ignored_errors.json'
@@ -43,57 +77,58 @@ class SystemMonitorBot:
         
         self.bot_token = None
         self.chat_id = None
-        self.hostname = self.get_hostname()
+        self.hostname = procfs.hostname()
         self.load_config()
+        self.telegram = TelegramClient(self.bot_token, self.chat_id)
         
         # State
         self.ignored_errors = self.load_ignored()
         self.mode = 'normal'  # 'normal' or 'package'
         self.selected_packages = []  # List of package IDs in package mode
         self.packages = {}  # Map ID -> package name
-        self.recent_errors = deque(maxlen=1000)  # Recent errors for deduplication
+        self.recent_errors = DedupStore(maxsize=1000)  # Recent errors for deduplication
         
         # Error patterns
-        self.error_patterns = [
-            'error', 'Error', 'ERROR',
-            'crash', 'Crash', 'CRASH',
-            'failed', 'Failed', 'FAILED',
-            'fatal', 'Fatal', 'FATAL',
-            'segmentation fault', 'segfault', 'SIGSEGV',
-            'core dumped', 'aborted',
-            'exception', 'Exception',
-            'panic', 'Panic',
-            'killed', 'Killed',
-            'terminated', 'Terminated',
-            'permission denied', 'Permission denied',
-            'no such file', 'No such file',
-            'connection refused', 'Connection refused',
-            'timeout', 'Timeout',
-            'unable to', 'Unable to',
-            'cannot', 'Cannot',
-            'not found', 'Not found'
-        ]
+        self.error_patterns = list(ERROR_PATTERNS)
+        self.matcher = ErrorMatcher(self.error_patterns)
         
         self.startup_time = datetime.now()
         self.last_journal_check = time.time()
+        self.journal_cursor = None
+        self.poll_interval = 10
+        self.pipeline = None
+        self.formatter = AlertFormatter()
+        self.enricher = CrashEnricher()
+        self.spool = OutboundSpool(self.data_dir / 'spool')
+        # Stacks are logged when the loop stops turning for this long
+        self.watchdog = LoopWatchdog(threshold=float(os.environ.get('LOOP_STALL_THRESHOLD', '1.0')))
+        STARTUP.mark('bot init')
+        
+        # Bursts of CLASSIFY_POOL_THRESHOLD+ lines go to a process pool
+        self.classifier = BatchClassifier(
+            self.matcher,
+            workers=int(os.environ.get('CLASSIFY_WORKERS', '0') or 0),
+            threshold=int(os.environ.get('CLASSIFY_POOL_THRESHOLD', '5000'))
+        )
+        
+        # Kernel errors straight from /dev/kmsg, without the journal poll delay
+        self.kmsg = None
+        kmsg_path = os.environ.get('KMSG_PATH', '/dev/kmsg')
+        if os.environ.get('KMSG_READER', '1') != '0' and os.access(kmsg_path, os.R_OK):
+            self.kmsg = KmsgReader(kmsg_path, max_level=int(os.environ.get('KMSG_MAX_LEVEL', '3')))
+        
+        # Thrashing without log errors: PSI triggers and cgroup memory.events
+        self.pressure = None
+        if os.environ.get('PSI_MONITOR', '1') != '0' and os.path.isdir('/proc/pressure'):
+            self.pressure = PressureMonitor(
+                os.environ.get('PSI_TRIGGERS'),
+                cooldown=float(os.environ.get('PSI_COOLDOWN', '300'))
+            )
         
-    def get_hostname(self):
-        try:
-            return subprocess.run(['hostname'], capture_output=True, text=True).stdout.strip()
-        except:
-            return 'unknown-host'
-    
     def load_config(self):
         if self.config_file.exists():
             try:
-                with open(self.config_file) as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line or line.startswith('#'):
-                            continue
-                        if '=' in line:
-                            key, value = line.split('=', 1)
-                            os.environ[key] = value
+                load_env_file(self.config_file)
                 
                 self.bot_token = os.environ.get('TELEGRAM_BOT_TOKEN')
                 self.chat_id = os.environ.get('TELEGRAM_CHAT_ID')
@@ -123,77 +158,90 @@ class SystemMonitorBot:
     
     def generate_error_id(self, error_text):
         """Generate unique ID for error"""
-        # Hash first 100 chars of error for ID
-        return hashlib.md5(error_text[:100].encode()).hexdigest()[:8].upper()
+        return fingerprint(error_text)
     
     def is_duplicate(self, error_id):
         """Check if error was recently sent"""
-        if error_id in self.recent_errors:
-            return True
-        self.recent_errors.append(error_id)
-        return False
+        return self.recent_errors.seen(error_id)
+    
+    @property
+    def last_send_status(self):
+        return self.telegram.last_status
+    
+    async def warm_http(self):
+        """Import the HTTP stack off the event loop and open the first connection"""
+        if await self.telegram.warm():
+            STARTUP.mark('http warm')
     
     async def send_telegram_message(self, message, parse_mode='HTML', reply_markup=None):
         """Send message to Telegram"""
-        if not self.bot_token or not self.chat_id:
-            logger.warning("Telegram not configured")
-            return False
-            
-        try:
-            import aiohttp
-            import json
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': parse_mode
-            }
-            
-            if reply_markup:
-                payload['reply_markup'] = json.dumps(reply_markup)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        return True
-                    else:
-                        logger.error(f"Failed to send: {response.status}")
-                        return False
-                        
-        except ImportError:
-            return await self._send_with_curl(message, parse_mode, reply_markup)
-        except Exception as e:
-            logger.error(f"Error: {e}")
-            return False
+        return await self.telegram.send_message(message, parse_mode, reply_markup)
     
-    async def _send_with_curl(self, message, parse_mode, reply_markup=None):
-        try:
-            import json
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            
-            payload = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': parse_mode
-            }
-            
-            if reply_markup:
-                payload['reply_markup'] = json.dumps(reply_markup)
-            
-            json_payload = json.dumps(payload)
-            
-            cmd = ['curl', '-s', '-X', 'POST', url, '-H', 'Content-Type: application/json', '-d', json_payload]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            return result.returncode == 0
+    async def send_telegram_document(self, filename, content, caption=None):
+        """Upload text as a .txt document (for dumps too big for messages)"""
+        return await self.telegram.send_document(filename, content, caption)
+    
+    def queue_telegram_message(self, message, parse_mode='HTML', reply_markup=None):
+        """Spool a message for delivery; survives outages and restarts"""
+        payload = {'text': message, 'parse_mode': parse_mode}
+        if reply_markup:
+            payload['reply_markup'] = reply_markup
+        self.spool.append('sendMessage', payload)
+    
+    def queue_telegram_document(self, filename, content, caption=None):
+        """Spool a document upload"""
+        self.spool.append('sendDocument', {'filename': filename, 'content': content, 'caption': caption})
+    
+    async def deliver(self, entry):
+        """Send one spooled entry; True once Telegram has it or rejected it for good"""
+        payload = entry['payload']
+        repeat = entry.get('repeat', 1)
+        if entry['method'] == 'sendDocument':
+            caption = payload.get('caption') or ''
+            if repeat > 1:
+                caption += f" (x{repeat})"
+            ok = await self.send_telegram_document(payload['filename'], payload['content'], caption)
+        else:
+            text = payload['text']
+            if repeat > 1:
+                text += f"\n\n<i>Repeated {repeat}x while offline</i>"
+            if self.spool.lost:
+                text += f"\n\n<i>{self.spool.lost} older alert(s) dropped - spool was full</i>"
+            ok = await self.send_telegram_message(text, payload.get('parse_mode', 'HTML'), payload.get('reply_markup'))
+            if ok:
+                self.spool.lost = 0
+        
+        status = self.last_send_status
+        if not ok and status and 400 <= status < 500 and status != 429:
+            # Retrying a malformed request would block the spool forever
+            logger.error(f"Telegram rejected spooled message #{entry['seq']} ({status}), discarding")
+            return True
+        return ok
+    
+    async def drain_spool(self):
+        """Deliver spooled messages in order, backing off while offline"""
+        backoff = 1
+        while True:
+            await self.spool.wait()
+            entry = self.spool.peek()
+            if not self.bot_token or not self.chat_id:
+                await asyncio.sleep(60)
+                continue
             
-        except Exception as e:
-            logger.error(f"Curl error: {e}")
-            return False
+            if await self.deliver(entry):
+                self.spool.ack(entry['seq'])
+                if backoff > 1:
+                    logger.info(f"Telegram reachable again, {len(self.spool.pending)} message(s) left")
+                backoff = 1
+            else:
+                if backoff == 1:
+                    logger.warning(f"Send failed, {len(self.spool.pending)} message(s) spooled - retrying")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 300)
     
     async def send_startup_notification(self):
         """Send system startup notification with buttons"""
-        uptime = subprocess.run(['uptime', '-p'], capture_output=True, text=True).stdout.strip()
+        uptime = procfs.read_uptime()
         boot_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         message = "🖥️ <b>System Started</b>\n\n"
@@ -219,28 +267,16 @@ class SystemMonitorBot:
             ]
         }
         
-        await self.send_telegram_message(message, reply_markup=keyboard)
-        logger.info("Startup notification sent")
+        # Spooled - the network is often not up yet this early in boot
+        self.queue_telegram_message(message, reply_markup=keyboard)
+        logger.info("Startup notification queued")
     
     def get_running_packages(self):
         """Get list of running packages with IDs"""
         packages = {}
         try:
-            # Get unique process names
-            result = subprocess.run(
-                ['ps', '-eo', 'comm=', '--sort=comm'],
-                capture_output=True, text=True
-            )
-            
-            seen = set()
-            idx = 1
-            for line in result.stdout.strip().split('\n'):
-                name = line.strip()
-                if name and name not in seen:
-                    seen.add(name)
-                    packages[idx] = name
-                    idx += 1
-                    
+            for idx, name in enumerate(procfs.process_names(), 1):
+                packages[idx] = name
         except Exception as e:
             logger.error(f"Failed to get packages: {e}")
             
@@ -251,31 +287,17 @@ class SystemMonitorBot:
         if not self.bot_token:
             return
             
-        try:
-            import aiohttp
-            offset = 0
-            
-            while True:
-                try:
-                    url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
-                    params = {'offset': offset, 'limit': 10}
-                    
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url, params=params) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                
-                                for update in data.get('result', []):
-                                    offset = max(offset, update['update_id'] + 1)
-                                    await self.process_command(update)
-                                    
-                except Exception as e:
-                    logger.error(f"Command poll error: {e}")
+        offset = 0
+        while True:
+            try:
+                for update in await self.telegram.get_updates(offset):
+                    offset = max(offset, update['update_id'] + 1)
+                    await self.process_command(update)
                     
-                await asyncio.sleep(2)
+            except Exception as e:
+                logger.error(f"Command poll error: {e!r}")
                 
-        except ImportError:
-            logger.warning("aiohttp not available, command handling disabled")
+            await asyncio.sleep(2)
     
     async def process_command(self, update):
         """Process Telegram command"""
@@ -305,6 +327,8 @@ class SystemMonitorBot:
             await self.cmd_ignoring()
         elif text == '/alive':
             await self.cmd_alive()
+        elif text == '/status':
+            await self.cmd_status()
         elif text == '/start' or text == '/help':
             await self.cmd_help()
         
@@ -318,7 +342,7 @@ class SystemMonitorBot:
         
         lines = ["📦 <b>Running Packages</b>\n"]
         for idx, name in list(self.packages.items())[:50]:  # Show first 50
-            lines.append(f"<code>{idx:3}</code> | {name}")
+            lines.append(f"<code>{idx:3}</code> | {html.escape(name)}")
         
         if len(self.packages) > 50:
             lines.append(f"\n... and {len(self.packages) - 50} more")
@@ -350,7 +374,7 @@ class SystemMonitorBot:
             
             await self.send_telegram_message(
                 f"📦 <b>Package Mode</b>\n\nMonitoring:\n" + 
-                '\n'.join(f"• {n}" for n in names) +
+                '\n'.join(f"• {html.escape(n)}" for n in names) +
                 f"\n\nUse /nm to return to normal mode"
             )
             
@@ -413,6 +437,7 @@ class SystemMonitorBot:
         help_text += "/nm - Normal mode (all)\n\n"
         help_text += "<b>Bot Control:</b>\n"
         help_text += "/alive - Check if bot is alive\n"
+        help_text += "/status - Pipeline metrics\n"
         help_text += "/help - Show this help"
         
         # Add buttons
@@ -437,12 +462,8 @@ class SystemMonitorBot:
         uptime_str = str(timedelta(seconds=int(uptime_seconds)))
         
         # Get system info
-        try:
-            load_avg = subprocess.run(['uptime'], capture_output=True, text=True).stdout.strip()
-            mem_info = subprocess.run(['free', '-h'], capture_output=True, text=True).stdout.strip()
-        except:
-            load_avg = "N/A"
-            mem_info = "N/A"
+        load = procfs.loadavg()
+        load_avg = f"{procfs.read_uptime()}, load average: {load}" if load else "N/A"
         
         message = "💓 <b>Bot is Alive!</b>\n\n"
         message += f"<b>Hostname:</b> <code>{self.hostname}</code>\n"
@@ -465,12 +486,18 @@ class SystemMonitorBot:
         
         await self.send_telegram_message(message, reply_markup=keyboard)
     
+    async def cmd_status(self):
+        """Show pipeline stage metrics"""
+        message = "📋 <b>Pipeline Status</b>\n\n"
+        message += f"<code>{self.format_metrics()}</code>"
+        await self.send_telegram_message(message)
+    
     async def handle_callback(self, callback_query):
         """Handle inline keyboard button presses"""
         data = callback_query.get('data', '')
         
         # Answer the callback to remove loading state
-        await self.answer_callback(callback_query['id'])
+        await self.telegram.answer_callback(callback_query['id'])
         
         # Execute the command
         if data == '/packages':
@@ -483,133 +510,211 @@ class SystemMonitorBot:
             await self.cmd_ignoring()
         elif data == '/alive':
             await self.cmd_alive()
+        elif data == '/status':
+            await self.cmd_status()
         elif data == '/help':
             await self.cmd_help()
     
-    async def answer_callback(self, callback_id):
-        """Answer callback query to remove loading spinner"""
-        try:
-            import aiohttp
-            url = f"https://api.telegram.org/bot{self.bot_token}/answerCallbackQuery"
-            payload = {'callback_query_id': callback_id}
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    pass  # We don't care about the response
-        except:
-            pass  # Silently fail
+    def journal_command(self):
+        """Build the journalctl query for logs since the last check"""
+        cmd = ['journalctl', '--priority=err', '--no-pager', '-o', 'json',
+               '--output-fields=SYSLOG_IDENTIFIER,_COMM,MESSAGE']
+        
+        # Resume exactly after the last entry seen; fall back to time on first run
+        if self.journal_cursor:
+            cmd += ['--after-cursor', self.journal_cursor]
+        else:
+            since = datetime.fromtimestamp(self.last_journal_check).strftime('%Y-%m-%d %H:%M:%S')
+            cmd += ['--since', since]
+        self.last_journal_check = time.time()
+        return cmd
     
-    def get_journal_errors(self):
-        """Get errors from systemd journal"""
-        errors = []
-        
+    def track_cursor(self, lines):
+        """Remember the cursor of the newest JSON entry in a batch"""
+        for line in reversed(lines):
+            if line.startswith('{'):
+                try:
+                    self.journal_cursor = json.loads(line).get('__CURSOR', self.journal_cursor)
+                except ValueError:
+                    continue
+                return
+    
+    async def read_journal(self):
+        """Read new journal lines without blocking the event loop"""
+        proc = await asyncio.create_subprocess_exec(
+            *self.journal_command(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
         try:
-            # Get logs since last check
-            since = datetime.fromtimestamp(self.last_journal_check).strftime('%Y-%m-%d %H:%M:%S')
-            self.last_journal_check = time.time()
-            
-            # Query journal for errors
-            cmd = [
-                'journalctl', '--since', since,
-                '--priority=err', '--no-pager',
-                '-o', 'short',
-                '--output-fields=SYSLOG_IDENTIFIER,MESSAGE'
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return []
+        lines = stdout.decode(errors='replace').split('\n')
+        self.track_cursor(lines)
+        return lines
+    
+    async def journal_source(self):
+        """Yield batches of raw journal lines every poll interval"""
+        first = True
+        while True:
+            try:
+                lines = await self.read_journal()
+                if first:
+                    first = False
+                    STARTUP.mark('first journal read')
+                    if STARTUP.enabled:
+                        self.pipeline.stop()
+                if lines:
+                    yield lines
+            except Exception as e:
+                logger.error(f"Journal error: {e}")
+            await asyncio.sleep(self.poll_interval)
+    
+    async def kmsg_source(self):
+        """Yield batches of kernel error dicts as /dev/kmsg records arrive"""
+        async for records in self.kmsg.batches():
+            yield [kmsg_error(record) for record in records]
+    
+    def event_source(self):
+        """Journal batches, merged with /dev/kmsg records and pressure alerts"""
+        sources = [self.journal_source()]
+        if self.kmsg:
+            sources.append(self.kmsg_source())
+        if self.pressure:
+            sources.append(self.pressure.events())
+        return merge_sources(*sources) if len(sources) > 1 else sources[0]
+    
+    async def classify(self, batch):
+        """Classify stage handler - kernel records arrive already classified"""
+        if batch and isinstance(batch[0], dict):
+            return batch
+        return await self.classifier.classify(batch)
+    
+    def filter_error(self, error):
+        """Dedupe/ignore/mode filter - returns the error with its ID, or None"""
+        error_id = error.get('fingerprint')
+        if not error_id:
+            error_id = self.generate_error_id(f"{error['process']}: {error['message']}")
+        error_id_str = f"#{error_id}"
+        
+        # Skip if ignored
+        if error_id_str in self.ignored_errors:
+            return None
+        
+        # Skip duplicates
+        if self.is_duplicate(error_id):
+            return None
+        
+        # Filter by mode
+        if self.mode == 'package':
+            # Get current packages
+            current_packages = self.get_running_packages()
+            selected_names = [
+                current_packages.get(pid, '') 
+                for pid in self.selected_packages
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            for line in result.stdout.split('\n'):
-                if not line or line.startswith('--'):
-                    continue
-                
-                # Parse log line
-                # Format: Mon DD HH:MM:SS hostname process[pid]: message
-                if ':' in line:
-                    parts = line.split(':', 2)
-                    if len(parts) >= 3:
-                        timestamp_part = parts[0]
-                        process_part = parts[1].strip()
-                        message = parts[2].strip()
-                        
-                        # Check if it's an error
-                        if any(pattern in message for pattern in self.error_patterns):
-                            # Extract process name
-                            process = process_part.split('[')[0].strip()
-                            if not process:
-                                process = 'system'
-                            
-                            errors.append({
-                                'process': process,
-                                'message': message,
-                                'raw': line
-                            })
-                            
-        except subprocess.TimeoutExpired:
-            pass
-        except Exception as e:
-            logger.error(f"Journal error: {e}")
+            # Check if error is from selected package
+            if error['process'] not in selected_names:
+                return None
         
-        return errors
+        return dict(error, id=error_id_str)
     
-    async def process_and_send_errors(self, errors):
-        """Process errors and send to Telegram"""
-        for error in errors:
-            error_text = f"{error['process']}: {error['message']}"
-            error_id = self.generate_error_id(error_text)
-            error_id_str = f"#{error_id}"
-            
-            # Skip if ignored
-            if error_id_str in self.ignored_errors:
-                continue
-            
-            # Skip duplicates
-            if self.is_duplicate(error_id):
-                continue
-            
-            # Filter by mode
-            if self.mode == 'package':
-                # Get current packages
-                current_packages = self.get_running_packages()
-                selected_names = [
-                    current_packages.get(pid, '') 
-                    for pid in self.selected_packages
-                ]
-                
-                # Check if error is from selected package
-                if error['process'] not in selected_names:
-                    continue
-            
-            # Format message
-            if self.mode == 'package' and len(self.selected_packages) > 1:
-                # Multi-package mode
-                message = f"<b>{error_id_str}</b> [{error['process']}]: {error['message'][:200]}"
-            else:
-                message = f"🚨 <b>Error {error_id_str}</b>\n\n<b>Process:</b> <code>{error['process']}</code>\n<b>Message:</b> {error['message'][:300]}"
-            
-            await self.send_telegram_message(message)
+    async def dispatch_alerts(self, errors, sink=None, document_sink=None):
+        """Dispatch stage handler - pack pending alerts and send them"""
+        sink = sink or self.spool_message
+        document_sink = document_sink or self.spool_document
+        compact = self.mode == 'package' and len(self.selected_packages) > 1
+        messages, document = self.formatter.pack(errors, compact)
+        for message in messages:
+            await sink(message)
+        if document:
+            name = f"errors-{datetime.now().strftime('%Y%m%d-%H%M%S')}.txt"
+            await document_sink(name, document, caption=f"Full alert text from {self.hostname}")
+        return len(messages)
     
-    async def run(self):
-        """Main loop"""
-        logger.info("="*50)
-        logger.info("System Monitor Bot Starting...")
-        logger.info("="*50)
-        
-        # Send startup notification
-        await self.send_startup_notification()
-        
-        # Start command handler in background
-        asyncio.create_task(self.handle_telegram_commands())
-        
+    async def spool_empty(self):
+        while self.spool.pending:
+            await asyncio.sleep(0.05)
+    
+    async def spool_message(self, message):
+        self.queue_telegram_message(message)
+    
+    async def spool_document(self, filename, content, caption=None):
+        self.queue_telegram_document(filename, content, caption)
+    
+    def summarize_dropped(self, groups):
+        """Collapse errors dropped during a burst into one summary error
+        
+        groups holds a (count, sample error) pair per dropped fingerprint.
+        """
+        counts = defaultdict(int)
+        for count, error in groups:
+            counts[error['process']] += count
+        top = ', '.join(f"{name} x{n}" for name, n in sorted(counts.items(), key=lambda kv: -kv[1])[:5])
+        return {
+            'process': 'hypr-bot',
+            'message': f"Burst: {sum(counts.values())} more errors suppressed ({top})",
+            'raw': ''
+        }
+    
+    def build_pipeline(self, source=None, sink=None, document_sink=None):
+        """Wire ingest -> classify -> dedupe -> enrich -> dispatch
+        
+        source and the sinks default to the journal (plus /dev/kmsg and
+        pressure alerts) and Telegram; pass synthetic ones to drive the
+        stages without either. Dispatch takes everything queued (up to 200
+        alerts) and packs it into as few messages as fit.
+        """
+        async def dispatch(errors):
+            return await self.dispatch_alerts(errors, sink, document_sink)
+        
+        return Pipeline(source or self.event_source(), [
+            ('classify', self.classify, StageQueue('classify', 16, 'drop-oldest')),
+            ('dedupe', self.filter_error, StageQueue('dedupe', 500, 'summarize', self.summarize_dropped)),
+            # Coredump lookups are capped, so a crash storm backs up into
+            # dedupe's summarizing queue instead of blocking ingestion
+            ('enrich', self.enricher.enrich, StageQueue('enrich', 100, 'block')),
+            ('dispatch', dispatch, StageQueue('dispatch', 200, 'block', batch=200)),
+        ])
+    
+    def format_metrics(self):
+        """Short per-stage metrics summary"""
+        if not self.pipeline:
+            return "not running"
+        lines = []
+        for name, stats in self.pipeline.metrics().items():
+            line = f"{name}: out={stats['emitted']}"
+            if 'queue' in stats:
+                queue = stats['queue']
+                line += f" in={stats['received']} err={stats['errors']} avg={stats['avg_ms']}ms"
+                line += f" q={queue['size']}/{queue['maxsize']} hw={queue['high_water']} drop={queue['dropped']}"
+            lines.append(line)
+        crash = self.enricher.snapshot()
+        lines.append(f"crash lookups: fetched={crash['fetched']} cached={crash['cached']} "
+                     f"skipped={crash['skipped']}")
+        if self.kmsg:
+            kmsg = self.kmsg.snapshot()
+            lines.append(f"kmsg: records={kmsg['records']} filtered={kmsg['filtered']} lost={kmsg['lost']}")
+        if self.pressure:
+            pressure = self.pressure.snapshot()
+            lines.append(f"pressure: watching={pressure['watching']} alerts={pressure['alerts']} "
+                         f"suppressed={pressure['suppressed']}")
+        loop = self.watchdog.snapshot()
+        lines.append(f"loop: max_lag={loop['max_lag_ms']}ms stalls={loop['stalls']} "
+                     f"worst={loop['worst_stall_ms']}ms")
+        return '\n'.join(lines)
+    
+    async def housekeeping(self):
+        """Periodic package refresh and heartbeat"""
         loop_count = 0
         while True:
+            await asyncio.sleep(self.poll_interval)
+            loop_count += 1
             try:
-                loop_count += 1
-                
-                # Check journal for errors
-                errors = self.get_journal_errors()
-                if errors:
-                    await self.process_and_send_errors(errors)
-                
                 # Periodic refresh of packages
                 if loop_count % 30 == 0:  # Every ~5 minutes
                     self.packages = self.get_running_packages()
@@ -618,16 +723,82 @@ class SystemMonitorBot:
                 # Heartbeat
                 if loop_count % 60 == 0:
                     logger.info("Bot heartbeat - monitoring...")
-                
-                await asyncio.sleep(10)
-                
+                    logger.info(f"Pipeline metrics:\n{self.format_metrics()}")
             except Exception as e:
-                logger.error(f"Loop error: {e}")
-                await asyncio.sleep(30)
+                logger.error(f"Housekeeping error: {e}")
+    
+    def shutdown(self):
+        """SIGTERM/SIGINT: tell systemd we're stopping, then drain the pipeline"""
+        sd_notify('STOPPING=1')
+        self.pipeline.stop()
+    
+    async def run(self):
+        """Main loop"""
+        logger.info("="*50)
+        logger.info("System Monitor Bot Starting...")
+        logger.info("="*50)
+        
+        self.pipeline = self.build_pipeline()
+        
+        # Drain queued alerts on SIGTERM (systemctl stop/restart)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.shutdown)
+        
+        if STARTUP.enabled:
+            # Measure the path to the first journal read, send nothing
+            await self.pipeline.run()
+            return
+        
+        # Send startup notification
+        await self.send_startup_notification()
+        
+        # HTTP stack loads and connects while the journal is being read
+        background = [
+            asyncio.create_task(self.watchdog.run()),
+            asyncio.create_task(self.warm_http()),
+            asyncio.create_task(self.handle_telegram_commands()),
+            asyncio.create_task(self.drain_spool()),
+            asyncio.create_task(self.housekeeping()),
+        ]
+        
+        # Type=notify: systemd considers the service started from here on
+        sd_notify('READY=1')
+        await self.pipeline.run()
+        
+        # Give the spool a moment to deliver what the drain just queued;
+        # anything left is sent after the next start
+        try:
+            await asyncio.wait_for(self.spool_empty(), 5)
+        except asyncio.TimeoutError:
+            logger.info(f"{len(self.spool.pending)} message(s) left in spool for next start")
+        for task in background:
+            task.cancel()
+        await self.telegram.close()
+        self.spool.close()
+        self.classifier.shutdown()
+        logger.info(f"Pipeline drained:\n{self.format_metrics()}")
+
+def profile_startup(bot):
+    """--profile-startup: time init up to the first journal read, then exit"""
+    asyncio.run(bot.run())
+    total = STARTUP.phases[-1][2] * 1000
+    print("\nStartup profile (target: first journal read < 100ms)")
+    print(STARTUP.report())
+    print(f"\n{'OK' if total < 100 else 'SLOW'}: {total:.1f}ms to first journal read")
+    print("\nImport cost of startup modules (cumulative):")
+    print(import_breakdown(['asyncio', 'json', 'hashlib', 'html', 'subprocess', 'logging', 'socket']))
+    print(f"\nKept off the startup path: {', '.join(LAZY_IMPORTS)}")
+    print(import_breakdown([m for m in LAZY_IMPORTS if importable(m)], top=3))
+
 
 if __name__ == '__main__':
     bot = SystemMonitorBot()
     
+    if STARTUP.enabled:
+        profile_startup(bot)
+        sys.exit(0)
+    
     try:
         asyncio.run(bot.run())
     except KeyboardInterrupt:
@@ -49,6 +49,7 @@ pacman -S --needed --noconfirm systemd python-aiohttp
 # Copy bot files
 echo -e "${GREEN}[*] Copying bot files...${NC}"
 cp hypr-bot.py "$BOT_DIR/"
+cp -r botcore "$BOT_DIR/"
 chmod +x "$BOT_DIR/hypr-bot.py"
 
 # Create virtual environment
@@ -703,7 +703,9 @@ VMEOF
         if [ -d ".config/hypr/scripts" ]; then
             mkdir -p ~/.config/hypr/scripts
             cp .config/hypr/scripts/*.sh ~/.config/hypr/scripts/ 2>/dev/null || true
-            chmod +x ~/.config/hypr/scripts/*.sh 2>/dev/null || true
+            cp .config/hypr/scripts/*.py ~/.config/hypr/scripts/ 2>/dev/null || true
+            cp -r hypr-bot/botcore ~/.config/hypr/scripts/ 2>/dev/null || true
+            chmod +x ~/.config/hypr/scripts/*.sh ~/.config/hypr/scripts/*.py 2>/dev/null || true
         fi
     fi
     cp -r .config/waybar/* ~/.config/waybar/ 2>/dev/null || true
@@ -873,6 +875,7 @@ if [ "$SETUP_BOT" = "existing" ]; then
         # Copy bot files
         sudo mkdir -p /opt/hypr-bot
         sudo cp hypr-bot/hypr-bot.py /opt/hypr-bot/
+        sudo cp -r hypr-bot/botcore /opt/hypr-bot/
         sudo cp hypr-bot/hypr-bot.service /etc/systemd/system/
         
         cd hypr-bot
@@ -971,6 +974,7 @@ EOF
                     # Copy bot files to /opt/hypr-bot manually (in case install-bot.sh fails)
                     sudo mkdir -p /opt/hypr-bot
                     sudo cp hypr-bot/hypr-bot.py /opt/hypr-bot/
+                    sudo cp -r hypr-bot/botcore /opt/hypr-bot/
                     sudo cp hypr-bot/hypr-bot.service /etc/systemd/system/
                     
                     # Run install script